@@ -91,8 +91,7 @@ class Agent(BootAgent):
         cmd_pk.set_data({"handler": "cmd_send_alert_msg"})
         cmd_pk.set_packet(pk, "content")
 
-        for node in alert_nodes:
-            self.pass_packet(cmd_pk, node["universal_id"])
+        self.pass_packet_many(cmd_pk, [node["universal_id"] for node in alert_nodes])
 
     def cmd_ingest_status_report(self, content, packet, identity=None):
         """Handler for receiving data. Triggers forensics on CRITICAL events."""
@@ -114,8 +114,7 @@ class Agent(BootAgent):
             self.log("[WATCHDOG][ALERT] No alert-compatible agents found.")
             return
 
-        for node in alert_nodes:
-            self.pass_packet(pk1, node["universal_id"])
+        self.pass_packet_many(pk1, [node["universal_id"] for node in alert_nodes])
 
     def tail_log(self):
         self.log(f"[GATEKEEPER] Tailing: {self.log_path}")
@@ -140,8 +140,7 @@ class Agent(BootAgent):
                 "content": report_content
             })
 
-            for node in report_nodes:
-                self.pass_packet(pk, node["universal_id"])
+            self.pass_packet_many(pk, [node["universal_id"] for node in report_nodes])
 
             if self.debug.is_enabled():
                 self.log(f"Sent '{report_content['severity']}' log entry for '{self.service_name}'.")
@@ -45,6 +45,7 @@ from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.ident
 from matrixswarm.core.agent_factory.reaper.reaper_factory import make_reaper_node
 from matrixswarm.core.agent_factory.scavenger.scavenger_factory import make_scavenger_node
 from matrixswarm.core.utils.crypto_utils import generate_signed_payload, verify_signed_payload
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.identity_key_pool import IDENTITY_KEY_POOL
 class Agent(BootAgent):
     """The root agent and central authority of the MatrixSwarm.
     As the first agent spawned by the bootloader, the Matrix agent acts as
@@ -98,6 +99,7 @@ class Agent(BootAgent):
 
     def post_boot(self):
 
+        self.start_key_pool()
         self.log(f"{self.NAME} v{self.AGENT_VERSION} – panopticon live and lethal...")
         message = "I'm watching..."
         # Manually check if our own comm directory exists (it does), and deliver the tree slice directly
@@ -108,8 +110,33 @@ class Agent(BootAgent):
         self.log("Pre-boot checks complete. Swarm ready.")
 
     def worker_post(self):
+        IDENTITY_KEY_POOL.stop()
         self.log("Matrix shutting down. Closing directives.")
 
+    def start_key_pool(self):
+        """Starts pre-generating identity keys for injections and hotswaps.
+
+        Configured by "key_pool" in Matrix's directive config:
+        {"enabled": true, "watermark": 8, "max_watermark": 64, "workers": 1, "idle_decay": 600}.
+        Entries sit encrypted with the swarm key in comm/matrix/keypool; the
+        pool level is written to comm/matrix/metrics/key_pool.json.
+        """
+        config = self.tree_node.get("config", {}).get("key_pool", {}) or {}
+        try:
+            IDENTITY_KEY_POOL.configure(os.path.join(self.path_resolution["comm_path_resolved"], "keypool"),
+                                        self.swarm_key,
+                                        watermark=config.get("watermark", 8),
+                                        max_watermark=config.get("max_watermark", 64),
+                                        workers=config.get("workers", 1),
+                                        idle_decay=config.get("idle_decay", 600),
+                                        stats_comm_path=self.path_resolution["comm_path_resolved"],
+                                        enabled=config.get("enabled", True)).start()
+            stats = IDENTITY_KEY_POOL.get_stats()
+            self.log(f"[KEY-POOL] {'started' if stats['enabled'] else 'disabled'}: level {stats['level']}, "
+                     f"target {stats['target']}, discarded {stats['discarded']}")
+        except Exception as e:
+            self.log("[KEY-POOL] Failed to start, identities will be generated in line.", error=e, block="key_pool")
+
     def canonize_gospel(self, output_path="codex/gospel_of_matrix.sig.json"):
         gospel = {
             "type": "swarm_gospel",
@@ -1146,6 +1173,11 @@ class Agent(BootAgent):
 
             if success:
 
+                if IDENTITY_KEY_POOL.is_enabled():
+                    stats = IDENTITY_KEY_POOL.get_stats()
+                    self.log(f"[KEY-POOL] level {stats['level']}/{stats['target']} after inject "
+                             f"(hits {stats['hits']}, misses {stats['misses']})")
+
                 self.save_agent_tree_master()
 
                 # --- REMEDY ---
@@ -14,9 +14,15 @@ import base64
 
 from matrixswarm.core.boot_agent import BootAgent
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import ENCRYPTION_CONFIG
+from matrixswarm.core.class_lib.metrics.trace_spans import TRACER, TraceContext, SPAN_ENTRY
+from matrixswarm.core.class_lib.logging.log_tail import tail_log, read_log_delta, render_log_lines
 
 from Crypto.Cipher import AES
 
+# cmd_get_log: newest lines returned by default, and the most a client can ask for
+LOG_TAIL_LINES = 250
+LOG_TAIL_MAX = 5000
+
 class Agent(BootAgent):
     def __init__(self):
         super().__init__()
@@ -134,33 +140,30 @@ class Agent(BootAgent):
                                 key_bytes = base64.b64decode(swarm_key)
                                 self.log(f"[DEBUG] Swarm key loaded: {swarm_key[:10]}...")
 
-                            rendered_lines = []
-
-                            with open(log_path, "r", encoding="utf-8") as f:
-                                for line in f:
-                                    try:
-                                        if key_bytes:
-                                            line = decrypt_log_line(line, key_bytes)
-
-                                        entry = json.loads(line)
-                                        ts = entry.get("timestamp", "?")
-                                        lvl = entry.get("level", "INFO")
-                                        msg = entry.get("message", "")
-                                        emoji = {
-                                            "INFO": "🔹", "ERROR": "❌", "WARNING": "⚠️", "DEBUG": "🐞"
-                                        }.get(lvl.upper(), "🔸")
-                                        rendered_lines.append(f"{emoji} [{ts}] [{lvl}] {msg}")
-                                    except Exception as e:
-                                        rendered_lines.append(f"[MALFORMED] {line.strip()}")
-
-                            output = "\n".join(rendered_lines[-250:])
-                            #output = "\n".join(rendered_lines)
+                            #"lines": how many of the newest lines (default 250), "since": epoch secs
+                            #"inode" + "offset": the cursor of the last reply, only lines appended since come back
+                            try:
+                                count = min(max(1, int(content.get("lines") or LOG_TAIL_LINES)), LOG_TAIL_MAX)
+                                since = float(content["since"]) if content.get("since") is not None else None
+                                cursor = None
+                                if content.get("inode") is not None and content.get("offset") is not None:
+                                    cursor = {"inode": int(content["inode"]), "offset": int(content["offset"])}
+                            except (TypeError, ValueError):
+                                return jsonify({"status": "error", "message": "Bad lines, since or cursor"}), 400
+
+                            #no cursor (or a stale one): read back from EOF, only the lines returned get decrypted
+                            delta = read_log_delta(uid, cursor, count, since, comm_path=self.path_resolution["comm_path"],
+                                                   key_bytes=key_bytes)
+                            rendered_lines = render_log_lines(delta["lines"])
+                            output = "\n".join(rendered_lines)
 
                             if self.debug.is_enabled():
                                 self.log(f"[LOG-DELIVERY] ✅ Sent {len(rendered_lines)} lines for {uid}")
 
+                            #"reset": the client replaces its view, otherwise it appends "log"
                             return Response(
-                                json.dumps({"status": "ok", "log": output}, ensure_ascii=False),
+                                json.dumps({"status": "ok", "log": output, "cursor": delta["cursor"],
+                                            "from": delta["from"], "reset": delta["reset"]}, ensure_ascii=False),
                                 status=200,
                                 mimetype="application/json"
                             )
@@ -239,7 +242,17 @@ class Agent(BootAgent):
 
                 pk.set_packet(pk2,"content")
 
-                self.pass_packet(pk, target)
+                #the forward is the entry span of the trace, under the GUI's trace if it sent one
+                gui_trace = TraceContext.from_packet(payload.get("trace") or {})
+                entry = TRACER.child_of(gui_trace)
+                previous = TRACER.activate(entry)
+                started = time.time()
+                try:
+                    self.pass_packet(pk, target)
+                finally:
+                    TRACER.restore(previous)
+                    TRACER.record(entry, gui_trace.span_id if gui_trace else None, SPAN_ENTRY, started,
+                                  time.time() - started, ctype, ip)
 
                 return jsonify({"status": "ok", "message": f"{ctype} routed to Matrix"})
 
@@ -258,21 +271,8 @@ class Agent(BootAgent):
                     swarm_key = ENCRYPTION_CONFIG.get_swarm_key()
                     key_bytes = base64.b64decode(swarm_key)
 
-                rendered_lines = []
-
-                with open(log_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            if key_bytes:
-                                line = self.decrypt_log_line(line, key_bytes)
-                            entry = json.loads(line)
-                            ts = entry.get("timestamp", "?")
-                            lvl = entry.get("level", "INFO")
-                            msg = entry.get("message", "")
-                            emoji = {"INFO": "🔹", "ERROR": "❌", "WARNING": "⚠️", "DEBUG": "🐞"}.get(lvl.upper(), "🔸")
-                            rendered_lines.append(f"{emoji} [{ts}] [{lvl}] {msg}")
-                        except Exception:
-                            rendered_lines.append(f"[MALFORMED] {line.strip()}")
+                rendered_lines = render_log_lines(
+                    tail_log(uid, LOG_TAIL_MAX, comm_path=self.path_resolution["comm_path"], key_bytes=key_bytes))
 
                 output = "\n".join(rendered_lines)
                 self.log(f"[LOG-DELIVERY] ✅ Sent {len(rendered_lines)} lines for {uid}")
@@ -11,6 +11,7 @@ import asyncio
 import websockets
 import json
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.identity import IdentityObject
+from matrixswarm.core.class_lib.logging.log_tail import read_log_delta, render_log_lines
 
 from matrixswarm.core.boot_agent import BootAgent
 
@@ -32,6 +33,11 @@ class Agent(BootAgent):
         self._thread = None
         self._config = None
         self._lock = threading.Lock()
+        #"log_push": true lets clients subscribe to an agent's log and get what's appended as log_delta messages;
+        #off by default, the socket doesn't ask for client certs like matrix_https does
+        self.log_push = bool(config.get("log_push", False))
+        self.log_push_interval = float(config.get("log_push_interval", 1.0))
+        self._log_subs = {}   # websocket -> {"universal_id", "cursor", "seen": (inode, size) at the last read}
 
     def post_boot(self):
         self.log(f"{self.NAME} v{self.AGENT_VERSION} – agent ready and active.")
@@ -94,6 +100,8 @@ class Agent(BootAgent):
 
                 self.websocket_ready = True
                 self.log(f"[WS] SECURE WebSocket bound on port {self.port} (TLS enabled)")
+                if self.log_push:
+                    asyncio.ensure_future(self.log_push_loop())
                 await server.wait_closed()
 
             loop.run_until_complete(launch())
@@ -160,6 +168,10 @@ class Agent(BootAgent):
                         }))
                         continue
 
+                    if isinstance(data, dict) and data.get("type") in ("log_subscribe", "log_unsubscribe"):
+                        await self.handle_log_subscription(websocket, data)
+                        continue
+
                     # Respond with acknowledgment
                     await websocket.send(json.dumps({
                         "type": "ack",
@@ -179,8 +191,86 @@ class Agent(BootAgent):
         finally:
             # Ensure client is removed from the set upon disconnect
             self.clients.discard(websocket)
+            self._log_subs.pop(websocket, None)
             self.log(f"[WS] Client disconnected and removed. Active clients: {len(self.clients)}")
 
+    async def handle_log_subscription(self, websocket, data):
+        """
+        log_subscribe {"universal_id", "inode", "offset"} follows an agent's log from that
+        cursor (from its end without one); log_unsubscribe stops. One log per client.
+        """
+        uid = data.get("universal_id")
+        enabled = self.log_push and data.get("type") == "log_subscribe" and bool(uid) \
+                  and os.path.basename(str(uid)) == uid
+        if not enabled:
+            self._log_subs.pop(websocket, None)
+            await websocket.send(json.dumps({"type": "log_subscribed", "universal_id": uid, "enabled": False}))
+            return
+
+        cursor = None
+        try:
+            if data.get("inode") is not None and data.get("offset") is not None:
+                cursor = {"inode": int(data["inode"]), "offset": int(data["offset"])}
+        except (TypeError, ValueError):
+            cursor = None
+        if cursor is None:
+            #the client reads what's there over matrix_https, pushes start at the end
+            loop = asyncio.get_running_loop()
+            delta = await loop.run_in_executor(
+                None, lambda: read_log_delta(uid, None, 0, comm_path=self.path_resolution["comm_path"]))
+            cursor = delta["cursor"]
+
+        self._log_subs[websocket] = {"universal_id": uid, "cursor": cursor, "seen": None}
+        self.log(f"[WS][LOG-PUSH] Client following {uid} from {cursor}")
+        await websocket.send(json.dumps({"type": "log_subscribed", "universal_id": uid, "enabled": True,
+                                         "cursor": cursor}))
+
+    async def log_push_loop(self):
+        """
+        Every log_push_interval secs stats the log of each subscription and, when it
+        changed, pushes the appended lines as a log_delta. A quiet log costs one stat.
+        """
+        loop = asyncio.get_running_loop()
+        comm_path = self.path_resolution["comm_path"]
+        while not (self._stop_event and self._stop_event.is_set()):
+            await asyncio.sleep(self.log_push_interval)
+            for websocket, sub in list(self._log_subs.items()):
+                uid = sub["universal_id"]
+                try:
+                    st = os.stat(os.path.join(comm_path, uid, "logs", "agent.log"))
+                except OSError:
+                    continue
+                seen = (st.st_ino, st.st_size)
+                if seen == sub["seen"]:
+                    continue
+                try:
+                    delta = await loop.run_in_executor(
+                        None, lambda: read_log_delta(uid, sub["cursor"], comm_path=comm_path))
+                except Exception as e:
+                    self.log(f"[WS][LOG-PUSH] Could not read log of {uid}", error=e)
+                    continue
+                if self._log_subs.get(websocket) is not sub:
+                    #unsubscribed or resubscribed while reading
+                    continue
+                sub["cursor"] = delta["cursor"]
+                #a capped read leaves more behind, look again next round
+                sub["seen"] = None if delta["lines"] else seen
+                if not delta["lines"] and not delta["reset"]:
+                    continue
+                try:
+                    await websocket.send(json.dumps({
+                        "type": "log_delta",
+                        "content": {
+                            "universal_id": uid,
+                            "log": "\n".join(render_log_lines(delta["lines"])),
+                            "cursor": delta["cursor"],
+                            "from": delta["from"],
+                            "reset": delta["reset"]
+                        }
+                    }, ensure_ascii=False))
+                except Exception:
+                    self._log_subs.pop(websocket, None)
+
     def cmd_rpc_route(self, content, packet, identity:IdentityObject = None):
         try:
             self.log("Incoming routed RPC packet.")
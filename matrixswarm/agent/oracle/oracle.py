@@ -11,6 +11,7 @@ sys.path.insert(0, os.getenv("AGENT_PATH"))
 import time
 from openai import OpenAI
 from matrixswarm.core.boot_agent import BootAgent
+from matrixswarm.core.class_lib.threads.dispatch_pool import dispatch_policy
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.identity import IdentityObject
 
 class Agent(BootAgent):
@@ -63,6 +64,8 @@ class Agent(BootAgent):
         """A one-time hook that runs after the agent's main loops have exited."""
         self.log("[ORACLE] Oracle shutting down. No more prophecies today.")
 
+    # upstream API calls can take seconds; keep them off the listener thread, one at a time per requester
+    @dispatch_policy(max_concurrency=4, ordering_key="target_universal_id")
     def cmd_msg_prompt(self, content, packet, identity: IdentityObject = None):
         """
         Handles an incoming prompt request from another agent.
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.getenv("SITE_ROOT"))
+sys.path.insert(0, os.getenv("AGENT_PATH"))
+import time
+import uuid
+from matrixswarm.core.boot_agent import BootAgent
+from matrixswarm.core.utils.swarm_sleep import interruptible_sleep
+from matrixswarm.core.class_lib.file_system.util.json_safe_write import JsonSafeWrite
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.identity import IdentityObject
+
+class Agent(BootAgent):
+    """No-op agent for tools/scale_harness.py.
+
+    Does nothing but heartbeat and, when its node sets config.ping, ping
+    its parent over the packet path and record the round trips to
+    comm/<uid>/metrics/scale_ping.json for the harness to collect.
+    """
+    def __init__(self):
+        super().__init__()
+        self.name = "ScaleProbe"
+
+        #"ping": {"count": 10, "interval": 1.0}
+        config = self.tree_node.get("config", {}) or {}
+        ping = config.get("ping", {}) or {}
+        self.ping_count = int(ping.get("count", 0))
+        self.ping_interval = float(ping.get("interval", 1.0))
+        self.ping_target = self.command_line_args.get("spawner")
+        self.depth = config.get("depth")
+        self.pending = {}
+        self.rtts = []
+        self.sent = 0
+        self.failed = 0
+        self.report_path = os.path.join(self.path_resolution["comm_path_resolved"], "metrics", "scale_ping.json")
+
+    def worker(self, config:dict = None, identity:IdentityObject = None):
+        if self.sent < self.ping_count and self.ping_target:
+            self.send_ping()
+        interruptible_sleep(self, self.ping_interval if self.sent < self.ping_count else 10)
+
+    def send_ping(self):
+        nonce = uuid.uuid4().hex
+        pk = self.get_delivery_packet("standard.command.packet", new=True)
+        pk.set_data({"handler": "cmd_scale_ping",
+                     "origin": self.command_line_args["universal_id"],
+                     "content": {"nonce": nonce, "reply_to": self.command_line_args["universal_id"]}})
+        self.pending[nonce] = time.perf_counter()
+        if self.pass_packet(pk, self.ping_target):
+            self.sent += 1
+        else:
+            #the parent's codex may not be there yet, try again next round
+            self.pending.pop(nonce, None)
+            self.failed += 1
+        self.save_report()
+
+    def cmd_scale_ping(self, content, packet, identity:IdentityObject = None):
+        reply_to = content.get("reply_to")
+        if not reply_to:
+            return
+        pk = self.get_delivery_packet("standard.command.packet", new=True)
+        pk.set_data({"handler": "cmd_scale_pong",
+                     "origin": self.command_line_args["universal_id"],
+                     "content": {"nonce": content.get("nonce")}})
+        self.pass_packet(pk, reply_to)
+
+    def cmd_scale_pong(self, content, packet, identity:IdentityObject = None):
+        started = self.pending.pop(content.get("nonce"), None)
+        if started is None:
+            return
+        self.rtts.append(round(time.perf_counter() - started, 6))
+        self.save_report()
+
+    def save_report(self):
+        os.makedirs(os.path.dirname(self.report_path), exist_ok=True)
+        JsonSafeWrite.safe_write(self.report_path, {
+            "universal_id": self.command_line_args["universal_id"],
+            "target": self.ping_target,
+            "depth": self.depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "rtt": self.rtts,
+            "updated": time.time(),
+        })
+
+if __name__ == "__main__":
+    agent = Agent()
+    agent.boot()
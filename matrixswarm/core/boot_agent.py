@@ -2,6 +2,7 @@
 #Gemini, doc-rocking the Swarm to perfection.
 import os
 import time
+import signal
 import traceback
 import threading
 import json
@@ -20,6 +21,12 @@ from matrixswarm.core.mixin.identity_registry import IdentityRegistryMixin
 from matrixswarm.core.utils.swarm_sleep import interruptible_sleep
 from string import Template
 from matrixswarm.core.class_lib.file_system.find_files_with_glob import  FileFinderGlob
+from matrixswarm.core.class_lib.file_system.drop_zone_watcher import DropZoneWatcher
+from matrixswarm.core.class_lib.file_system.group_commit import GROUP_COMMITTER, DURABILITY_NONE, DURABILITY_RENAME
+from matrixswarm.core.class_lib.threads.dispatch_pool import HandlerDispatchPool
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import PIPELINE_METRICS, STAGE_WAIT, STAGE_QUEUE_WAIT, STAGE_DISPATCH
+from matrixswarm.core.class_lib.metrics.trace_spans import TRACER, TraceContext, TRACE_FIELD, SPAN_DELIVER, SPAN_QUEUE_WAIT, \
+    SPAN_DECRYPT, SPAN_HANDLE
 from matrixswarm.core.class_lib.processes.duplicate_job_check import  DuplicateProcessCheck
 from matrixswarm.core.class_lib.logging.logger import Logger
 from matrixswarm.core.class_lib.packet_delivery.mixin.packet_factory_mixin import PacketFactoryMixin
@@ -27,6 +34,13 @@ from matrixswarm.core.class_lib.packet_delivery.mixin.packet_delivery_factory_mi
 from matrixswarm.core.class_lib.packet_delivery.mixin.packet_reception_factory_mixin import PacketReceptionFactoryMixin
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import ENCRYPTION_CONFIG
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import EncryptionConfig
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.verified_identity_cache import VERIFIED_IDENTITY_CACHE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.rsa_key_cache import RSA_KEY_CACHE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.session_key_store import SESSION_KEY_STORE
+from matrixswarm.core.class_lib.packet_delivery.utility.priority_lanes import LaneMetrics, CONTROL_HANDLERS, LANE_PREFIX, \
+    LANE_CONTROL, LANE_NORMAL, normalize_lane
+from matrixswarm.core.class_lib.packet_delivery.utility.inbox_quota import InboxQuota, PassResult, read_gauge, write_gauge, \
+    coalesce_name, GAUGE_FILE, TARGET_SATURATED, POLICY_REJECT, POLICY_DROP_OLDEST, POLICY_COALESCE
 from matrixswarm.core.utils.debug.config import DebugConfig
 from cryptography.hazmat.primitives import serialization
 from matrixswarm.core.mixin.ghost_vault import decrypt_vault
@@ -119,6 +133,18 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
             config.set_enabled(True)
             self.logger.set_encryption_key(self.swarm_key)
 
+        #buffered log writer: "logging": {"async": true, "queue_size": 10000, "flush_interval": 0.5, "overload": "drop"}
+        #overload "block" waits up to block_timeout secs for queue room; lines are flushed on exit either way
+        #"format": "blocks" writes a seekable block log with an index (log_blocks), "block_bytes" caps a block
+        log_config = self.tree_node.get("config", {}).get("logging", {}) or {}
+        if log_config.get("async"):
+            self.logger.enable_async(queue_size=log_config.get("queue_size", 10000),
+                                     flush_interval=log_config.get("flush_interval", 0.5),
+                                     overload=log_config.get("overload", "drop"),
+                                     block_timeout=log_config.get("block_timeout", 5.0),
+                                     log_format=log_config.get("format", "lines"),
+                                     block_bytes=log_config.get("block_bytes", 65536))
+
         # Optional fingerprint of Matrix public key
         try:
             self.matrix_fingerprint = hashlib.sha256(self.matrix_pub.encode()).hexdigest()[:12]
@@ -191,8 +217,72 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
         self._service_manager_services = {}
 
         self.running = False
+        self._sigterm = None
         self.NAME = self.command_line_args.get("agent_name", "UNKNOWN")
 
+        #packet transport for pass_packet and the listener: file.json_file (default) or socket.unix
+        self._packet_transport = self.tree_node.get("config", {}).get("packet_transport", "file.json_file")
+
+        #delivery metadata for pass_packet, e.g. "packet_framing": "binary" (receivers auto-detect)
+        self._delivery_metadata = {}
+        if self.tree_node.get("config", {}).get("packet_framing"):
+            self._delivery_metadata["framing"] = self.tree_node["config"]["packet_framing"]
+
+        #durability of pass_packet drops per handler: {"default": "fsync", "handlers": {"cmd_ingest_status_report": "rename"}}
+        #levels: none | rename | fsync | fsync_dir | group, see group_commit.py
+        self._durability_config = self.tree_node.get("config", {}).get("durability", {}) or {}
+        if "group_window_ms" in self._durability_config:
+            GROUP_COMMITTER.set_window(self._durability_config["group_window_ms"] / 1000)
+
+        #handler dispatch pool: {"workers": 4, "handlers": {"cmd_x": {"max_concurrency": 2, "ordering_key": "field"}}}
+        #only handlers with a policy (directive or @dispatch_policy) leave the listener thread
+        self._dispatch_config = self.tree_node.get("config", {}).get("dispatch", {}) or {}
+        self._dispatch_pool = None
+        self._dispatch_policies = {}
+
+        #pipeline stage + handler latency histograms: "metrics": {"enabled": true, "flush_interval": 60}
+        #flushed to comm/<uid>/metrics/pipeline.json, see matrix_visibility/pipeline_stats.py
+        self._metrics_config = self.tree_node.get("config", {}).get("metrics", {}) or {}
+        PIPELINE_METRICS.set_enabled(self._metrics_config.get("enabled", True))
+
+        #trace spans across agent hops: "trace": {"enabled": true, "sample": 1.0, "max_bytes": 16777216}
+        #appended to comm/<uid>/trace/spans.bin, see matrix_visibility/trace_collect.py
+        trace_config = self.tree_node.get("config", {}).get("trace", {}) or {}
+        TRACER.configure(self.path_resolution["comm_path_resolved"], trace_config.get("enabled", True),
+                         trace_config.get("sample", 1.0), trace_config.get("max_bytes"))
+
+        #handler name -> route, see build_routing_table(); unknown handlers are retried after route_negative_ttl secs
+        self._routes = {}
+        self._routes_lock = threading.Lock()
+        self._route_stats = {"hits": 0, "resolved": 0, "missing": 0, "negative_hits": 0}
+        self._route_negative_ttl = self.tree_node.get("config", {}).get("route_negative_ttl", 60)
+
+        #ready-to-send footballs per target uid, checked against the target's codex file (mtime, inode, size)
+        self._pass_contexts = {}
+        self._pass_contexts_lock = threading.Lock()
+        self._pass_context_stats = {"hits": 0, "loads": 0, "reloads": 0, "failed": 0}
+
+        #inbox quota of this agent: "inbox": {"max_packets": 5000, "policy": "reject" | "drop_oldest" | "coalesce", "coalesce_key": ["handler", "content.source"]}
+        #the listener publishes the queue depth to hello.moto/inbox.gauge, senders read it in pass_packet; control lane packets skip it
+        try:
+            self._inbox_quota = InboxQuota.from_config(self.tree_node.get("config", {}).get("inbox"))
+        except Exception as e:
+            self._inbox_quota = None
+            self.log("Invalid inbox quota, inbox is unbounded", error=e, block="inbox_quota")
+        self._inbox_ra = None
+        self._inbox_gauge_last = (0, None)
+        self._inbox_dropped = 0
+
+        #priority lanes: "priority": {"handlers": {"cmd_ingest_status_report": "bulk"}, "control_handlers": ["cmd_x"]}
+        #control handlers go out on the control lane and run on the listener thread, ahead of the dispatch pool
+        self._priority_config = self.tree_node.get("config", {}).get("priority", {}) or {}
+        self._control_handlers = CONTROL_HANDLERS | set(self._priority_config.get("control_handlers", []))
+        self._lane_metrics = LaneMetrics()
+
+        #last inbox gauge seen per target uid: [gauge file stamp, gauge, packets sent since, saturation logged]
+        self._inbox_pressure = {}
+        self._inbox_pressure_lock = threading.Lock()
+
         '''
         fb.add_identity(matrix_node['vault'],
                 identity_name="agent_owner",    #owner identity
@@ -217,6 +307,12 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
                                     )
         self._pass_football.set_pubkey_verifier(self.matrix_pub) #Matrix pubkey to verify the inner-identity
         self._pass_football.set_identity_base_path(self.path_resolution['comm_path'])
+        #per-target aes session keys: "session_keys": true or {"max_packets": 10000, "max_age": 3600}
+        session_keys = self.tree_node.get("config", {}).get("session_keys", False)
+        if session_keys:
+            self._pass_football.set_use_session_keys(True)
+            if isinstance(session_keys, dict):
+                SESSION_KEY_STORE.set_rotation(session_keys.get("max_packets"), session_keys.get("max_age"))
         #self._pass_football.set_aes_key(self.swarm_key)
         #self._pass_football.set_aes_encryption_pubkey() #used for sending the aes encryption key using targets, pubkey
         #self._pass_football.set_aes_encryption_privkey() #used by the receiving target to decrypt the aes key and decrypt the payload
@@ -237,6 +333,11 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
         self.last_tree_mtime = 0
 
+    #handler routing table entries: (kind, target)
+    ROUTE_METHOD = "method"      # target is the bound handler method
+    ROUTE_FACTORY = "factory"    # target is an agent.<name>.factory.<handler> module with attach()
+    ROUTE_MISSING = "missing"    # target is the time the lookup may be retried
+
     class FootballType(Enum):
         PASS = 1
         CATCH = 2
@@ -427,6 +528,24 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
             interruptible_sleep(self, 7)
 
+    def _handle_sigterm(self, signum, frame):
+        """Flags the shutdown only; monitor_threads() drains and exits.
+
+        The handler runs on the main thread, which may hold the log writer's
+        or the group committer's lock right now, so it takes no locks itself.
+        """
+        self._sigterm = signum
+        self.running = False
+
+    def _drain_and_exit(self, code: int):
+        #os._exit skips atexit, drain queued group commits, trace spans and the log writer first
+        try:
+            GROUP_COMMITTER.flush()
+            TRACER.flush()
+            self.logger.close()
+        finally:
+            os._exit(code)
+
     def monitor_threads(self):
         while self.running:
             # Only monitor if worker_thread exists
@@ -434,9 +553,13 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
                 self.log("[WATCHDOG] worker() thread has crashed. Logging beacon death.")
                 self.emit_dead_poke("worker", "Worker thread crashed unexpectedly.")
                 self.running = False
-                os._exit(1)
+                self._drain_and_exit(1)
             interruptible_sleep(self, 3)
 
+        if self._sigterm:
+            self.log("[SIGTERM] Terminated, flushing logs and pending drops.")
+            self._drain_and_exit(128 + self._sigterm)
+
     def resolve_factory_injections(self):
         self.log("Starting factory injection from 'factories' block only.")
 
@@ -460,6 +583,9 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
             except Exception as e:
                 self.log(f"{dotted_path} → {e}", error=e, block="main-try")
 
+        #factories attach handlers to the agent
+        self.build_routing_table()
+
     def is_worker_overridden(self):
         return self.__class__.worker != BootAgent.worker
 
@@ -482,6 +608,10 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
             self.running = True
 
+            #the Reaper escalates to SIGTERM, which skips atexit: monitor_threads() flushes logs, drops and spans before going
+            if threading.current_thread() is threading.main_thread():
+                signal.signal(signal.SIGTERM, self._handle_sigterm)
+
             self.worker_thread = threading.Thread(target=self._throttled_worker_wrapper, name="worker", daemon=False)
             self.worker_thread.start()
             self.thread_registry["worker"]["active"] = self.is_worker_overridden()
@@ -552,7 +682,6 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
         incoming_path = os.path.join(self.path_resolution["comm_path_resolved"], "incoming")
         os.makedirs(incoming_path, exist_ok=True)
         emit_beacon = self.check_for_thread_poke("packet_listener", 5)
-        last_dir_mtime = os.path.getmtime(incoming_path)
         #TOP TRY
         try:
 
@@ -561,10 +690,64 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
             ra.set_location({"path": self.path_resolution["comm_path"]}) \
                 .set_address([self.command_line_args["universal_id"]]) \
                 .set_drop_zone({"drop": "incoming"})
+            self._inbox_ra = ra
 
         except Exception as e:
             self.log(error=e, block="top_try")
 
+        #drop_oldest trims the inbox while listing it; the other policies are enforced by the senders
+        keep_newest = None
+        if self._inbox_quota and self._inbox_quota.policy == POLICY_DROP_OLDEST:
+            keep_newest = self._inbox_quota.max_packets
+
+        # wakes on inotify IN_MOVED_TO/IN_CLOSE_WRITE, falls back to the 3 sec mtime poll
+        watcher = DropZoneWatcher(incoming_path, poll_interval=3)
+        watcher.set_logger(self.log)
+        #control lane packets and the die cookie preempt a batch in progress
+        watcher.set_priority_names(prefixes=[LANE_PREFIX[LANE_CONTROL]], names=["die"])
+        watcher.start()
+        self._drop_zone_watcher = watcher
+        self.log(f"Incoming watcher backend: {watcher.get_backend()}")
+        self.build_routing_table()
+        last_stats_report = time.time()
+        metrics_flush_interval = self._metrics_config.get("flush_interval", 60)
+        last_metrics_flush = time.time()
+
+        try:
+            self._dispatch_pool = HandlerDispatchPool(workers=self._dispatch_config.get("workers", 4))
+            self._dispatch_pool.set_logger(self.log)
+        except Exception as e:
+            self._dispatch_pool = None
+            self.log("Dispatch pool unavailable, handlers run on the listener thread", error=e, block="dispatch_pool")
+
+        # optional unix socket; senders fall back to the file drop when it isn't there
+        sra = None
+        if self._packet_transport == "socket.unix":
+            try:
+                sra = self.get_reception_agent("socket.unix", new=True, football=self.get_football(type=self.FootballType.CATCH))
+                sra.set_location({"path": self.path_resolution["comm_path"]}) \
+                    .set_address([self.command_line_args["universal_id"]]) \
+                    .set_drop_zone({"drop": "incoming"}) \
+                    .set_wake_callback(watcher.notify) \
+                    .listen()
+                if not sra.is_listening():
+                    sra = None
+            except Exception as e:
+                sra = None
+                self.log(error=e, block="socket_listen")
+
+            #only none / rename packets ride the socket (see the socket.unix delivery agent)
+            default_durability = self._durability_config.get("default")
+            if default_durability not in (None, DURABILITY_NONE, DURABILITY_RENAME):
+                self.log(f"packet_transport socket.unix with durability default '{default_durability}': "
+                         f"packets sent without their own durability take the file drop, not the socket.",
+                         level="WARNING", block="socket_listen")
+
+        # drain anything that landed before the watch was placed
+        scan = True
+        interrupt = lambda: not self.running or watcher.take_priority()
+        die_path = os.path.join(incoming_path, "die")
+
         while self.running:
 
             #Main Try
@@ -572,106 +755,343 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
                 emit_beacon()
 
-                current_dir_mtime = os.path.getmtime(incoming_path)
-                if current_dir_mtime != last_dir_mtime:
-                    last_dir_mtime = current_dir_mtime
+                while sra and sra.pending():
+                    self._dispatch_batch(sra.receive_batch(packet_factory=self._new_listener_packet))
+
+                if scan:
+                    # one snapshot of the drop zone, files opened directly, oldest first
+                    self._dispatch_batch(ra.receive_batch(packet_factory=self._new_listener_packet,
+                                                          keep_newest=keep_newest, interrupt=interrupt))
+                    scan_stats = ra.get_scan_stats()
+                    self._inbox_dropped += scan_stats["dropped"]
+                    self._publish_inbox_gauge(force=True)
+
+                    # the die cookie doesn't wait for enforce_singleton's next pass
+                    if os.path.exists(die_path):
+                        self.log("[LISTENER] die cookie in incoming, standing down.")
+                        self.running = False
+
+                    # a control packet landed mid-batch: rescan now, control lane first
+                    if scan_stats["interrupted"]:
+                        for lane, (depth, _) in scan_stats["lanes"].items():
+                            if depth:
+                                self._lane_metrics.record_preempt(lane)
+                        continue
 
-                    for fname in os.listdir(incoming_path):
-                        #dynamic config packet
-                        try:
-                            if not fname.endswith(".json"):
-                                continue
+            except Exception as loop_error:
 
-                            pk = self.get_delivery_packet("standard.command.packet", new=True)
-                            pk2 = self.get_delivery_packet("standard.general.json.packet", new=True)
-                            pk.set_packet(pk2)
+                self.log("Error in loop", error=loop_error, block="main_try")
 
-                            packet = ra.set_identifier(fname) \
-                                       .set_packet(pk) \
-                                       .receive()
+            #packet_listener_post call
+            try:
+                handler_fn = getattr(self, "packet_listener_post", None)
+                if callable(handler_fn):
+                    self.packet_listener_post() #used as hook or cron, so any operation that effects the agent_tree for instance stay on same thread
 
-                            fpath = os.path.join(incoming_path, fname)  # get the file's path
+            except Exception as e:
+                self.log(error=e, block="packet_listener_post")
 
-                            try:
-                                os.remove(fpath)
-                                identity=ra.get_identity()
-                            except Exception as e:
-                                identity=None
+            #wake-to-dispatch latency, one summary a minute
+            if time.time() - last_stats_report >= 60:
+                last_stats_report = time.time()
+                stats = watcher.get_stats()
+                if stats["dispatched"]:
+                    self.log(f"[LISTENER][LATENCY] backend={stats['backend']} dispatched={stats['dispatched']} "
+                             f"wake→dispatch avg={stats['latency_avg_ms']}ms max={stats['latency_max_ms']}ms")
+                    watcher.reset_stats()
+                    ids = VERIFIED_IDENTITY_CACHE.get_stats()
+                    self.log(f"[LISTENER][ID-CACHE] hits={ids['hits']} misses={ids['misses']} size={ids['size']}/{ids['max_entries']}")
+                    keys = RSA_KEY_CACHE.get_stats()
+                    self.log(f"[LISTENER][KEY-CACHE] hits={keys['hits']} misses={keys['misses']} evictions={keys['evictions']} size={keys['size']}/{keys['max_entries']}")
+                    sess = SESSION_KEY_STORE.get_stats()
+                    if sess["incoming"] or sess["outgoing"]:
+                        self.log(f"[LISTENER][SESSION] resumed={sess['resumed']} unwrapped={sess['unwrapped']} "
+                                 f"outgoing={sess['outgoing']} rotations={sess['rotations']}")
+                for lane, m in self.get_lane_metrics().items():
+                    if m["dispatched"] or m["depth"]:
+                        self.log(f"[LISTENER][LANES] {lane} depth={m['depth']} oldest={m['oldest_age_s']}s done={m['dispatched']} "
+                                 f"wait avg={m['wait_avg_ms']}ms max={m['wait_max_ms']}ms preempted={m['preempted']}")
+                self._lane_metrics.reset_stats()
+                if self._dispatch_pool:
+                    for name, m in self._dispatch_pool.get_metrics().items():
+                        if m["queue_depth"] or m["running"] or m["completed"] or m["failed"]:
+                            self.log(f"[LISTENER][DISPATCH] {name} queue={m['queue_depth']} running={m['running']}/{m['limit']} "
+                                     f"done={m['completed']} failed={m['failed']} wait avg={m['wait_avg_ms']}ms max={m['wait_max_ms']}ms")
+
+            if PIPELINE_METRICS.is_enabled() and time.time() - last_metrics_flush >= metrics_flush_interval:
+                last_metrics_flush = time.time()
+                try:
+                    PIPELINE_METRICS.flush(self.path_resolution["comm_path_resolved"], self.command_line_args.get("universal_id"))
+                except Exception as e:
+                    self.log("Failed to flush pipeline metrics", error=e, block="metrics")
 
-                            try:
-                                pk = packet.get_packet()
-                            except Exception as e:
-                                self.log(f"Failed to process {fname} :{pk}", error=e, block="dynamic_config_packet")
-                                pk={}
+            t0 = time.perf_counter()
+            scan = watcher.wait(self)
+            PIPELINE_METRICS.record(STAGE_WAIT, time.perf_counter() - t0)
 
-                            if ra.get_error_success() or packet is None:
-                                pk={}
-                                self.log(f"Failed to receive data from reception agent or error: {ra.get_error_success_msg()}.")
+        watcher.stop()
+        if sra:
+            sra.close()
+        if PIPELINE_METRICS.is_enabled():
+            try:
+                PIPELINE_METRICS.flush(self.path_resolution["comm_path_resolved"], self.command_line_args.get("universal_id"))
+            except Exception as e:
+                self.log("Failed to flush pipeline metrics", error=e, block="metrics")
+        TRACER.flush()
+        if self._dispatch_pool:
+            self._dispatch_pool.shutdown(wait=False)
 
-                            if self.debug.is_enabled():
-                                self.log(f"processing packet: {fname}")
+    def _get_dispatch_policy(self, handler_name: str, handler_fn) -> dict:
+        """Resolves the pool policy for a handler, or None to run it inline.
 
-                            handler = pk.get("handler")
-                            if not handler:
-                                self.log(f"[UNIFIED][SKIP] No 'call' in: {fname} packet: {pk}")
-                                continue
+        Directive entries under config.dispatch.handlers win over the
+        @dispatch_policy decorator; config.dispatch.default applies to every
+        handler that has neither.
+        """
+        if handler_name in self._dispatch_policies:
+            return self._dispatch_policies[handler_name]
 
-                            handler_name = pk.get("handler")
-                            content = pk.get("content", {})
+        policy = self._dispatch_config.get("handlers", {}).get(handler_name) \
+            or getattr(handler_fn, "_dispatch_policy", None) \
+            or self._dispatch_config.get("default")
 
+        if policy and self._dispatch_pool:
+            self._dispatch_pool.set_limit(handler_name, policy.get("max_concurrency", 1))
+        else:
+            policy = None
 
-                            # 1. Check if the class has a direct method with this name
-                            handler_fn = getattr(self, handler_name, None)
-                            #factory handler check
-                            if callable(handler_fn):
-                                try:
-                                    handler_fn(content, pk, identity)
-                                    if self.debug.is_enabled():
-                                        self.log(f"[UNIFIED] ✅ Executed handler: {handler_name}")
-                                    continue
-                                except Exception as e:
-                                    self.log(f"[UNIFIED][ERROR] Handler '{handler_name}' failed: {e}")
+        self._dispatch_policies[handler_name] = policy
+        return policy
 
-                            # 2. Fallback: Try to dynamically load a factory module
-                            self.log(f"No direct handler '{handler_name}', attempting factory load...")
+    def get_lane_metrics(self) -> dict:
+        """Depth, oldest age and queue wait per priority lane of the incoming drop zone."""
+        lanes = self._inbox_ra.get_scan_stats()["lanes"] if self._inbox_ra else None
+        return self._lane_metrics.get_metrics(lanes)
 
-                            #dynamic module loader
-                            try:
-                                # Clean up handler name (e.g. strip namespaces)
-                                handler_id = handler_name.split(".")[-1]  # e.g. cmd_example
-                                full_module_path = f"agent.{self.command_line_args['agent_name']}.factory.{handler_id}"
+    def get_dispatch_metrics(self) -> dict:
+        """Per-handler queue depth and wait-time metrics of the dispatch pool."""
+        return self._dispatch_pool.get_metrics() if self._dispatch_pool else {}
 
-                                self.log(f"Attempting: {full_module_path}")
+    def _new_listener_packet(self):
+        pk = self.get_delivery_packet("standard.command.packet", new=True)
+        pk.set_packet(self.get_delivery_packet("standard.general.json.packet", new=True))
+        return pk
 
-                                mod = __import__(full_module_path, fromlist=["attach"])
-                                mod.attach(self, {"packet": pk, "content": content, "identity": identity})
+    def _dispatch_batch(self, batch):
+        """Dispatches every ReceivedPacket of a reception agent's receive_batch()."""
+        for item in batch:
+            try:
+                if not item.ok():
+                    self.log(f"Failed to receive data from reception agent or error: {item.error or 'invalid packet'}.")
+                    continue
 
-                                self.log(f"✅ Loaded and attached: {full_module_path}")
+                if self.debug.is_enabled():
+                    self.log(f"processing packet: {item.name}")
+
+                if item.lane:
+                    self._lane_metrics.record_dispatch(item.lane, item.queued_at)
+                if item.queued_at:
+                    PIPELINE_METRICS.record(STAGE_QUEUE_WAIT, max(0.0, time.time() - item.queued_at))
+                pk = item.packet.get_packet()
+                trace = self._trace_received(pk, item)
+                t0 = time.perf_counter()
+                self._dispatch_packet(pk, item.identity, item.name, trace)
+                PIPELINE_METRICS.record(STAGE_DISPATCH, time.perf_counter() - t0)
 
-                            except Exception as fallback_error:
-                                self.log( f"Could not dynamically load handler '{handler_name}': {fallback_error}", error=fallback_error, block="dynamic_config_packet")
+            except Exception as e:
+                self.log(f"Failed to process {item.name}", error=e)
 
-                        except Exception as e:
-                            self.log(f"Failed to process {fname}", error=e)
-                            if fpath and os.path.isfile(fpath):
-                                os.remove(fpath)
-                            continue
+            #a long backlog keeps the gauge moving while it drains
+            self._publish_inbox_gauge()
 
-            except Exception as loop_error:
+    def _publish_inbox_gauge(self, force=False):
+        """Writes the inbox queue depth to hello.moto/inbox.gauge, at most once a second.
 
-                self.log("Error in loop", error=loop_error, block="main_try")
+        The gauge is rewritten when the depth changed, or every 10 seconds so
+        senders can tell it is fresh.
+        """
+        ra = self._inbox_ra
+        if ra is None:
+            return
+        now = time.time()
+        last_time, last_depth = self._inbox_gauge_last
+        depth = ra.get_scan_stats()["remaining"]
+        if not force and now - last_time < 1:
+            return
+        if depth == last_depth and now - last_time < 10:
+            return
 
-            #packet_listener_post call
+        gauge = {"universal_id": self.command_line_args.get("universal_id"), "depth": depth,
+                 "dropped": self._inbox_dropped, "updated": now}
+        gauge["lanes"] = {lane: m["depth"] for lane, m in self.get_lane_metrics().items()}
+        if self._inbox_quota:
+            gauge.update(self._inbox_quota.to_gauge())
+            gauge["saturated"] = depth >= self._inbox_quota.max_packets
+        try:
+            write_gauge(os.path.join(self.path_resolution["comm_path_resolved"], "hello.moto"), gauge)
+            self._inbox_gauge_last = (now, depth)
+        except Exception as e:
+            self.log("Failed to write inbox gauge", error=e, block="inbox_gauge")
+
+    def build_routing_table(self):
+        """Precompiles the handler routing table from the agent's cmd_* and msg_* methods.
+
+        Called when the listener starts and again after factory injection, so
+        handlers attached by factories are picked up. Any other handler name
+        is resolved on first use. Negative entries are dropped on rebuild.
+        """
+        routes = {}
+        for name in dir(self):
+            if not name.startswith(("cmd_", "msg_")):
+                continue
+            fn = getattr(self, name, None)
+            if callable(fn):
+                routes[name] = (self.ROUTE_METHOD, fn)
+
+        with self._routes_lock:
+            self._routes = routes
+        if self.debug.is_enabled():
+            self.log(f"[ROUTES] {len(routes)} handler(s) in routing table.")
+
+    def _get_route(self, handler_name: str) -> tuple:
+        """Returns (kind, target) for a handler: a bound method, a factory module, or missing."""
+        route = self._routes.get(handler_name)
+        if route is not None:
+            if route[0] != self.ROUTE_MISSING:
+                self._route_stats["hits"] += 1
+                return route
+            if time.time() < route[1]:
+                self._route_stats["negative_hits"] += 1
+                return route
+        return self._resolve_route(handler_name)
+
+    def _resolve_route(self, handler_name: str) -> tuple:
+        handler_fn = getattr(self, handler_name, None)
+        if callable(handler_fn):
+            route = (self.ROUTE_METHOD, handler_fn)
+        else:
+            # Clean up handler name (e.g. strip namespaces)
+            handler_id = handler_name.split(".")[-1]  # e.g. cmd_example
+            full_module_path = f"agent.{self.command_line_args['agent_name']}.factory.{handler_id}"
             try:
-                handler_fn = getattr(self, "packet_listener_post", None)
-                if callable(handler_fn):
-                    self.packet_listener_post() #used as hook or cron, so any operation that effects the agent_tree for instance stay on same thread
+                mod = __import__(full_module_path, fromlist=["attach"])
+                if not callable(getattr(mod, "attach", None)):
+                    raise ImportError(f"{full_module_path} has no attach()")
+                route = (self.ROUTE_FACTORY, mod)
+                self.log(f"✅ Loaded factory handler: {full_module_path}")
+            except Exception as e:
+                #unknown handler: don't retry the import on every packet
+                route = (self.ROUTE_MISSING, time.time() + self._route_negative_ttl)
+                self.log(f"Could not resolve handler '{handler_name}', ignoring it for {self._route_negative_ttl}s: {e}",
+                         block="dynamic_config_packet")
+
+        with self._routes_lock:
+            self._routes = dict(self._routes)
+            self._routes[handler_name] = route
+        self._route_stats["missing" if route[0] == self.ROUTE_MISSING else "resolved"] += 1
+        return route
+
+    def _trace_received(self, pk: dict, item) -> TraceContext:
+        """Records the queue-wait and decrypt spans of a traced packet; returns the sender's span, or None."""
+        if not TRACER.is_enabled() or not isinstance(pk, dict) or TRACE_FIELD not in pk:
+            return None
+        parent = TraceContext.from_packet(pk[TRACE_FIELD])
+        if parent is None:
+            return None
+        sender = pk.get("origin") if pk.get("origin") != "unknown" else ""
+        if item.queued_at and item.read_at:
+            TRACER.record(TRACER.child_of(parent), parent.span_id, SPAN_QUEUE_WAIT, item.queued_at,
+                          max(0.0, item.read_at - item.queued_at), item.lane or "", sender)
+        if item.read_at and item.read_time is not None:
+            TRACER.record(TRACER.child_of(parent), parent.span_id, SPAN_DECRYPT, item.read_at, item.read_time, "", sender)
+        return parent
+
+    @staticmethod
+    def _timed_handler(handler_name: str, handler_fn, trace: TraceContext = None):
+        """Wraps a handler so its run time lands in the handler histogram.
+
+        With a trace, the run is recorded as a handle span and is the
+        current span on its thread, so packets it passes on join the trace.
+        """
+        def run(*args):
+            span = TRACER.child_of(trace) if trace is not None else None
+            previous = TRACER.activate(span) if span is not None else None
+            started = time.time()
+            t0 = time.perf_counter()
+            try:
+                return handler_fn(*args)
+            finally:
+                elapsed = time.perf_counter() - t0
+                PIPELINE_METRICS.record_handler(handler_name, elapsed)
+                if span is not None:
+                    TRACER.restore(previous)
+                    TRACER.record(span, trace.span_id, SPAN_HANDLE, started, elapsed, handler_name)
+        return run
+
+    def get_route_stats(self) -> dict:
+        stats = dict(self._route_stats)
+        stats["size"] = len(self._routes)
+        return stats
+
+    def _dispatch_packet(self, pk: dict, identity: IdentityObject = None, source: str = "", trace: TraceContext = None):
+        """Routes a decrypted packet to its handler.
+
+        The handler is a single lookup in the routing table (see
+        build_routing_table()): a method on the agent named after the
+        packet's 'handler' field, or the attach() of
+        agent.<name>.factory.<handler>. Unknown handlers are negatively
+        cached and skipped quietly until the entry expires.
 
+        Args:
+            pk (dict): The decrypted packet.
+            identity (IdentityObject, optional): The verified sender identity.
+            source (str): Where the packet came from (filename, socket), for logging.
+            trace (TraceContext, optional): The sender's span; the handler run
+                is recorded as its child.
+        """
+        handler_name = pk.get("handler")
+        if not handler_name:
+            self.log(f"[UNIFIED][SKIP] No 'call' in: {source} packet: {pk}")
+            return
+
+        content = pk.get("content", {})
+        watcher = getattr(self, "_drop_zone_watcher", None)
+
+        kind, target = self._get_route(handler_name)
+        if kind == self.ROUTE_MISSING:
+            return
+
+        if kind == self.ROUTE_FACTORY:
+            try:
+                if watcher:
+                    watcher.record_dispatch()
+                self._timed_handler(handler_name, target.attach, trace)(self, {"packet": pk, "content": content, "identity": identity})
             except Exception as e:
-                self.log(error=e, block="packet_listener_post")
+                self.log(f"Factory handler '{handler_name}' failed", error=e, block="dynamic_config_packet")
+            return
 
-            interruptible_sleep(self, 3)
+        try:
+            if watcher:
+                watcher.record_dispatch()
+
+            #control handlers never queue behind pooled work
+            policy = None if handler_name in self._control_handlers else self._get_dispatch_policy(handler_name, target)
+            if policy:
+                ordering_key = policy.get("ordering_key")
+                if callable(ordering_key):
+                    key = ordering_key(content, pk)
+                elif ordering_key and isinstance(content, dict):
+                    key = content.get(ordering_key)
+                else:
+                    key = None
+                self._dispatch_pool.submit(handler_name, self._timed_handler(handler_name, target, trace), (content, pk, identity), key=key)
+                return
 
+            self._timed_handler(handler_name, target, trace)(content, pk, identity)
+            if self.debug.is_enabled():
+                self.log(f"[UNIFIED] ✅ Executed handler: {handler_name}")
+        except Exception as e:
+            self.log(f"[UNIFIED][ERROR] Handler '{handler_name}' failed: {e}")
 
     def save_directive(self, path: dict, node_tree :dict, football:Football):
         """
@@ -694,7 +1114,7 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
             ra.set_location({"path": path["path"]}) \
                 .set_identifier(path['name']) \
-                .set_metadata({"atomic": True}) \
+                .set_metadata({"durability": "fsync_dir"}) \
                 .set_address([path["address"]]) \
                 .set_drop_zone({"drop": path["drop"]}) \
                 .set_packet(pk1) \
@@ -782,7 +1202,6 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
         self.log("Throttled worker wrapper engaged.")
         config_path = os.path.join(self.path_resolution["comm_path_resolved"], "config")
         os.makedirs(config_path, exist_ok=True)
-        fpath=None
         identity=None
         emit_beacon = self.check_for_thread_poke("worker", 5)
         last_dir_mtime = os.path.getmtime(config_path)
@@ -827,38 +1246,23 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
                             if current_dir_mtime != last_dir_mtime:
                                 last_dir_mtime = current_dir_mtime
 
-                                for fname in os.listdir(config_path):
+                                for item in ra.receive_batch(packet_factory=lambda: self.get_delivery_packet("standard.general.json.packet", new=True)):
 
-                                    if not fname.endswith(".json"):
+                                    if not item.ok():
+                                        self.log(f"Failed to receive data from reception agent or error: {item.error or 'invalid packet'}.")
                                         continue
 
-                                    #get json packet
-                                    pk1 = self.get_delivery_packet("standard.general.json.packet", new=True)
-
-                                    packet = ra.set_identifier(fname) \
-                                        .set_packet(pk1) \
-                                        .receive()
-
-                                    fpath = os.path.join(config_path, fname)  # get the file's path
-
-                                    _config = packet.get_packet()
-
-                                    if ra.get_error_success() or packet is None:
-                                        self.log(f"Failed to receive data from reception agent or error: {ra.get_error_success_msg()}.")
+                                    _config = item.packet.get_packet()
 
                                     if self.debug.is_enabled():
-                                        self.log(f"config: path: {fpath} {config}")
+                                        self.log(f"config: path: {os.path.join(config_path, item.name)} {config}")
 
-                                    os.remove(fpath)
-
-                                    identity = ra.get_identity()
+                                    identity = item.identity
 
                                     if isinstance(_config, dict):
                                         config = _config.copy()
 
                         except Exception as e:
-                            if fpath and os.path.isfile(fpath):
-                                os.remove(fpath)
                             self.log(f"config {config}", error=e)
 
                         #AVOID SPAMMING LOGS
@@ -1347,7 +1751,7 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
         except Exception as e:
             self.log(error=e, block="main_try")
 
-    def pass_packet(self, packet:BasePacket, target_uid:str, drop_zone:str="incoming"):
+    def pass_packet(self, packet:BasePacket, target_uid:str, drop_zone:str="incoming", durability:str=None):
         """
         A high-level helper method to securely prepare and deliver a packet.
 
@@ -1355,39 +1759,348 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
         loading the target's identity, getting a DeliveryAgent, and delivering
         the packet.
 
+        Packets for a target's incoming drop zone honour the target's inbox
+        quota (see get_target_pressure()). A full reject inbox refuses the
+        packet; a full coalesce inbox replaces this sender's pending packet
+        with the same key; a full drop_oldest inbox takes it and trims later.
+        Control lane packets (see _get_packet_lane()) skip the quota.
+
         Args:
             packet (BasePacket): The packet object to be sent.
             target_uid (str): The universal_id of the recipient agent.
             drop_zone (str): The sub-directory to deliver to (e.g., "incoming").
+            durability (str, optional): none | rename | fsync | fsync_dir | group.
+                Defaults to the directive's durability config for the packet's
+                handler, else fsync.
 
         Returns:
-            bool: True if delivery was successful, False otherwise.
+            PassResult: Truthy if delivery was successful. saturated is True
+            when the target's inbox is full, reason is "target saturated" when
+            the packet was refused for it; producers should slow down.
         """
+        pressure = None
         try:
 
-            codex_path = os.path.join(self.path_resolution["comm_path"], target_uid, "codex", "signed_public_key.json")
-            if not os.path.exists(codex_path):
+            football = self.get_pass_context(target_uid)
+            if football is None:
                 self.log(f"[PASS-PACKET] ❌ No public key found for {target_uid}. Aborting send.")
-                return False
-
-            football = self.get_football(type=self.FootballType.PASS)
-            football.load_identity_file(universal_id=target_uid)
-            da = self.get_delivery_agent("file.json_file", football=football, new=True)
+                return PassResult(False)
+
+            identifier = None
+            if self._quota_applies(packet, drop_zone):
+                pressure = self.get_target_pressure(target_uid)
+                if pressure and pressure["saturated"]:
+                    if pressure["policy"] == POLICY_REJECT:
+                        self._note_saturated(target_uid, pressure)
+                        return PassResult(False, True, TARGET_SATURATED, pressure["depth"], pressure["max_packets"], pressure["policy"])
+                    if pressure["policy"] == POLICY_COALESCE and pressure["coalesce_key"]:
+                        lane = self._get_packet_lane(packet, self._packet_handler(packet))
+                        identifier = coalesce_name(self.command_line_args.get("universal_id"), packet.get_packet(),
+                                                   pressure["coalesce_key"], LANE_PREFIX[lane])
+
+            #only the incoming listener reads trace context
+            span, parent_id = self._begin_trace(packet) if drop_zone == "incoming" else (None, None)
+            started = time.time()
+            da = self.get_delivery_agent(self._packet_transport, football=football, new=True)
+            if identifier:
+                da.set_identifier(identifier)
             da.set_location({"path": self.path_resolution["comm_path"]}) \
                 .set_address([target_uid]) \
                 .set_drop_zone({"drop": drop_zone}) \
+                .set_metadata(self._get_delivery_metadata(packet, durability)) \
                 .set_packet(packet) \
                 .deliver()
+            if span is not None:
+                TRACER.record(span, parent_id, SPAN_DELIVER, started, time.time() - started, drop_zone, target_uid)
 
             if da.get_error_success() != 0:
                 self.log(f"[PASS-PACKET][FAIL] to {target_uid}: {da.get_error_success_msg()}", level="ERROR")
-                return False
+                return PassResult(False)
             else:
                 self.log(f"Packet passed to {target_uid} successfully.")
-                return True
+                if pressure is None:
+                    return PassResult(True)
+                #a coalesced packet replaces one already counted
+                if not identifier:
+                    self._count_sent(target_uid)
+                return PassResult(True, pressure["saturated"], None, pressure["depth"], pressure["max_packets"], pressure["policy"])
         except Exception as e:
             self.log(f"Failed during pass_packet to {target_uid}", error=e, level="ERROR")
+            return PassResult(False)
+
+    def _begin_trace(self, packet: BasePacket) -> tuple:
+        """Stamps the packet with a new deliver span; returns (span, parent span id), (None, None) when untraced.
+
+        The parent is the handler span running on this thread, else the
+        trace the packet arrived with (get_trace()), else the deliver span
+        starts a new trace.
+        """
+        if not TRACER.is_enabled():
+            return None, None
+        payload = packet.get_packet()
+        if not isinstance(payload, dict):
+            return None, None
+        parent = TRACER.current()
+        if parent is None and packet.get_trace():
+            parent = TraceContext.from_packet(packet.get_trace())
+        span = TRACER.child_of(parent)
+        if span is None:
+            payload.pop(TRACE_FIELD, None)
+            return None, None
+        payload[TRACE_FIELD] = span.to_packet()
+        return span, parent.span_id if parent is not None else None
+
+    def get_target_pressure(self, target_uid: str) -> dict:
+        """Returns the inbox pressure of a target, or None if it publishes no quota.
+
+        Reads the target's hello.moto/inbox.gauge (only when the file changed)
+        and adds the packets this agent passed to it since the gauge was
+        written, so a stalled target still fills up.
+
+        Args:
+            target_uid (str): The universal_id of the recipient agent.
+
+        Returns:
+            dict: depth, max_packets, policy, coalesce_key, saturated, updated.
+        """
+        gauge_path = os.path.join(self.path_resolution["comm_path"], target_uid, "hello.moto", GAUGE_FILE)
+        try:
+            st = os.stat(gauge_path)
+        except OSError:
+            with self._inbox_pressure_lock:
+                self._inbox_pressure.pop(target_uid, None)
+            return None
+
+        stamp = (st.st_mtime_ns, st.st_ino, st.st_size)
+        with self._inbox_pressure_lock:
+            cached = self._inbox_pressure.get(target_uid)
+        if not cached or cached[0] != stamp:
+            gauge = read_gauge(os.path.dirname(gauge_path))
+            cached = [stamp, gauge, 0, False]
+            with self._inbox_pressure_lock:
+                self._inbox_pressure[target_uid] = cached
+
+        gauge = cached[1]
+        if not gauge or not gauge.get("max_packets"):
+            return None
+
+        depth = int(gauge.get("depth", 0)) + cached[2]
+        return {"depth": depth,
+                "max_packets": gauge["max_packets"],
+                "policy": gauge.get("policy", POLICY_REJECT),
+                "coalesce_key": gauge.get("coalesce_key"),
+                "saturated": depth >= gauge["max_packets"],
+                "updated": gauge.get("updated")}
+
+    def _quota_applies(self, packet: BasePacket, drop_zone: str) -> bool:
+        """Inbox quotas cover packets for the incoming drop zone, except the control lane."""
+        if drop_zone != "incoming":
             return False
+        return self._get_packet_lane(packet, self._packet_handler(packet)) != LANE_CONTROL
+
+    def _count_sent(self, target_uid: str):
+        with self._inbox_pressure_lock:
+            cached = self._inbox_pressure.get(target_uid)
+            if cached:
+                cached[2] += 1
+
+    def _note_saturated(self, target_uid: str, pressure: dict):
+        """Logs a refused packet, once per gauge update of the target."""
+        with self._inbox_pressure_lock:
+            cached = self._inbox_pressure.get(target_uid)
+            if not cached or cached[3]:
+                return
+            cached[3] = True
+        self.log(f"[PASS-PACKET][SATURATED] {target_uid} inbox {pressure['depth']}/{pressure['max_packets']}, refusing packets until it drains.", level="WARNING")
+
+    def pass_packet_many(self, packet:BasePacket, uids:list, drop_zone:str="incoming", durability:str=None) -> dict:
+        """
+        Multicast version of pass_packet(): one packet to several agents.
+
+        The payload is signed and AES-encrypted once; only the content key is
+        wrapped per recipient, then the envelope is dropped into every
+        recipient's drop zone. Recipients without a public key are skipped.
+
+        Args:
+            packet (BasePacket): The packet object to be sent.
+            uids (list): universal_ids of the recipients.
+            drop_zone (str): The sub-directory to deliver to (e.g., "incoming").
+            durability (str, optional): See pass_packet().
+
+        Inbox quotas apply per recipient as in pass_packet() (not to control
+        lane packets); recipients whose full inbox coalesces get their own
+        pass_packet().
+
+        Returns:
+            dict: {universal_id: PassResult} delivery result per recipient.
+        """
+        results = {}
+        contexts = {}
+        pressures = {}
+        try:
+            quota_applies = self._quota_applies(packet, drop_zone)
+            for uid in dict.fromkeys(uids):
+                football = self.get_pass_context(uid)
+                if football is None or not football.get_aes_encryption_pubkey():
+                    self.log(f"[PASS-PACKET] ❌ No public key found for {uid}. Skipping.")
+                    results[uid] = PassResult(False)
+                    continue
+                pressure = self.get_target_pressure(uid) if quota_applies else None
+                if pressure and pressure["saturated"]:
+                    if pressure["policy"] == POLICY_REJECT:
+                        self._note_saturated(uid, pressure)
+                        results[uid] = PassResult(False, True, TARGET_SATURATED, pressure["depth"], pressure["max_packets"], pressure["policy"])
+                        continue
+                    if pressure["policy"] == POLICY_COALESCE and pressure["coalesce_key"]:
+                        results[uid] = self.pass_packet(packet, uid, drop_zone, durability)
+                        continue
+                pressures[uid] = pressure
+                contexts[uid] = football
+
+            if not contexts:
+                return results
+
+            #an RSA-encrypted payload opens for one recipient only, nothing to share
+            if any(fb.use_asymmetric_encryption() for fb in contexts.values()):
+                for uid in contexts:
+                    results[uid] = self.pass_packet(packet, uid, drop_zone, durability)
+                return results
+
+            #shallow copy: shares the verified identities, only the recipient list is new
+            football = copy.copy(next(iter(contexts.values())))
+            football.set_recipient_pubkeys({uid: fb.get_aes_encryption_pubkey() for uid, fb in contexts.items()})
+
+            #only the incoming listener reads trace context
+            span, parent_id = self._begin_trace(packet) if drop_zone == "incoming" else (None, None)
+            started = time.time()
+            da = self.get_delivery_agent(self._packet_transport, football=football, new=True)
+            da.set_location({"path": self.path_resolution["comm_path"]}) \
+                .set_address(list(contexts)) \
+                .set_drop_zone({"drop": drop_zone}) \
+                .set_metadata(self._get_delivery_metadata(packet, durability)) \
+                .set_packet(packet) \
+                .deliver()
+            if span is not None:
+                #one deliver span for the multicast, every recipient's spans hang off it
+                TRACER.record(span, parent_id, SPAN_DELIVER, started, time.time() - started, drop_zone, ",".join(contexts))
+
+            failed = set()
+            if da.get_error_success() != 0:
+                self.log(f"[PASS-PACKET][FAIL] multicast: {da.get_error_success_msg()}", level="ERROR")
+                #an error with no per-uid detail means nothing was written
+                if hasattr(da, "get_failed_addresses"):
+                    failed = set(da.get_failed_addresses())
+                failed = failed or set(contexts)
+            for uid in contexts:
+                pressure = pressures.get(uid)
+                if uid in failed:
+                    results[uid] = PassResult(False)
+                elif pressure is None:
+                    results[uid] = PassResult(True)
+                else:
+                    self._count_sent(uid)
+                    results[uid] = PassResult(True, pressure["saturated"], None, pressure["depth"], pressure["max_packets"], pressure["policy"])
+
+        except Exception as e:
+            self.log(f"Failed during pass_packet_many to {uids}", error=e, level="ERROR")
+            for uid in uids:
+                results.setdefault(uid, PassResult(False))
+
+        return results
+
+    def _get_delivery_metadata(self, packet:BasePacket, durability:str=None) -> dict:
+        """Delivery agent metadata for one packet: framing, the durability for its handler and its priority lane."""
+        handler = self._packet_handler(packet)
+
+        if durability is None and self._durability_config:
+            durability = self._durability_config.get("handlers", {}).get(handler) or self._durability_config.get("default")
+
+        metadata = self._delivery_metadata
+        if durability:
+            metadata = dict(metadata, durability=durability)
+
+        lane = self._get_packet_lane(packet, handler)
+        if lane != LANE_NORMAL:
+            metadata = dict(metadata, prefix=LANE_PREFIX[lane])
+        return metadata
+
+    @staticmethod
+    def _packet_handler(packet:BasePacket):
+        try:
+            return packet.get_packet().get("handler")
+        except Exception:
+            return None
+
+    def _get_packet_lane(self, packet:BasePacket, handler:str=None) -> str:
+        """Priority lane of an outgoing packet: set on the packet, else the directive, else control for control handlers."""
+        lane = None
+        if hasattr(packet, "get_priority"):
+            lane = normalize_lane(packet.get_priority())
+        if lane is None:
+            lane = normalize_lane(self._priority_config.get("handlers", {}).get(handler))
+        if lane is None and handler in self._control_handlers:
+            lane = LANE_CONTROL
+        return lane or LANE_NORMAL
+
+    def get_pass_context(self, target_uid: str):
+        """Returns a Football ready to send to target_uid, or None if the target has no codex.
+
+        The target's signed_public_key.json is read and its Matrix signature
+        verified once; later calls only stat the file. A changed mtime, inode
+        or size (identity reissued, agent respawned) triggers a reload. The
+        returned Football is shared between calls and must not be modified.
+
+        Args:
+            target_uid (str): The universal_id of the recipient agent.
+
+        Returns:
+            Football: The pass football with the target identity loaded, or None.
+        """
+        codex_path = os.path.join(self.path_resolution["comm_path"], target_uid, "codex", "signed_public_key.json")
+        try:
+            st = os.stat(codex_path)
+        except OSError:
+            with self._pass_contexts_lock:
+                self._pass_contexts.pop(target_uid, None)
+            return None
+
+        stamp = (st.st_mtime_ns, st.st_ino, st.st_size)
+        with self._pass_contexts_lock:
+            cached = self._pass_contexts.get(target_uid)
+            if cached and cached[0] == stamp:
+                self._pass_context_stats["hits"] += 1
+                return cached[1]
+
+        football = self.get_football(type=self.FootballType.PASS)
+        if not football.load_identity_file(universal_id=target_uid):
+            #don't cache a failed load, the codex may be mid-write
+            with self._pass_contexts_lock:
+                self._pass_context_stats["failed"] += 1
+                self._pass_contexts.pop(target_uid, None)
+            return football
+
+        with self._pass_contexts_lock:
+            self._pass_context_stats["reloads" if cached else "loads"] += 1
+            self._pass_contexts[target_uid] = (stamp, football)
+
+        #identity reissued: the old session key was wrapped for a dead pubkey
+        if cached and cached[1].get_aes_encryption_pubkey() != football.get_aes_encryption_pubkey():
+            SESSION_KEY_STORE.drop_peer(cached[1].get_aes_encryption_pubkey())
+        return football
+
+    def invalidate_pass_context(self, target_uid: str = None):
+        """Drops the cached pass football for target_uid, or all of them."""
+        with self._pass_contexts_lock:
+            if target_uid is None:
+                self._pass_contexts.clear()
+            else:
+                self._pass_contexts.pop(target_uid, None)
+
+    def get_pass_context_stats(self) -> dict:
+        with self._pass_contexts_lock:
+            stats = dict(self._pass_context_stats)
+            stats["size"] = len(self._pass_contexts)
+        return stats
 
     def catch_packet(self, filename, drop_zone="incoming"):
         """
@@ -1409,12 +2122,14 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
             packet_obj = self.get_delivery_packet("standard.command.packet")  # A generic packet to hold the data
 
-            packet = ra.set_location({"path": self.path_resolution["comm_path"]}) \
+            ra.set_location({"path": self.path_resolution["comm_path"]}) \
                 .set_address([self.command_line_args["universal_id"]]) \
                 .set_drop_zone({"drop": drop_zone}) \
                 .set_identifier(filename) \
-                .set_packet(packet_obj) \
-                .receive()
+                .set_packet(packet_obj)
+
+            # the named file is opened directly; the caller decides when to delete it
+            packet = ra.receive()
 
             if packet is None or ra.get_error_success() != 0:
                 self.log(f"Failed to receive packet {filename}: {ra.get_error_success_msg()}", level="ERROR")
@@ -1424,4 +2139,32 @@ class BootAgent(PacketFactoryMixin, PacketDeliveryFactoryMixin, PacketReceptionF
 
         except Exception as e:
             self.log(f"Failed during catch_packet for {filename}", error=e, level="ERROR")
-            return None
\ No newline at end of file
+            return None
+
+    def catch_packets(self, drop_zone="incoming", remove=True):
+        """
+        Batch version of catch_packet(): decrypts every packet waiting in a drop zone.
+
+        The drop zone is listed once and files are read oldest first. Each
+        file is removed after it is read unless remove is False.
+
+        Args:
+            drop_zone (str): The sub-directory to read (e.g., "incoming").
+            remove (bool): Delete each file once it has been read.
+
+        Yields:
+            tuple: (filename, packet dict or None, IdentityObject or None, error or None)
+        """
+        try:
+            football = self.get_football(type=self.FootballType.CATCH)
+            ra = self.get_reception_agent("file.json_file", new=True, football=football)
+            ra.set_location({"path": self.path_resolution["comm_path"]}) \
+                .set_address([self.command_line_args["universal_id"]]) \
+                .set_drop_zone({"drop": drop_zone})
+
+            factory = lambda: self.get_delivery_packet("standard.command.packet")
+            for item in ra.receive_batch(packet_factory=factory, remove=remove):
+                yield item.name, (item.packet.get_packet() if item.ok() else None), item.identity, item.error
+
+        except Exception as e:
+            self.log(f"Failed during catch_packets for {drop_zone}", error=e, level="ERROR")
\ No newline at end of file
@@ -0,0 +1,195 @@
+#Authored by Daniel F MacDonald and ChatGPT aka The Generals
+import os
+import time
+import threading
+from matrixswarm.core.mixin.log_method import LogMixin
+
+try:
+    import inotify.adapters
+    import inotify.constants
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+class DropZoneWatcher(LogMixin):
+    """Wakes a listener as soon as a packet lands in a drop zone.
+
+    On Linux the watcher holds an inotify watch on the drop zone and wakes on
+    IN_MOVED_TO (atomic deliveries) and IN_CLOSE_WRITE (direct writes) for
+    files matching the packet extension. Where inotify is not available, or
+    the watch can't be placed (NFS, some FUSE mounts), it falls back to the
+    classic directory mtime poll.
+
+    The watcher also keeps wake-to-dispatch latency stats so the hop delay can
+    be confirmed from the agent's log.
+
+    With set_priority_names(), a file whose name matches a priority prefix
+    (or is a named cookie such as "die") also raises a priority flag that a
+    listener busy with a long batch can poll with take_priority(). Only the
+    inotify backend raises it; the poll backend sees such files on the next
+    scan.
+    """
+    def __init__(self, path, file_ext=".json", poll_interval=3):
+        self.path = path
+        self.file_ext = file_ext
+        self.poll_interval = poll_interval
+        self._backend = "poll"
+        self._wake = threading.Event()
+        self._wake_ts = None
+        self._batch_wake_ts = None
+        self._running = False
+        self._thread = None
+        self._last_dir_mtime = 0
+        self._priority = threading.Event()
+        self._priority_prefixes = ()
+        self._priority_names = frozenset()
+        self._stats = {"wakes": 0, "dispatched": 0, "latency_total": 0.0, "latency_max": 0.0, "latency_last": 0.0}
+
+    def start(self):
+        """Places the watch. Returns self."""
+        self._running = True
+        try:
+            self._last_dir_mtime = os.path.getmtime(self.path)
+        except Exception:
+            self._last_dir_mtime = 0
+
+        if INOTIFY_AVAILABLE:
+            try:
+                i = inotify.adapters.Inotify(block_duration_s=1)
+                i.add_watch(self.path, mask=inotify.constants.IN_MOVED_TO | inotify.constants.IN_CLOSE_WRITE)
+                self._backend = "inotify"
+                self._thread = threading.Thread(target=self._inotify_loop, args=(i,), name="drop_zone_watcher", daemon=True)
+                self._thread.start()
+            except Exception as e:
+                self._backend = "poll"
+                self.log(f"inotify unavailable on {self.path}, falling back to mtime poll", error=e, block="START")
+
+        return self
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def set_priority_names(self, prefixes=(), names=()):
+        """Filename prefixes (e.g. "p0" for p0_*.json) and exact names that raise the priority flag. Returns self."""
+        self._priority_prefixes = tuple(f"{p}_" for p in prefixes)
+        self._priority_names = frozenset(names)
+        return self
+
+    def take_priority(self) -> bool:
+        """True once per burst of priority files since the last call."""
+        if self._priority.is_set():
+            self._priority.clear()
+            return True
+        return False
+
+    def get_backend(self) -> str:
+        return self._backend
+
+    def _inotify_loop(self, i):
+        while self._running:
+            try:
+                for event in i.event_gen(yield_nones=False, timeout_s=1):
+                    (_, type_names, path, filename) = event
+                    if filename and (filename in self._priority_names or
+                                     (filename.startswith(self._priority_prefixes) and filename.endswith(self.file_ext))):
+                        self._priority.set()
+                        self._signal()
+                    elif filename and filename.endswith(self.file_ext):
+                        self._signal()
+                    if not self._running:
+                        break
+            except Exception as e:
+                # watch died (dir removed, queue overflow); drop back to polling
+                self.log("inotify loop failed, falling back to mtime poll", error=e, block="INOTIFY")
+                self._backend = "poll"
+                self._signal()
+                return
+
+    def notify(self):
+        """Wakes the listener from another source, e.g. a packet queued on the agent's socket."""
+        self._signal()
+
+    def _signal(self):
+        if not self._wake.is_set():
+            self._wake_ts = time.time()
+            self._wake.set()
+
+    def wait(self, agent=None) -> bool:
+        """Blocks until a packet arrives or the poll interval expires.
+
+        Args:
+            agent: Optional agent; the wait ends early once agent.running is False.
+
+        Returns:
+            bool: True if the drop zone changed and should be scanned.
+        """
+        deadline = time.time() + self.poll_interval
+        while True:
+            if agent is not None and not agent.running:
+                return False
+
+            if self._backend == "inotify":
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return self._poll_mtime()
+                if self._wake.wait(min(remaining, 1)):
+                    return self._consume()
+            else:
+                if self._poll_mtime():
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(remaining, 1))
+
+    def _consume(self) -> bool:
+        self._batch_wake_ts = self._wake_ts
+        self._wake.clear()
+        self._stats["wakes"] += 1
+        try:
+            self._last_dir_mtime = os.path.getmtime(self.path)
+        except Exception:
+            pass
+        return True
+
+    def _poll_mtime(self) -> bool:
+        # safety net for both backends: a missed event is picked up on the next interval
+        try:
+            current = os.path.getmtime(self.path)
+        except Exception:
+            return False
+        if current != self._last_dir_mtime:
+            self._last_dir_mtime = current
+            self._batch_wake_ts = time.time()
+            self._stats["wakes"] += 1
+            return True
+        return False
+
+    def record_dispatch(self):
+        """Records the wake-to-dispatch latency of a packet handed to its handler."""
+        if self._batch_wake_ts is None:
+            return
+        latency = time.time() - self._batch_wake_ts
+        s = self._stats
+        s["dispatched"] += 1
+        s["latency_total"] += latency
+        s["latency_last"] = latency
+        if latency > s["latency_max"]:
+            s["latency_max"] = latency
+
+    def get_stats(self) -> dict:
+        s = self._stats
+        avg = (s["latency_total"] / s["dispatched"]) if s["dispatched"] else 0.0
+        return {
+            "backend": self._backend,
+            "wakes": s["wakes"],
+            "dispatched": s["dispatched"],
+            "latency_avg_ms": round(avg * 1000, 3),
+            "latency_max_ms": round(s["latency_max"] * 1000, 3),
+            "latency_last_ms": round(s["latency_last"] * 1000, 3),
+        }
+
+    def reset_stats(self):
+        for k in self._stats:
+            self._stats[k] = 0 if isinstance(self._stats[k], int) else 0.0
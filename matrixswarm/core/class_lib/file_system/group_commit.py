@@ -0,0 +1,171 @@
+#Authored by Daniel F MacDonald and ChatGPT aka The Generals
+import os
+import time
+import atexit
+import ctypes
+import threading
+from matrixswarm.core.mixin.log_method import LogMixin
+
+# durability levels for atomic file drops, weakest to strongest
+DURABILITY_NONE = "none"            # legacy "atomic": False; same as rename, a drop is never visible half-written
+DURABILITY_RENAME = "rename"        # temp file + os.replace, no fsync
+DURABILITY_FSYNC = "fsync"          # temp file + fsync + os.replace (classic default)
+DURABILITY_FSYNC_DIR = "fsync_dir"  # fsync + os.replace + fsync of the directory entry
+DURABILITY_GROUP = "group"          # fsync_dir, batched by GroupCommitter; the writer waits for its batch
+# a group batch is flushed with syncfs(), which writes back every dirty page of the comm filesystem
+# (logs, metrics, other agents' files), not only the batch. Cheap while the batch dominates, costly
+# next to a busy writer on the same filesystem; prefer fsync_dir there.
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_RENAME, DURABILITY_FSYNC, DURABILITY_FSYNC_DIR, DURABILITY_GROUP)
+
+def fsync_dir(path: str):
+    """Flushes a directory entry (the rename) to disk. No-op where directories can't be opened."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+try:
+    _syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+except (AttributeError, OSError):
+    _syncfs = None
+
+def sync_filesystems(paths):
+    """Flushes the filesystems holding paths: one syncfs per filesystem, a global os.sync() where syncfs is missing."""
+    if _syncfs is None:
+        os.sync()
+        return
+    seen = set()
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            dev = os.fstat(fd).st_dev
+            if dev not in seen:
+                seen.add(dev)
+                if _syncfs(fd) != 0:
+                    os.sync()
+                    return
+        finally:
+            os.close(fd)
+
+class GroupCommitter(LogMixin):
+    """Batches the fsyncs of atomic file drops written within a short window.
+
+    commit() queues a temp file into the current batch and waits for it.
+    Once per window a background thread flushes everything queued in it with
+    a single syncfs of the comm filesystem (instead of an fsync per temp
+    file), renames the temp files onto their final names, fsyncs each
+    directory once and wakes the batch's writers. A commit() that returned
+    True is durable and visible, as with fsync_dir; a writer killed while it
+    waits reported nothing and leaves a temp file the receiver sweeps later.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(GroupCommitter, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._pending = cls._instance._new_batch()
+            cls._instance._window = 0.05
+            cls._instance._thread = None
+            cls._instance._stats = {"batches": 0, "files": 0, "failed": 0, "largest_batch": 0}
+            atexit.register(cls._instance.flush)
+
+        return cls._instance
+
+    def set_window(self, seconds: float):
+        self._window = max(0.001, float(seconds))
+        return self
+
+    @staticmethod
+    def _new_batch() -> dict:
+        return {"files": [], "failed": set(), "done": threading.Event()}
+
+    def commit(self, temp_path: str, final_path: str) -> bool:
+        """Queues a written temp file and waits until its batch is synced and renamed onto final_path.
+
+        Returns True once final_path is durable, False if its rename failed.
+        """
+        return self.wait(self.submit(temp_path, final_path), final_path)
+
+    def submit(self, temp_path: str, final_path: str) -> dict:
+        """Queues a written temp file without waiting; pass the returned batch to wait()."""
+        with self._lock:
+            batch = self._pending
+            batch["files"].append((temp_path, final_path))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="group_commit", daemon=True)
+                self._thread.start()
+        return batch
+
+    @staticmethod
+    def wait(batch: dict, final_path: str) -> bool:
+        batch["done"].wait()
+        return final_path not in batch["failed"]
+
+    def _run(self):
+        while True:
+            time.sleep(self._window)
+            if not self._commit_batch():
+                with self._lock:
+                    if not self._pending["files"]:
+                        self._thread = None
+                        return
+
+    def _commit_batch(self) -> bool:
+        with self._lock:
+            batch, self._pending = self._pending, self._new_batch()
+        files = batch["files"]
+        if not files:
+            return False
+
+        try:
+            #one flush for the data of the whole batch, then the renames
+            sync_filesystems({os.path.dirname(temp_path) for temp_path, _ in files})
+
+            dirs = set()
+            for temp_path, final_path in files:
+                try:
+                    os.replace(temp_path, final_path)
+                    dirs.add(os.path.dirname(final_path))
+                except Exception as e:
+                    batch["failed"].add(final_path)
+                    self.log(f"Group commit of {final_path} failed", error=e, block="GROUP_COMMIT")
+
+            for d in dirs:
+                fsync_dir(d)
+        except Exception as e:
+            batch["failed"].update(final_path for _, final_path in files)
+            self.log("Group commit batch failed", error=e, block="GROUP_COMMIT")
+        finally:
+            #never leave a writer waiting
+            batch["done"].set()
+
+        with self._lock:
+            s = self._stats
+            s["batches"] += 1
+            s["files"] += len(files) - len(batch["failed"])
+            s["failed"] += len(batch["failed"])
+            s["largest_batch"] = max(s["largest_batch"], len(files))
+        return True
+
+    def flush(self):
+        """Commits everything queued right now, on the caller's thread."""
+        while self._commit_batch():
+            pass
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending["files"])
+            stats["window_ms"] = round(self._window * 1000, 3)
+            return stats
+
+
+GROUP_COMMITTER = GroupCommitter()
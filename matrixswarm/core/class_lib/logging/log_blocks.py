@@ -0,0 +1,333 @@
+import os
+import re
+import json
+import time
+import base64
+import struct
+import bisect
+from datetime import datetime
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+
+# block log: lines are written in blocks, each block encrypted on its own, so a reader
+# seeks to the blocks it needs instead of decrypting the whole file.
+#
+#   <name>.log      header: magic(4) | version(1) | flags(1) | reserved(2)
+#                   block:  length(4) | nonce(12) | tag(16) | AES-GCM(lines)    flags & FLAG_ENCRYPTED
+#                           length(4) | lines                                   otherwise
+#                   lines = utf-8 json lines, "\n" terminated; the GCM aad is the block's offset,
+#                   so blocks can't be reordered or moved between offsets
+#   <name>.log.idx  header: magic(4) | version(1) | reserved(3)
+#                   record: offset(8) | length(4) | first ts(f64) | last ts(f64) | lines(4) | DEBUG, INFO,
+#                           WARNING, ERROR, other line counts(4 each)
+#
+# the index is a cache: blocks past its end (a crash between the two writes) are indexed again on
+# open, and index records past the end of the log are ignored.
+#
+# bytes after the last good block are only cut off when they are a torn block. Plain log lines found
+# there (appended by an older writer) are moved into a block of their own; anything else is moved to
+# <name>.log.unparsed, and a WARNING line in the log says so.
+BLOCK_MAGIC = b"MSLB"
+INDEX_MAGIC = b"MSLI"
+BLOCK_VERSION = 1
+FLAG_ENCRYPTED = 1
+INDEX_SUFFIX = ".idx"
+UNPARSED_SUFFIX = ".unparsed"
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+_HEADER = struct.Struct(">4sBBH")
+_INDEX_HEADER = struct.Struct(">4sB3x")
+_LENGTH = struct.Struct(">I")
+_RECORD = struct.Struct(">QIddI5I")
+_AAD = struct.Struct(">Q")
+_B64_LINE = re.compile(rb"^[A-Za-z0-9+/]+={0,2}$")
+
+def is_block_log(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(4) == BLOCK_MAGIC
+    except OSError:
+        return False
+
+def level_slot(level) -> int:
+    level = str(level or "").upper()
+    return LEVELS.index(level) if level in LEVELS else len(LEVELS)
+
+def _seal(key_bytes, offset, data: bytes) -> bytes:
+    if not key_bytes:
+        return data
+    nonce = get_random_bytes(12)
+    cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
+    cipher.update(_AAD.pack(offset))
+    ciphertext, tag = cipher.encrypt_and_digest(data)
+    return nonce + tag + ciphertext
+
+def _open_block(key_bytes, encrypted, offset, body: bytes) -> bytes:
+    if not encrypted:
+        return body
+    if not key_bytes:
+        raise ValueError("Block log is encrypted, no key given.")
+    cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=body[:12])
+    cipher.update(_AAD.pack(offset))
+    return cipher.decrypt_and_verify(body[28:], body[12:28])
+
+def _entry(offset, length, lines):
+    """Index entry of a block from its decoded lines (used when re-indexing)."""
+    counts = [0] * (len(LEVELS) + 1)
+    stamps = []
+    for line in lines:
+        try:
+            item = json.loads(line)
+        except ValueError:
+            counts[-1] += 1
+            continue
+        counts[level_slot(item.get("level"))] += 1
+        ts = parse_timestamp(item.get("timestamp"))
+        if ts is not None:
+            stamps.append(ts)
+    return {"offset": offset, "length": length, "first_ts": min(stamps) if stamps else 0.0,
+            "last_ts": max(stamps) if stamps else 0.0, "lines": len(lines), "levels": counts}
+
+def parse_timestamp(value):
+    """Epoch seconds of a log entry timestamp ("%Y-%m-%d %H:%M:%S", local time), None if absent."""
+    if not value:
+        return None
+    try:
+        return time.mktime(datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timetuple())
+    except (TypeError, ValueError):
+        return None
+
+def line_timestamp(line):
+    """Epoch seconds of a decoded json log line, None if it isn't json or has no timestamp."""
+    try:
+        return parse_timestamp(json.loads(line).get("timestamp"))
+    except (ValueError, AttributeError):
+        return None
+
+def block_end(entry) -> int:
+    """Offset just past a block, where the next one starts."""
+    return entry["offset"] + _LENGTH.size + entry["length"]
+
+def _split(data: bytes):
+    return [line for line in data.decode("utf-8", "replace").split("\n") if line]
+
+def _text_lines(tail: bytes, key_bytes):
+    """Log lines in the bytes after the last block (json, or base64 AES-GCM lines), None if they aren't lines."""
+    lines = []
+    for raw in tail.split(b"\n"):
+        raw = raw.strip()
+        if not raw:
+            continue
+        if raw.startswith(b"{"):
+            lines.append(raw.decode("utf-8", "replace"))
+        elif _B64_LINE.match(raw):
+            lines.append(_decrypt_line(raw, key_bytes))
+        else:
+            return None
+    return lines or None
+
+def _decrypt_line(raw: bytes, key_bytes) -> str:
+    #a line the Logger encrypted on its own; kept as it is when the key doesn't open it
+    try:
+        blob = base64.b64decode(raw)
+        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=blob[:12])
+        return cipher.decrypt_and_verify(blob[28:], blob[12:28]).decode("utf-8")
+    except Exception:
+        return raw.decode("utf-8", "replace")
+
+def _is_torn(tail: bytes) -> bool:
+    """True if the bytes after the last block are the start of a block whose write never finished."""
+    if len(tail) < _LENGTH.size:
+        return True
+    (length,) = _LENGTH.unpack_from(tail)
+    return _LENGTH.size + length > len(tail)
+
+class BlockLog:
+    """Reader of a block log and its index. key_bytes is the swarm key, None for a plaintext block log."""
+
+    def __init__(self, path: str, key_bytes: bytes = None):
+        self.path = path
+        self.key_bytes = key_bytes
+        self.encrypted = False
+        self.entries = []
+        self._load()
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            magic, version, flags, _ = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != BLOCK_MAGIC or version != BLOCK_VERSION:
+                raise ValueError(f"{self.path} is not a block log (version {BLOCK_VERSION})")
+            self.encrypted = bool(flags & FLAG_ENCRYPTED)
+            size = os.fstat(f.fileno()).st_size
+
+            self.entries = [e for e in read_index(self.path + INDEX_SUFFIX) if block_end(e) <= size]
+            end = block_end(self.entries[-1]) if self.entries else _HEADER.size
+
+            #blocks the index missed; a torn last block is left out
+            while end + _LENGTH.size <= size:
+                f.seek(end)
+                (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+                if end + _LENGTH.size + length > size:
+                    break
+                body = f.read(length)
+                try:
+                    lines = _split(_open_block(self.key_bytes, self.encrypted, end, body))
+                except Exception:
+                    break
+                self.entries.append(_entry(end, length, lines))
+                end += _LENGTH.size + length
+            self.end = end
+
+    def read_block(self, f, entry) -> list:
+        f.seek(entry["offset"] + _LENGTH.size)
+        body = f.read(entry["length"])
+        return _split(_open_block(self.key_bytes, self.encrypted, entry["offset"], body))
+
+    def tail(self, n: int) -> list:
+        """Last n lines, decrypting only the blocks that hold them."""
+        out = []
+        with open(self.path, "rb") as f:
+            for entry in reversed(self.entries):
+                if len(out) >= n:
+                    break
+                out[:0] = self.read_block(f, entry)
+        return out[-n:] if n else []
+
+    def between(self, since: float = None, until: float = None) -> list:
+        """Lines of the blocks that overlap [since, until]; lines are filtered on their own timestamp."""
+        firsts = [e["first_ts"] for e in self.entries]
+        start = 0
+        if since is not None:
+            #the block before the first one starting after `since` may still hold matching lines
+            start = max(0, bisect.bisect_right(firsts, since) - 1)
+        out = []
+        with open(self.path, "rb") as f:
+            for entry in self.entries[start:]:
+                if until is not None and entry["first_ts"] and entry["first_ts"] > until:
+                    break
+                if since is not None and entry["last_ts"] and entry["last_ts"] < since:
+                    continue
+                for line in self.read_block(f, entry):
+                    ts = line_timestamp(line)
+                    if ts is not None and ((since is not None and ts < since) or (until is not None and ts > until)):
+                        continue
+                    out.append(line)
+        return out
+
+    def lines(self):
+        with open(self.path, "rb") as f:
+            for entry in self.entries:
+                yield from self.read_block(f, entry)
+
+    def level_counts(self) -> dict:
+        totals = [0] * (len(LEVELS) + 1)
+        for entry in self.entries:
+            totals = [a + b for a, b in zip(totals, entry["levels"])]
+        return dict(zip(LEVELS + ("OTHER",), totals))
+
+def _line_level(line):
+    try:
+        return json.loads(line).get("level")
+    except (ValueError, AttributeError):
+        return None
+
+def read_index(index_path: str) -> list:
+    """Index entries of a block log; [] when the sidecar is missing or foreign."""
+    try:
+        with open(index_path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return []
+    if len(raw) < _INDEX_HEADER.size:
+        return []
+    magic, version = _INDEX_HEADER.unpack_from(raw)
+    if magic != INDEX_MAGIC or version != BLOCK_VERSION:
+        return []
+    entries = []
+    for pos in range(_INDEX_HEADER.size, len(raw) - _RECORD.size + 1, _RECORD.size):
+        offset, length, first_ts, last_ts, lines, *levels = _RECORD.unpack_from(raw, pos)
+        entries.append({"offset": offset, "length": length, "first_ts": first_ts, "last_ts": last_ts,
+                        "lines": lines, "levels": levels})
+    return entries
+
+class BlockLogWriter:
+    """Append side of a block log. Opening recovers the tail: missed blocks are indexed, a torn block cut off."""
+
+    def __init__(self, path: str, key_bytes: bytes = None):
+        self.path = path
+        self.key_bytes = key_bytes or None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fresh = not os.path.exists(path) or os.path.getsize(path) < _HEADER.size
+        if fresh:
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(BLOCK_MAGIC, BLOCK_VERSION, FLAG_ENCRYPTED if self.key_bytes else 0, 0))
+            with open(path + INDEX_SUFFIX, "wb") as f:
+                f.write(_INDEX_HEADER.pack(INDEX_MAGIC, BLOCK_VERSION))
+        else:
+            reader = BlockLog(path, self.key_bytes)
+            if reader.encrypted != bool(self.key_bytes):
+                raise ValueError(f"{path} was written {'with' if reader.encrypted else 'without'} a key.")
+            recovered = self._cut_tail(reader.end) if reader.end < os.path.getsize(path) else None
+            self._rewrite_index(reader.entries)
+
+        self._file = open(path, "ab")
+        self._index = open(path + INDEX_SUFFIX, "ab")
+        self.size = os.fstat(self._file.fileno()).st_size
+        if not fresh and recovered:
+            self.append(recovered, [line_timestamp(line) or time.time() for line in recovered],
+                        [_line_level(line) for line in recovered])
+
+    def _cut_tail(self, end: int) -> list:
+        """Cuts the log back to end, its last good block. Returns the lines to write back as a block."""
+        with open(self.path, "rb") as f:
+            f.seek(end)
+            tail = f.read()
+        lines = _text_lines(tail, self.key_bytes)
+        if lines is None and not _is_torn(tail):
+            with open(self.path + UNPARSED_SUFFIX, "ab") as f:
+                f.write(tail)
+            lines = [json.dumps({"level": "WARNING", "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                                 "message": f"[LOGGER] {len(tail)} unreadable byte(s) after the last block "
+                                            f"moved to {os.path.basename(self.path + UNPARSED_SUFFIX)}"})]
+        os.truncate(self.path, end)
+        return lines
+
+    def _rewrite_index(self, entries):
+        temp_path = self.path + INDEX_SUFFIX + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_INDEX_HEADER.pack(INDEX_MAGIC, BLOCK_VERSION))
+            for e in entries:
+                f.write(_RECORD.pack(e["offset"], e["length"], e["first_ts"], e["last_ts"], e["lines"], *e["levels"]))
+        os.replace(temp_path, self.path + INDEX_SUFFIX)
+
+    def append(self, lines: list, timestamps: list, levels: list):
+        """Writes lines as one block, then its index record."""
+        if not lines:
+            return
+        data = "".join(line.rstrip("\n") + "\n" for line in lines).encode("utf-8")
+        #the file's real end: another process (the spawner, a sync Logger) may have appended a block since
+        offset = os.fstat(self._file.fileno()).st_size
+        body = _seal(self.key_bytes, offset, data)
+        self._file.write(_LENGTH.pack(len(body)) + body)
+        self._file.flush()
+        self.size = offset + _LENGTH.size + len(body)
+
+        counts = [0] * (len(LEVELS) + 1)
+        for level in levels:
+            counts[level_slot(level)] += 1
+        self._index.write(_RECORD.pack(offset, len(body), min(timestamps), max(timestamps), len(lines), *counts))
+        self._index.flush()
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def flush(self):
+        self._file.flush()
+        self._index.flush()
+
+    def close(self):
+        for f in (self._file, self._index):
+            try:
+                f.close()
+            except Exception:
+                pass
@@ -0,0 +1,239 @@
+import os
+import json
+import base64
+from pathlib import Path
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import ENCRYPTION_CONFIG
+from matrixswarm.core.class_lib.logging.logger import Logger
+from matrixswarm.core.class_lib.logging.log_blocks import BlockLog, BLOCK_MAGIC, block_end, line_timestamp
+
+CHUNK_SIZE = 65536
+DEFAULT_LOG_NAME = "agent.log"
+# most bytes of one file a delta read takes; the rest comes with the next call
+DELTA_MAX_BYTES = 1_000_000
+LEVEL_EMOJI = {"INFO": "🔹", "ERROR": "❌", "WARNING": "⚠️", "DEBUG": "🐞"}
+
+def rotated_log_paths(log_path: str) -> list:
+    """agent.log, agent.1.log, agent.2.log ... newest first, up to the first one missing."""
+    base = Path(log_path)
+    paths = [str(base)] if base.exists() else []
+    i = 1
+    while True:
+        path = base.with_name(f"{base.stem}.{i}.log")
+        if not path.exists():
+            return paths
+        paths.append(str(path))
+        i += 1
+
+def reverse_lines(f, chunk_size=CHUNK_SIZE, end=None):
+    """Non-empty lines of a binary file, last first, read in chunks from EOF (or from end).
+
+    A last line without its newline is still being written and is skipped.
+    """
+    f.seek(0, os.SEEK_END)
+    pos = f.tell() if end is None else min(end, f.tell())
+    rest = b""
+    partial = True
+    while pos > 0:
+        step = min(chunk_size, pos)
+        pos -= step
+        f.seek(pos)
+        buf = f.read(step) + rest
+        if partial:
+            cut = buf.rfind(b"\n")
+            if cut < 0:
+                #the whole chunk is the unfinished line
+                rest = b""
+                continue
+            buf = buf[:cut]
+            partial = False
+        lines = buf.split(b"\n")
+        rest = lines.pop(0)
+        for line in reversed(lines):
+            if line.strip():
+                yield line
+    if rest.strip():
+        yield rest
+
+def _decode(raw: bytes, key_bytes):
+    line = raw.decode("utf-8", "replace")
+    return Logger.decrypt_log_line(line, key_bytes) if key_bytes else line.rstrip("\r")
+
+def _complete_end(f) -> int:
+    """Offset just past the last newline, where a reader of complete lines stops."""
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    while pos > 0:
+        step = min(CHUNK_SIZE, pos)
+        pos -= step
+        f.seek(pos)
+        cut = f.read(step).rfind(b"\n")
+        if cut >= 0:
+            return pos + cut + 1
+    return 0
+
+def _tail_file(path, n, key_bytes=None, since=None):
+    """(last n lines of one file, oldest first; whether older files may still hold wanted lines; cursor at its end)"""
+    with open(path, "rb") as f:
+        inode = os.fstat(f.fileno()).st_ino
+        if f.read(len(BLOCK_MAGIC)) == BLOCK_MAGIC:
+            log = BlockLog(path, key_bytes)
+            cursor = {"inode": inode, "offset": log.end}
+            if since is None:
+                return log.tail(n), True, cursor
+            lines = log.between(since, None)
+            reached = bool(log.entries) and 0 < log.entries[0]["first_ts"] < since
+            return (lines[-n:] if n > 0 else []), not reached, cursor
+
+        end = _complete_end(f)
+        cursor = {"inode": inode, "offset": end}
+        out = []
+        for raw in reverse_lines(f, end=end):
+            if len(out) >= n:
+                break
+            line = _decode(raw, key_bytes)
+            if since is not None:
+                ts = line_timestamp(line)
+                if ts is not None and ts < since:
+                    #lines are in time order, everything before this one is older too
+                    out.reverse()
+                    return out, False, cursor
+            out.append(line)
+    out.reverse()
+    return out, True, cursor
+
+def _tail(log_path, n, key_bytes=None, since=None):
+    """(last n lines across the log and its rotations, cursor at the end of the newest file read)"""
+    out = []
+    cursor = None
+    for path in rotated_log_paths(log_path):
+        try:
+            lines, more, end = _tail_file(path, max(0, n - len(out)), key_bytes, since)
+        except FileNotFoundError:
+            #rotated away while reading
+            continue
+        cursor = cursor or end
+        out[:0] = lines
+        if not more or len(out) >= n:
+            break
+    return (out[-n:] if n > 0 else []), cursor
+
+def tail_log_file(log_path: str, n: int = 250, since: float = None, key_bytes: bytes = None) -> list:
+    """Last n decoded json lines of a log and its rotated files, oldest first.
+
+    Line logs are read backwards from EOF in CHUNK_SIZE chunks and only the
+    lines returned are decrypted; block logs decrypt only the blocks holding
+    them. since (epoch secs) stops at the first older line. Undecryptable
+    lines come back as "[DECRYPT-FAIL] ..." like Logger.decrypt_log_line.
+    """
+    return _tail(log_path, n, key_bytes, since)[0]
+
+def _read_from(path, offset, key_bytes=None, max_bytes=DELTA_MAX_BYTES):
+    """(complete lines of one file from offset on, cursor after them, whether that is all the file has now)"""
+    with open(path, "rb") as f:
+        inode = os.fstat(f.fileno()).st_ino
+        if f.read(len(BLOCK_MAGIC)) == BLOCK_MAGIC:
+            log = BlockLog(path, key_bytes)
+            out = []
+            pos = offset
+            used = 0
+            for entry in log.entries:
+                if entry["offset"] < offset:
+                    continue
+                if out and used + entry["length"] > max_bytes:
+                    return out, {"inode": inode, "offset": pos}, False
+                out.extend(log.read_block(f, entry))
+                used += entry["length"]
+                pos = block_end(entry)
+            return out, {"inode": inode, "offset": pos}, True
+
+        f.seek(offset)
+        data = f.read(max_bytes)
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            if len(data) < max_bytes:
+                return [], {"inode": inode, "offset": offset}, True
+            #one line longer than max_bytes, hand it over in pieces
+            cut = len(data) - 1
+        lines = [_decode(raw, key_bytes) for raw in data[:cut + 1].split(b"\n") if raw.strip()]
+        return lines, {"inode": inode, "offset": offset + cut + 1}, len(data) < max_bytes
+
+def _valid_cursor(cursor) -> bool:
+    return (isinstance(cursor, dict) and isinstance(cursor.get("inode"), int)
+            and isinstance(cursor.get("offset"), int) and cursor["offset"] >= 0)
+
+def read_log_delta_file(log_path: str, cursor: dict = None, n: int = 250, since: float = None,
+                        key_bytes: bytes = None, max_bytes: int = DELTA_MAX_BYTES) -> dict:
+    """Lines appended to a log since cursor {"inode", "offset"}, and the cursor to send next time.
+
+    Returns {"lines", "cursor", "from", "reset"}. Rotation shows as a new
+    inode: the rest of the rotated file (found among agent.N.log by its
+    inode) comes first, then the files after it. Without a usable cursor
+    (none, rotated out of reach, truncated) it falls back to the last n
+    lines (since as in tail_log_file) with reset set, and the client
+    replaces what it shows. Reads stop after max_bytes of one file; the
+    returned cursor picks up there.
+    """
+    paths = rotated_log_paths(log_path)
+    segments = None
+    if _valid_cursor(cursor):
+        for i, path in enumerate(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_ino == cursor["inode"]:
+                if cursor["offset"] <= st.st_size:
+                    segments = [(path, cursor["offset"])] + [(p, 0) for p in reversed(paths[:i])]
+                break
+
+    if segments is None:
+        lines, end = _tail(log_path, n, key_bytes, since)
+        return {"lines": lines, "cursor": end, "from": cursor, "reset": True}
+
+    out = []
+    end = cursor
+    for path, offset in segments:
+        try:
+            lines, end, complete = _read_from(path, offset, key_bytes, max_bytes)
+        except FileNotFoundError:
+            break
+        out.extend(lines)
+        if not complete:
+            break
+    return {"lines": out, "cursor": end, "from": cursor, "reset": False}
+
+def _log_path_and_key(uid, comm_path, key_bytes, log_name):
+    if not comm_path:
+        raise ValueError("Agent logs need the swarm's comm_path.")
+    if key_bytes is None and ENCRYPTION_CONFIG.is_enabled():
+        swarm_key = ENCRYPTION_CONFIG.get_swarm_key()
+        key_bytes = base64.b64decode(swarm_key) if swarm_key else None
+    return os.path.join(comm_path, uid, "logs", log_name), key_bytes
+
+def tail_log(uid: str, n: int = 250, since: float = None, comm_path: str = None, key_bytes: bytes = None,
+             log_name: str = DEFAULT_LOG_NAME) -> list:
+    """Last n lines of an agent's log, <comm_path>/<uid>/logs/agent.log and its rotations.
+
+    key_bytes defaults to the swarm key when encryption is on.
+    """
+    log_path, key_bytes = _log_path_and_key(uid, comm_path, key_bytes, log_name)
+    return tail_log_file(log_path, n, since, key_bytes)
+
+def read_log_delta(uid: str, cursor: dict = None, n: int = 250, since: float = None, comm_path: str = None,
+                   key_bytes: bytes = None, log_name: str = DEFAULT_LOG_NAME) -> dict:
+    """read_log_delta_file() of an agent's log; key_bytes defaults to the swarm key when encryption is on."""
+    log_path, key_bytes = _log_path_and_key(uid, comm_path, key_bytes, log_name)
+    return read_log_delta_file(log_path, cursor, n, since, key_bytes)
+
+def render_log_lines(lines) -> list:
+    """Decoded json log lines as the GUI shows them: "<emoji> [ts] [level] message"."""
+    rendered = []
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            lvl = entry.get("level", "INFO")
+            emoji = LEVEL_EMOJI.get(lvl.upper(), "🔸")
+            rendered.append(f"{emoji} [{entry.get('timestamp', '?')}] [{lvl}] {entry.get('message', '')}")
+        except Exception:
+            rendered.append(f"[MALFORMED] {line.strip()}")
+    return rendered
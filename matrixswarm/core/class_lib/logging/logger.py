@@ -1,15 +1,28 @@
 import time
 import os
 import json
+import queue
+import atexit
 import base64
+import threading
 from datetime import datetime
 from pathlib import Path
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import ENCRYPTION_CONFIG
+from matrixswarm.core.class_lib.logging.log_blocks import BlockLogWriter, is_block_log, INDEX_SUFFIX
+
+# what the async writer does with a line when its queue is full
+LOG_OVERLOAD_DROP = "drop"      # discard it, a count of dropped lines is logged once the queue drains
+LOG_OVERLOAD_BLOCK = "block"    # wait up to block_timeout for room, then discard
+
+# what the async writer puts on disk
+LOG_FORMAT_LINES = "lines"      # one json line per entry, each its own base64 AES-GCM blob when encrypted
+LOG_FORMAT_BLOCKS = "blocks"    # encrypted blocks of lines plus a sidecar index, see log_blocks
 
 class Logger:
     def __init__(self, log_path, logs="logs", file_name="agent.log", max_bytes=5_000_000, backup_count=5):
+        self._async = None
         if ENCRYPTION_CONFIG.is_enabled():
             swarm_key = ENCRYPTION_CONFIG.get_swarm_key()
             self._decoded_swarm_key = base64.b64decode(swarm_key) if swarm_key else b''
@@ -70,11 +83,15 @@ class Logger:
                     print(f"[LOGGER][WARN] Signature failed: {e}")
 
             # 📄 Prepare output for disk (JSON always)
-            output = json.dumps(log_entry, ensure_ascii=False)
+            record = output = json.dumps(log_entry, ensure_ascii=False)
 
-            # 🔐 Encrypt if swarm key is active
-            if hasattr(self, "_decoded_swarm_key"):
-                output = self._encrypt_line(output)
+            # 🔐 Encrypt if swarm key is active; the async writer encrypts off-thread unless the console needs it now,
+            # block logs always get the plain line, they encrypt whole blocks
+            writer = self._async
+            encrypt = hasattr(self, "_decoded_swarm_key")
+            deferred = encrypt and writer is not None and (writer.blocks or not print_to_console)
+            if encrypt and (print_to_console or not deferred):
+                output = self._encrypt_line(record)
 
             # 🖨 Console Output
             if print_to_console:
@@ -99,6 +116,20 @@ class Logger:
                 else self.default_log_file
             )
 
+            if writer is not None:
+                if writer.submit(path, record if deferred else output, deferred, level):
+                    return
+                if writer.blocks:
+                    #writer closed, the file is still a block log
+                    self._append_block(path, record, level)
+                    return
+            if is_block_log(path):
+                #the async writer of this or another process made it a block log, appending a line would corrupt it
+                self._append_block(path, record, level)
+                return
+            if deferred:
+                output = self._encrypt_line(record)
+
             os.makedirs(os.path.dirname(path), exist_ok=True)
 
             # Check for rotation
@@ -130,7 +161,33 @@ class Logger:
             dst = base.with_name(f"{base.stem}.{i + 1}.log")
             if src.exists():
                 src.rename(dst)
-        base.rename(base.with_name(f"{base.stem}.1.log"))
+                self._rotate_index(src, dst)
+        dst = base.with_name(f"{base.stem}.1.log")
+        base.rename(dst)
+        self._rotate_index(base, dst)
+
+    @staticmethod
+    def _rotate_index(src, dst):
+        #a block log's index moves with it; a line log leaves none, so drop the one of the file it replaced
+        src_index = src.with_name(src.name + INDEX_SUFFIX)
+        dst_index = dst.with_name(dst.name + INDEX_SUFFIX)
+        if src_index.exists():
+            src_index.rename(dst_index)
+        elif dst_index.exists():
+            dst_index.unlink()
+
+    def _append_block(self, path, record, level):
+        """Writes one line as its own block, for lines logged to a block log without the async writer."""
+        try:
+            if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+                self._rotate_logs(path)
+            writer = BlockLogWriter(path, getattr(self, "_decoded_swarm_key", None))
+            try:
+                writer.append([record], [time.time()], [level])
+            finally:
+                writer.close()
+        except Exception as e:
+            print(f"[LOGGER][ERROR] Failed to write to {path}: {e}")
 
     def _encrypt_line(self, line: str) -> str:
         nonce = get_random_bytes(12)
@@ -152,6 +209,35 @@ class Logger:
     def set_encryption_key(self, swarm_key_b64):
         self._decoded_swarm_key = base64.b64decode(swarm_key_b64)
 
+    def enable_async(self, queue_size=10000, flush_interval=0.5, overload=LOG_OVERLOAD_DROP, block_timeout=5.0,
+                     log_format=LOG_FORMAT_LINES, block_bytes=65536):
+        """
+        Hands file writes to a background writer thread, see AsyncLogWriter.
+        log() then only formats the line and queues it. Console output is unchanged.
+        log_format LOG_FORMAT_BLOCKS writes seekable block logs (log_blocks), a block
+        holding the lines of one flush_interval, at most about block_bytes.
+        """
+        if self._async is None:
+            self._async = AsyncLogWriter(self, queue_size, flush_interval, overload, block_timeout,
+                                         log_format, block_bytes)
+        return self
+
+    def is_async(self) -> bool:
+        return self._async is not None
+
+    def flush(self, timeout=5.0):
+        """Blocks until every queued line is written and flushed to the OS."""
+        if self._async is not None:
+            self._async.flush(timeout)
+
+    def close(self, timeout=5.0):
+        """Drains and stops the async writer; later lines are written synchronously."""
+        if self._async is not None:
+            self._async.close(timeout)
+
+    def get_stats(self) -> dict:
+        return self._async.get_stats() if self._async is not None else {"async": False}
+
     @staticmethod
     def render_log_line(entry: dict) -> str:
         """
@@ -160,4 +246,253 @@ class Logger:
         ts = entry.get("timestamp", "")
         level = entry.get("level", "INFO")
         msg = entry.get("message", "")
-        return f"[{ts}] [{level}] {msg}"
\ No newline at end of file
+        return f"[{ts}] [{level}] {msg}"
+
+
+class AsyncLogWriter:
+    """Background writer of a Logger's lines.
+
+    log() puts (path, line) on a bounded queue. One daemon thread drains it
+    in batches, keeps one long-lived append handle per log file and tracks
+    its size in memory, so a line costs no makedirs, stat or open. Encryption
+    happens here as well when the line wasn't printed encrypted already.
+
+    Handles are flushed every flush_interval seconds (0 = after every batch),
+    on flush() and on close(). close() is registered with atexit, so lines
+    queued before a normal exit reach the file. A handle is reopened when
+    its file was moved or removed behind the writer's back.
+
+    With LOG_FORMAT_BLOCKS lines are held per file and written as one
+    encrypted block when they reach block_bytes and at every flush. A log
+    file of the other format found on open is rotated out first.
+    """
+    _STOP = object()
+    _FLUSH = object()
+
+    def __init__(self, logger, queue_size=10000, flush_interval=0.5, overload=LOG_OVERLOAD_DROP, block_timeout=5.0,
+                 log_format=LOG_FORMAT_LINES, block_bytes=65536):
+        self._logger = logger
+        self._queue = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._flush_interval = max(0.0, float(flush_interval))
+        self._overload = overload if overload in (LOG_OVERLOAD_DROP, LOG_OVERLOAD_BLOCK) else LOG_OVERLOAD_DROP
+        self._block_timeout = float(block_timeout)
+        self.blocks = log_format == LOG_FORMAT_BLOCKS
+        self._block_bytes = max(1024, int(block_bytes))
+        self._files = {}   # path -> [file or BlockLogWriter, size]
+        self._pending = {}  # path -> [[(line, ts, level)], bytes], lines of the next block
+        self._lock = threading.Lock()
+        self._dropped_pending = 0
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "blocks": 0, "rotations": 0, "errors": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log_writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, path, line, encrypt=False, level="INFO") -> bool:
+        """Queues a line; False when the writer is gone and the caller must write it itself."""
+        if self._closed or not self._thread.is_alive():
+            return False
+        item = (path, line, encrypt, level, time.time())
+        try:
+            if self._overload == LOG_OVERLOAD_BLOCK:
+                self._queue.put(item, timeout=self._block_timeout)
+            else:
+                self._queue.put_nowait(item)
+            with self._lock:
+                self._stats["queued"] += 1
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+                self._dropped_pending += 1
+        return True
+
+    def flush(self, timeout=5.0):
+        if self._closed or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        try:
+            self._queue.put((self._FLUSH, done, None), timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            try:
+                self._queue.put((self._STOP, None, None), timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({"async": True, "pending": self._queue.qsize(), "open_files": len(self._files),
+                      "overload": self._overload, "format": LOG_FORMAT_BLOCKS if self.blocks else LOG_FORMAT_LINES})
+        return stats
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self._flush_interval or 0.5))
+                while len(batch) < 4096:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = False
+            waiters = []
+            lines = []
+            for item in batch:
+                if item[0] is self._STOP:
+                    stop = True
+                elif item[0] is self._FLUSH:
+                    waiters.append(item[1])
+                else:
+                    lines.append(item)
+
+            if lines:
+                self._write_batch(lines)
+            self._write_drop_notice()
+
+            if stop or waiters or time.monotonic() - last_flush >= self._flush_interval:
+                self._flush_files(check_moved=not stop)
+                last_flush = time.monotonic()
+            for done in waiters:
+                done.set()
+            if stop:
+                #lines that raced close() still get written
+                rest = []
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item[0] not in (self._STOP, self._FLUSH):
+                        rest.append(item)
+                if rest:
+                    self._write_batch(rest)
+                self._close_files()
+                return
+
+    def _write_batch(self, lines):
+        if self.blocks:
+            for path, line, _, level, ts in lines:
+                pending = self._pending.setdefault(path, [[], 0])
+                pending[0].append((line, ts, level))
+                pending[1] += len(line) + 1
+                if pending[1] >= self._block_bytes:
+                    self._write_block(path)
+            return
+
+        grouped = {}
+        for path, line, encrypt, _, _ in lines:
+            try:
+                if encrypt:
+                    line = self._logger._encrypt_line(line)
+                grouped.setdefault(path, []).append((line.rstrip() + "\n").encode("utf-8"))
+            except Exception:
+                with self._lock:
+                    self._stats["errors"] += 1
+
+        for path, chunks in grouped.items():
+            try:
+                entry = self._open(path)
+                for data in chunks:
+                    if entry[1] >= self._logger.max_bytes:
+                        entry = self._rotate(path)
+                    entry[0].write(data)
+                    entry[1] += len(data)
+                with self._lock:
+                    self._stats["written"] += len(chunks)
+                    self._stats["batches"] += 1
+            except Exception as e:
+                self._drop_handle(path)
+                with self._lock:
+                    self._stats["errors"] += 1
+                print(f"[LOGGER][ERROR] Failed to write to {path}: {e}")
+
+    def _write_block(self, path):
+        pending = self._pending.pop(path, None)
+        if not pending or not pending[0]:
+            return
+        lines, stamps, levels = zip(*pending[0])
+        try:
+            entry = self._open(path)
+            if entry[1] >= self._logger.max_bytes:
+                entry = self._rotate(path)
+            entry[0].append(list(lines), list(stamps), list(levels))
+            entry[1] = entry[0].size
+            with self._lock:
+                self._stats["written"] += len(lines)
+                self._stats["blocks"] += 1
+                self._stats["batches"] += 1
+        except Exception as e:
+            self._drop_handle(path)
+            with self._lock:
+                self._stats["errors"] += 1
+            print(f"[LOGGER][ERROR] Failed to write to {path}: {e}")
+
+    def _write_drop_notice(self):
+        with self._lock:
+            dropped, self._dropped_pending = self._dropped_pending, 0
+        if not dropped:
+            return
+        entry = {"level": "WARNING", "message": f"[LOGGER] Dropped {dropped} line(s), log queue full.",
+                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+        encrypt = hasattr(self._logger, "_decoded_swarm_key")
+        self._write_batch([(self._logger.default_log_file, json.dumps(entry, ensure_ascii=False), encrypt,
+                            entry["level"], time.time())])
+
+    def _open(self, path):
+        entry = self._files.get(path)
+        if entry is None:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) and is_block_log(path) != self.blocks:
+                self._logger._rotate_logs(path)
+            if self.blocks:
+                f = BlockLogWriter(path, getattr(self._logger, "_decoded_swarm_key", None))
+                entry = self._files[path] = [f, f.size]
+            else:
+                f = open(path, "ab", buffering=65536)
+                entry = self._files[path] = [f, os.fstat(f.fileno()).st_size]
+        return entry
+
+    def _rotate(self, path):
+        self._drop_handle(path)
+        self._logger._rotate_logs(path)
+        with self._lock:
+            self._stats["rotations"] += 1
+        return self._open(path)
+
+    def _flush_files(self, check_moved=True):
+        for path in list(self._pending):
+            self._write_block(path)
+        for path, entry in list(self._files.items()):
+            try:
+                entry[0].flush()
+                if check_moved:
+                    st = os.stat(path)
+                    if st.st_ino != os.fstat(entry[0].fileno()).st_ino:
+                        self._drop_handle(path)
+            except OSError:
+                self._drop_handle(path)
+
+    def _drop_handle(self, path):
+        entry = self._files.pop(path, None)
+        if entry:
+            try:
+                entry[0].close()
+            except Exception:
+                pass
+
+    def _close_files(self):
+        for path in list(self._pending):
+            self._write_block(path)
+        for path in list(self._files):
+            self._drop_handle(path)
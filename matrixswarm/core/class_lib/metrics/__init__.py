@@ -0,0 +1 @@
+# MatrixSwarm package marker
\ No newline at end of file
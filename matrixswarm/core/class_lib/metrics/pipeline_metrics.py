@@ -0,0 +1,167 @@
+#Authored by Daniel F MacDonald and ChatGPT aka The Generals
+import os
+import json
+import time
+import tempfile
+import threading
+
+# packet pipeline stages, in hop order
+STAGE_ENCRYPT = "encrypt"                  # DeliveryAgent: sign + encrypt the envelope(s)
+STAGE_WRITE = "write"                      # DeliveryAgent: write one drop file
+STAGE_WAIT = "wait"                        # listener: blocked in the watcher (inotify wait or poll sleep)
+STAGE_SCAN = "scan"                        # ReceptionAgent: list + sort the drop zone
+STAGE_QUEUE_WAIT = "queue_wait"            # file landed -> listener picked it up
+STAGE_READ = "read"                        # ReceptionAgent: open + read one file
+STAGE_PARSE = "parse"                      # ReceptionAgent: json / binary frame parse
+STAGE_UNWRAP_KEY = "unwrap_key"            # PacketCryptoMixin: RSA or session unwrap of the AES key
+STAGE_AES_GCM = "aes_gcm"                  # PacketCryptoMixin: AES-GCM open
+STAGE_VERIFY_IDENTITY = "verify_identity"  # PacketCryptoMixin: Matrix signature on the sender identity
+STAGE_VERIFY_SIG = "verify_sig"            # PacketCryptoMixin: sender signature on the subpacket
+STAGE_DECRYPT = "decrypt"                  # ReceptionAgent: the whole crypto handler
+STAGE_DISPATCH = "dispatch"                # listener: route + run (or queue) one packet
+STAGES = (STAGE_ENCRYPT, STAGE_WRITE, STAGE_WAIT, STAGE_SCAN, STAGE_QUEUE_WAIT, STAGE_READ, STAGE_PARSE,
+          STAGE_UNWRAP_KEY, STAGE_AES_GCM, STAGE_VERIFY_IDENTITY, STAGE_VERIFY_SIG, STAGE_DECRYPT, STAGE_DISPATCH)
+
+METRICS_DIR = "metrics"
+METRICS_FILE = "pipeline.json"
+FORMAT_VERSION = 1
+
+# log2 buckets over microseconds: bucket k holds durations in [2^(k-1), 2^k) us, the last one everything above
+BUCKETS = 32
+
+class Histogram:
+    """Log2-bucketed latency histogram. Recording is an int bit_length and three adds."""
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self) -> dict:
+        """Compact form for the metrics file: only the non-empty buckets."""
+        return {"n": self.count, "sum": round(self.total, 6), "max": round(self.max, 6),
+                "b": {str(k): v for k, v in enumerate(self.buckets) if v}}
+
+def merge(hists) -> dict:
+    """Adds up compact histograms (to_dict() form), e.g. one stage across every agent."""
+    out = {"n": 0, "sum": 0.0, "max": 0.0, "b": {}}
+    for h in hists:
+        out["n"] += h.get("n", 0)
+        out["sum"] += h.get("sum", 0.0)
+        out["max"] = max(out["max"], h.get("max", 0.0))
+        for k, v in h.get("b", {}).items():
+            out["b"][k] = out["b"].get(k, 0) + v
+    return out
+
+def percentile(hist: dict, q: float) -> float:
+    """Estimated q-quantile (0..1) in seconds of a compact histogram, within a factor of sqrt(2)."""
+    n = hist.get("n", 0)
+    if not n:
+        return 0.0
+    rank = q * n
+    seen = 0
+    for k in sorted(hist.get("b", {}), key=int):
+        seen += hist["b"][k]
+        if seen >= rank:
+            k = int(k)
+            # geometric middle of [2^(k-1), 2^k) us, never above the recorded max
+            estimate = (2 ** (k - 0.5)) / 1e6 if k else 0.0
+            return min(estimate, hist.get("max", estimate))
+    return hist.get("max", 0.0)
+
+class PipelineMetrics:
+    """Per-stage and per-handler latency histograms of the packet pipeline, for this process.
+
+    Always on: a record is a lock, a bucket index and a few adds. Each
+    histogram is kept twice, since process start and since the last flush,
+    and flush() writes both to comm/<uid>/metrics/pipeline.json for
+    matrix_visibility/pipeline_stats.py to merge across the swarm.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PipelineMetrics, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._enabled = True
+            cls._instance._started = time.time()
+            cls._instance._window_started = time.time()
+            cls._instance._stages = {}     # stage -> (cumulative, window)
+            cls._instance._handlers = {}   # handler -> (cumulative, window)
+
+        return cls._instance
+
+    def set_enabled(self, enabled: bool):
+        self._enabled = bool(enabled)
+        return self
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def record(self, stage: str, seconds: float):
+        if self._enabled:
+            self._record(self._stages, stage, seconds)
+
+    def record_handler(self, handler: str, seconds: float):
+        if self._enabled:
+            self._record(self._handlers, handler, seconds)
+
+    def _record(self, table: dict, name: str, seconds: float):
+        with self._lock:
+            pair = table.get(name)
+            if pair is None:
+                pair = table[name] = (Histogram(), Histogram())
+            pair[0].record(seconds)
+            pair[1].record(seconds)
+
+    def snapshot(self, reset_window: bool = False) -> dict:
+        """Compact dict of both histogram sets; reset_window starts a new window."""
+        now = time.time()
+        with self._lock:
+            snap = {
+                "v": FORMAT_VERSION,
+                "started": round(self._started, 3),
+                "window_started": round(self._window_started, 3),
+                "updated": round(now, 3),
+                "stages": {k: p[0].to_dict() for k, p in self._stages.items()},
+                "handlers": {k: p[0].to_dict() for k, p in self._handlers.items()},
+                "window": {
+                    "stages": {k: p[1].to_dict() for k, p in self._stages.items() if p[1].count},
+                    "handlers": {k: p[1].to_dict() for k, p in self._handlers.items() if p[1].count},
+                },
+            }
+            if reset_window:
+                self._window_started = now
+                for table in (self._stages, self._handlers):
+                    for k, p in table.items():
+                        table[k] = (p[0], Histogram())
+        return snap
+
+    def flush(self, comm_path: str, universal_id: str = None):
+        """Atomically writes the snapshot to <comm_path>/metrics/pipeline.json and starts a new window."""
+        snap = self.snapshot(reset_window=True)
+        snap["universal_id"] = universal_id
+        metrics_dir = os.path.join(comm_path, METRICS_DIR)
+        os.makedirs(metrics_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", delete=False, dir=metrics_dir, suffix=".tmp", encoding="utf-8") as f:
+            json.dump(snap, f, separators=(",", ":"))
+            temp_path = f.name
+        os.replace(temp_path, os.path.join(metrics_dir, METRICS_FILE))
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+            self._handlers.clear()
+            self._started = self._window_started = time.time()
+
+
+PIPELINE_METRICS = PipelineMetrics()
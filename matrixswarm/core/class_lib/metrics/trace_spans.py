@@ -0,0 +1,205 @@
+#Authored by Daniel F MacDonald and ChatGPT aka The Generals
+import os
+import time
+import atexit
+import random
+import struct
+import threading
+
+# trace context carried in the packet payload as "trace": {"trace_id": hex, "span_id": hex}.
+# span_id is the sender's deliver span, the parent of every span the receiver records for it.
+TRACE_FIELD = "trace"
+
+SPAN_DELIVER = 1      # sender: pass_packet sign + encrypt + write, peer = target uid
+SPAN_QUEUE_WAIT = 2   # receiver: packet landed -> listener picked it up
+SPAN_DECRYPT = 3      # receiver: read + parse + decrypt + verify
+SPAN_HANDLE = 4       # receiver: handler run, name = handler
+SPAN_ENTRY = 5        # entry point outside the packet path (e.g. an https request), name = what came in
+SPAN_KINDS = {SPAN_DELIVER: "deliver", SPAN_QUEUE_WAIT: "queue_wait", SPAN_DECRYPT: "decrypt",
+              SPAN_HANDLE: "handle", SPAN_ENTRY: "entry"}
+
+# per-agent span log: comm/<uid>/trace/spans.bin
+#   file header: magic(4) | version(1)
+#   record:      length(2) | trace_id(16) | span_id(8) | parent_id(8) | start(f64) | duration(f64) | kind(1)
+#                | name length(1) | name | peer length(1) | peer
+SPAN_DIR = "trace"
+SPAN_FILE = "spans.bin"
+SPAN_MAGIC = b"MSSP"
+SPAN_VERSION = 1
+_FILE_HEADER = struct.Struct(">4sB")
+_RECORD_LEN = struct.Struct(">H")
+_RECORD = struct.Struct(">16s8s8sddB")
+_NO_PARENT = b"\x00" * 8
+
+class TraceContext:
+    """The span a thread is working in; pass_packet makes its deliver span a child of it."""
+    __slots__ = ("trace_id", "span_id")
+
+    def __init__(self, trace_id: bytes, span_id: bytes):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    def to_packet(self) -> dict:
+        return {"trace_id": self.trace_id.hex(), "span_id": self.span_id.hex()}
+
+    @classmethod
+    def from_packet(cls, data):
+        """Parses the packet's trace field; None when absent or malformed."""
+        try:
+            trace_id = bytes.fromhex(data["trace_id"])
+            span_id = bytes.fromhex(data["span_id"])
+        except Exception:
+            return None
+        if len(trace_id) != 16 or len(span_id) != 8:
+            return None
+        return cls(trace_id, span_id)
+
+def new_span_id() -> bytes:
+    return os.urandom(8)
+
+class Tracer:
+    """Records spans of this agent to its binary span log.
+
+    Records are buffered and appended in one write once the buffer passes
+    64KB or a second has gone by, and on exit. The log rotates to
+    spans.bin.1 past max_bytes. sample is the share of new traces
+    (started with no parent) that are recorded; a sampled trace is
+    followed across every hop.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Tracer, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._local = threading.local()
+            cls._instance._path = None
+            cls._instance._enabled = False
+            cls._instance._sample = 1.0
+            cls._instance._max_bytes = 16 * 1024 * 1024
+            cls._instance._buffer = []
+            cls._instance._buffered = 0
+            cls._instance._last_flush = time.time()
+            cls._instance._stats = {"spans": 0, "flushes": 0, "dropped": 0}
+            atexit.register(cls._instance.flush)
+
+        return cls._instance
+
+    def configure(self, comm_path: str, enabled: bool = True, sample: float = 1.0, max_bytes: int = None):
+        """Points the tracer at comm/<uid>; spans go to <comm_path>/trace/spans.bin."""
+        self.flush()
+        self._path = os.path.join(comm_path, SPAN_DIR, SPAN_FILE)
+        self._enabled = bool(enabled)
+        self._sample = max(0.0, min(1.0, float(sample)))
+        if max_bytes:
+            self._max_bytes = int(max_bytes)
+        return self
+
+    def is_enabled(self) -> bool:
+        return self._enabled and self._path is not None
+
+    # thread context: the span whose work is running on this thread
+    def current(self):
+        return getattr(self._local, "context", None)
+
+    def activate(self, context):
+        """Makes context current on this thread; returns the previous one for restore()."""
+        previous = getattr(self._local, "context", None)
+        self._local.context = context
+        return previous
+
+    def restore(self, previous):
+        self._local.context = previous
+
+    def child_of(self, parent):
+        """A new span context under parent, or the root of a new (sampled) trace when parent is None."""
+        if parent is not None:
+            return TraceContext(parent.trace_id, new_span_id())
+        if self._sample < 1.0 and random.random() >= self._sample:
+            return None
+        return TraceContext(os.urandom(16), new_span_id())
+
+    def record(self, context, parent_id, kind: int, start: float, duration: float, name: str = "", peer: str = ""):
+        """Appends one span. context gives trace and span id; parent_id is the parent span id or None."""
+        if not self.is_enabled() or context is None:
+            return
+        name_b = (name or "").encode("utf-8")[:255]
+        peer_b = (peer or "").encode("utf-8")[:255]
+        body = _RECORD.pack(context.trace_id, context.span_id, parent_id or _NO_PARENT, start, duration, kind) \
+            + bytes((len(name_b),)) + name_b + bytes((len(peer_b),)) + peer_b
+        record = _RECORD_LEN.pack(len(body)) + body
+
+        with self._lock:
+            self._buffer.append(record)
+            self._buffered += len(record)
+            self._stats["spans"] += 1
+            due = self._buffered >= 65536 or time.time() - self._last_flush >= 1
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer or not self._path:
+                return
+            data = b"".join(self._buffer)
+            self._buffer = []
+            self._buffered = 0
+            self._last_flush = time.time()
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                try:
+                    size = os.path.getsize(self._path)
+                except OSError:
+                    size = 0
+                if size and size + len(data) > self._max_bytes:
+                    os.replace(self._path, self._path + ".1")
+                    size = 0
+                with open(self._path, "ab") as f:
+                    if not size:
+                        f.write(_FILE_HEADER.pack(SPAN_MAGIC, SPAN_VERSION))
+                    f.write(data)
+                self._stats["flushes"] += 1
+            except OSError:
+                self._stats["dropped"] += len(data)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["buffered"] = len(self._buffer)
+            return stats
+
+def read_spans(path: str):
+    """Yields span dicts from a span log; a torn last record is ignored."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < _FILE_HEADER.size:
+        return
+    magic, version = _FILE_HEADER.unpack_from(raw)
+    if magic != SPAN_MAGIC or version != SPAN_VERSION:
+        raise ValueError(f"{path} is not a span log (version {SPAN_VERSION})")
+
+    offset = _FILE_HEADER.size
+    while offset + _RECORD_LEN.size <= len(raw):
+        (length,) = _RECORD_LEN.unpack_from(raw, offset)
+        offset += _RECORD_LEN.size
+        if offset + length > len(raw):
+            return
+        trace_id, span_id, parent_id, start, duration, kind = _RECORD.unpack_from(raw, offset)
+        pos = offset + _RECORD.size
+        name = raw[pos + 1:pos + 1 + raw[pos]].decode("utf-8", "replace")
+        pos += 1 + raw[pos]
+        peer = raw[pos + 1:pos + 1 + raw[pos]].decode("utf-8", "replace")
+        offset += length
+        yield {
+            "trace_id": trace_id.hex(),
+            "span_id": span_id.hex(),
+            "parent_id": None if parent_id == _NO_PARENT else parent_id.hex(),
+            "start": start,
+            "duration": duration,
+            "kind": SPAN_KINDS.get(kind, str(kind)),
+            "name": name,
+            "peer": peer,
+        }
+
+
+TRACER = Tracer()
@@ -1,11 +1,14 @@
 import os
-import json
 import uuid
 import time
 import tempfile
 from matrixswarm.core.class_lib.packet_delivery.interfaces.base_delivery_agent import BaseDeliveryAgent
 from matrixswarm.core.class_lib.packet_delivery.interfaces.packet_processor import PacketProcessorBase
 from matrixswarm.core.mixin.log_method import LogMixin
+from matrixswarm.core.class_lib.packet_delivery.utility.packet_frame import dumps_packet, FRAMING_JSON
+from matrixswarm.core.class_lib.file_system.group_commit import GROUP_COMMITTER, fsync_dir, DURABILITY_LEVELS, \
+    DURABILITY_NONE, DURABILITY_FSYNC, DURABILITY_FSYNC_DIR, DURABILITY_GROUP
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import PIPELINE_METRICS, STAGE_ENCRYPT, STAGE_WRITE
 class DeliveryAgent(BaseDeliveryAgent, LogMixin):
     def __init__(self):
         self._location = None
@@ -20,6 +23,10 @@ class DeliveryAgent(BaseDeliveryAgent, LogMixin):
         self._filename_override = None
         self._save_filename=""
         self._sent_packet = "PACKET_NOT_SENT"
+        self._failed_addresses = []
+        self._framing = FRAMING_JSON
+        self._durability = DURABILITY_FSYNC
+        self._group_pending = None
 
     def set_crypto_handler(self, crypto_handler: PacketProcessorBase):
         self._crypto = crypto_handler
@@ -34,6 +41,16 @@ class DeliveryAgent(BaseDeliveryAgent, LogMixin):
     def set_metadata(self, metadata: dict):
         self._file_ext = metadata.get("file_ext", self._file_ext)
         self._filename_prefix = metadata.get("prefix", self._filename_prefix)
+        self._framing = metadata.get("framing", self._framing)
+        #durability: none | rename | fsync (default) | fsync_dir | group; legacy "atomic": False means none
+        durability = metadata.get("durability")
+        if durability is None and metadata.get("atomic", True) is False:
+            durability = DURABILITY_NONE
+        if durability is not None:
+            if durability in DURABILITY_LEVELS:
+                self._durability = durability
+            else:
+                self.log(f"Unknown durability level '{durability}', keeping '{self._durability}'")
         self._custom_metadata = metadata
         return self
 
@@ -77,6 +94,10 @@ class DeliveryAgent(BaseDeliveryAgent, LogMixin):
             self._error = f"[JSON_FILE][CREATE] Failed: {e}"
         return self
 
+    # uids the last deliver() could not write to
+    def get_failed_addresses(self) -> list:
+        return self._failed_addresses
+
     def get_saved_filename(self) -> str:
         return self._save_filename
 
@@ -107,60 +128,106 @@ class DeliveryAgent(BaseDeliveryAgent, LogMixin):
                 pass
 
             uids = self._address if self._address else [None]
-            for uid in uids:
-
-                drop_path = os.path.join(self._location, uid) if uid else self._location
-                if self._drop_zone:
-                    drop_path = os.path.join(drop_path, self._drop_zone)
-
-                timestamp = int(time.time())
-
-                try:
-
-                    data = self._crypto.prepare_for_delivery(self._packet)
 
-                    fname = self._filename_override or f"{self._filename_prefix}_{timestamp}_{uuid.uuid4().hex}{self._file_ext}"
-                    full_path = os.path.join(drop_path, fname)
-
-                    # Optional metadata config
-                    indent = self._custom_metadata.get("indent", 2)
-                    atomic = self._custom_metadata.get("atomic", True)
-                    output_dir = os.path.dirname(full_path)
-
-                    if atomic:
-                        self._sent_packet = data
-
-                        with tempfile.NamedTemporaryFile("w", delete=False, dir=output_dir,
-                                                         suffix=self._file_ext) as temp_file:
+            #encrypt once; multicast wraps only the content key per recipient
+            t0 = time.perf_counter()
+            envelopes = self._prepare_envelopes(uids)
+            PIPELINE_METRICS.record(STAGE_ENCRYPT, time.perf_counter() - t0)
+            if envelopes is None:
+                self._error = "[JSON_FILE][DELIVER] Failed to prepare packet"
+                return self
 
+            failed = []
+            #group commits of a multicast share one batch: queue every file, then wait once
+            self._group_pending = []
+            try:
+                for uid in uids:
+                    t0 = time.perf_counter()
+                    if not self._write(uid, envelopes.get(uid)):
+                        failed.append(uid)
+                    PIPELINE_METRICS.record(STAGE_WRITE, time.perf_counter() - t0)
+            finally:
+                pending, self._group_pending = self._group_pending, None
+            for uid, full_path, batch in pending:
+                if not GROUP_COMMITTER.wait(batch, full_path):
+                    self.log(f"Group commit of the packet for {uid} failed")
+                    failed.append(uid)
+
+            self._failed_addresses = failed
+            if failed:
+                self._error = f"[DELIVER][WRITE] Failed to write packet for {failed}"
 
-                            json.dump(data, temp_file, indent=indent)
-                            temp_file.flush()
-                            os.fsync(temp_file.fileno())
-                            temp_path = temp_file.name
+        except Exception as e:
 
-                        os.replace(temp_path, full_path)
+            self._error = f"[JSON_FILE][DELIVER] Failed: {e}"
+            self.log("Failed", error=e)
+        return self
 
-                    else:
+    def _prepare_envelopes(self, uids: list):
+        """Returns {uid: data to write}, encrypting the packet a single time."""
+        if len(uids) > 1 and hasattr(self._crypto, "prepare_for_delivery_many"):
+            return self._crypto.prepare_for_delivery_many(self._packet, uids)
 
+        data = self._crypto.prepare_for_delivery(self._packet)
+        if data is None:
+            return None
+        return {uid: data for uid in uids}
 
-                        with open(full_path, "w", encoding="utf-8") as f:
-                            self._sent_packet=data
-                            json.dump(data, f, indent=indent)
+    def _write(self, uid, data) -> bool:
+        """Writes one prepared envelope to uid's drop zone. Returns True on success."""
 
-                    self._save_filename = full_path
+        drop_path = os.path.join(self._location, uid) if uid else self._location
+        if self._drop_zone:
+            drop_path = os.path.join(drop_path, self._drop_zone)
 
-                except Exception as e:
-                    self._error = f"[DELIVER][WRITE] Failed to write packet: {e}"
-                    self.log("Failed to write packet", error=e)
+        timestamp = int(time.time())
 
-                return self
+        try:
+            if data is None:
+                raise ValueError(f"No envelope prepared for {uid}")
+
+            fname = self._filename_override or f"{self._filename_prefix}_{timestamp}_{uuid.uuid4().hex}{self._file_ext}"
+            full_path = os.path.join(drop_path, fname)
+
+            # Optional metadata config
+            indent = self._custom_metadata.get("indent", 2)
+            durability = self._durability
+            output_dir = os.path.dirname(full_path)
+
+            # named files (directives, configs) are read directly by other code, keep them json
+            framing = FRAMING_JSON if self._filename_override else self._framing
+            body = dumps_packet(data, framing, indent)
+
+            self._sent_packet = data
+
+            # always temp file + os.replace, even for "none": the listener wakes on .json writes and would
+            # read (and, failing to parse, delete) a file written in place. The temp file must not carry
+            # the packet extension.
+            with tempfile.NamedTemporaryFile("wb", delete=False, dir=output_dir,
+                                             suffix=self._file_ext + ".tmp") as temp_file:
+                temp_file.write(body)
+                temp_file.flush()
+                if durability in (DURABILITY_FSYNC, DURABILITY_FSYNC_DIR):
+                    os.fsync(temp_file.fileno())
+                temp_path = temp_file.name
+
+            if durability == DURABILITY_GROUP:
+                # sync + rename + dir fsync happen in the next group commit batch; deliver() waits for it
+                if self._group_pending is not None:
+                    self._group_pending.append((uid, full_path, GROUP_COMMITTER.submit(temp_path, full_path)))
+                elif not GROUP_COMMITTER.commit(temp_path, full_path):
+                    raise OSError(f"Group commit of {full_path} failed")
+            else:
+                os.replace(temp_path, full_path)
+                if durability == DURABILITY_FSYNC_DIR:
+                    fsync_dir(output_dir)
+
+            self._save_filename = full_path
+            return True
 
         except Exception as e:
-
-            self._error = f"[JSON_FILE][DELIVER] Failed: {e}"
-            self.log("Failed", error=e)
-        return self
+            self.log(f"Failed to write packet for {uid}", error=e)
+            return False
 
     def get_sent_packet(self):
         return self._sent_packet
\ No newline at end of file
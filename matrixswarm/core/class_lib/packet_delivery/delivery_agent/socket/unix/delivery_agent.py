@@ -0,0 +1,136 @@
+import os
+import time
+import socket
+from matrixswarm.core.class_lib.packet_delivery.delivery_agent.file.json_file.delivery_agent import DeliveryAgent as FileDeliveryAgent
+from matrixswarm.core.class_lib.packet_delivery.utility.unix_socket import socket_path, send_frame, ACK_QUEUED, ACK_REJECTED
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import PIPELINE_METRICS, STAGE_ENCRYPT, STAGE_WRITE
+from matrixswarm.core.class_lib.file_system.group_commit import DURABILITY_NONE, DURABILITY_RENAME
+from matrixswarm.core.class_lib.packet_delivery.utility.priority_lanes import lane_of, LANE_CONTROL
+
+class DeliveryAgent(FileDeliveryAgent):
+    """Delivers packets over the target's unix socket (comm/<uid>/<drop>.sock).
+
+    The packet and its Football crypto envelope are identical to the
+    file.json_file transport; only the carrier changes. When the target has
+    no socket, refuses the connection, or its queue is full, the packet is
+    dropped into the target's directory exactly like file.json_file. A
+    packet sent without an ack (timeout, connection dropped) may already be
+    queued, so it counts as failed and is not dropped a second time.
+
+    A socket ack only means the packet sits in the receiver's memory, so the
+    socket carries only traffic that asked for no more than that: durability
+    none or rename, off the control lane. fsync / fsync_dir / group packets
+    and control lane packets always take the file drop, which survives the
+    receiver dying and keeps the lane order of the drop zone. Packets that
+    set no durability default to rename here, so local traffic skips the disk.
+    """
+    def __init__(self):
+        super().__init__()
+        self._durability = DURABILITY_RENAME
+        self._timeout = 2.0
+        self._delivered_via = []
+
+    def set_metadata(self, metadata: dict):
+        super().set_metadata(metadata)
+        self._timeout = float(metadata.get("socket_timeout", self._timeout))
+        return self
+
+    def get_agent_type(self):
+        return "socket"
+
+    # list of (uid, "socket"|"file") from the last deliver()
+    def get_delivered_via(self) -> list:
+        return self._delivered_via
+
+    def _socket_eligible(self) -> bool:
+        return self._durability in (DURABILITY_NONE, DURABILITY_RENAME) and lane_of(self._filename_prefix + "_") != LANE_CONTROL
+
+    def _send(self, uid: str, data: dict) -> bool:
+        """Returns True if the target queued the packet, False if it surely didn't and the file drop should be used.
+
+        Raises when the outcome is unknown (no ack): the receiver queues before
+        it acks, so a file drop could deliver the packet twice.
+        """
+        path = socket_path(self._location, uid, self._drop_zone)
+        if not os.path.exists(path):
+            return False
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._timeout)
+        try:
+            try:
+                sock.connect(path)
+            except OSError:
+                # stale socket left by a dead agent
+                return False
+
+            send_frame(sock, data, self._framing)
+            ack = sock.recv(1)
+            if ack == ACK_REJECTED:
+                # queue full, nothing was queued, so the file drop is safe
+                return False
+            if ack != ACK_QUEUED:
+                raise ConnectionError("Receiver closed the connection without an ack")
+
+            self._sent_packet = data
+            self._save_filename = path
+            return True
+        finally:
+            sock.close()
+
+    def deliver(self, create=True):
+
+        self._delivered_via = []
+
+        if not self._location:
+            self._error = "[UNIX_SOCKET][ERROR] No base location set"
+            return self
+
+        if not self._packet:
+            self._error = "[UNIX_SOCKET][DELIVER] No packet assigned"
+            return self
+
+        if not self._address or self._filename_override or not self._socket_eligible():
+            # named deliveries (directives, configs), durable and control lane packets always land on disk
+            return super().deliver(create)
+
+        try:
+            self._crypto.set_logger(self.get_logger())
+        except Exception as e:
+            pass
+
+        t0 = time.perf_counter()
+        envelopes = self._prepare_envelopes(self._address)
+        PIPELINE_METRICS.record(STAGE_ENCRYPT, time.perf_counter() - t0)
+        if envelopes is None:
+            self._error = "[UNIX_SOCKET][DELIVER] Failed to prepare packet"
+            return self
+
+        fallback = []
+        failed = []
+        for uid in self._address:
+            try:
+                t0 = time.perf_counter()
+                if self._send(uid, envelopes.get(uid)):
+                    PIPELINE_METRICS.record(STAGE_WRITE, time.perf_counter() - t0)
+                    self._delivered_via.append((uid, "socket"))
+                    continue
+                fallback.append(uid)
+            except Exception as e:
+                #the receiver may hold it already, a file drop could run the command twice
+                self.log(f"Socket delivery to {uid} unconfirmed, not re-sent", error=e)
+                failed.append(uid)
+
+        #same envelopes, no second encryption for the file drop
+        if fallback and create:
+            self.create_loc()
+        for uid in fallback:
+            if self._write(uid, envelopes.get(uid)):
+                self._delivered_via.append((uid, "file"))
+            else:
+                failed.append(uid)
+
+        self._failed_addresses = failed
+        self._error = f"[UNIX_SOCKET][DELIVER] Failed to deliver packet to {failed}" if failed else None
+
+        return self
@@ -10,6 +10,8 @@ class BasePacket(ABC):
         self._packet_field_name = "content"
         self._data = {}
         self._auto_fill_sub_packet = True
+        self._priority = None
+        self._trace = None
 
     def is_valid(self) -> bool:
         return self._valid
@@ -24,6 +26,22 @@ class BasePacket(ABC):
         self._auto_fill_sub_packet = auto_fill_sub_packet
         return self
 
+    def set_priority(self, priority: str):
+        """Delivery lane for this packet: control | normal | bulk (high/low accepted). Not part of the payload."""
+        self._priority = priority
+        return self
+
+    def get_priority(self) -> str:
+        return self._priority
+
+    def set_trace(self, trace: dict):
+        """Upstream trace context ({"trace_id", "span_id"}) pass_packet chains to when no handler span is current."""
+        self._trace = trace
+        return self
+
+    def get_trace(self) -> dict:
+        return self._trace
+
     def get_packet(self) -> dict:
         base = self._payload
         if self._packet and self._packet.is_valid():
@@ -1,6 +1,25 @@
 from abc import ABC, abstractmethod
 from typing import Any
 from matrixswarm.core.class_lib.packet_delivery.interfaces.packet_processor import PacketProcessorBase
+
+class ReceivedPacket:
+    """One result of a reception agent's receive_batch(): the packet, or the reason it failed."""
+    __slots__ = ("name", "packet", "identity", "error", "lane", "queued_at", "read_at", "read_time")
+
+    def __init__(self, name: str, packet: Any = None, identity: Any = None, error: str = None,
+                 lane: str = None, queued_at: float = None, read_at: float = None, read_time: float = None):
+        self.name = name            # filename, or the transport for streamed packets
+        self.packet = packet        # packet object with the decrypted data, None on failure
+        self.identity = identity    # IdentityObject of the verified sender, if any
+        self.error = error          # None on success
+        self.lane = lane            # priority lane the packet was read from, if the transport has lanes
+        self.queued_at = queued_at  # when the packet landed (file mtime), if known
+        self.read_at = read_at      # when reading started (epoch secs)
+        self.read_time = read_time  # read + parse + decrypt + verify, in seconds
+
+    def ok(self) -> bool:
+        return self.error is None and self.packet is not None
+
 class BaseReceptionAgent(ABC):
     """Interface for all reception agent implementations (filesystem, redis, etc)."""
 
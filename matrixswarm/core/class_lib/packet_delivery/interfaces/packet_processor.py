@@ -25,4 +25,13 @@ class PacketEncryptorBase(ABC):
     @abstractmethod
     def prepare_for_delivery(self, packet_obj: Any) -> Dict[str, Any]:
         """Wraps packet_obj in encryption envelope. Returns safe dict to write."""
-        pass
\ No newline at end of file
+        pass
+
+    def prepare_for_delivery_many(self, packet_obj: Any, uids: list) -> Dict[str, Dict[str, Any]]:
+        """Wraps packet_obj once for several recipients. Returns {uid: safe dict to write}.
+
+        The default suits strategies whose envelope does not depend on the
+        recipient; per-recipient strategies override it.
+        """
+        data = self.prepare_for_delivery(packet_obj)
+        return {uid: data for uid in uids}
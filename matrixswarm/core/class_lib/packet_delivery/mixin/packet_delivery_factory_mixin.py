@@ -5,15 +5,21 @@ from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.footba
 import importlib
 import traceback
 
+# transport path -> DeliveryAgent class, filled on first use
+_DELIVERY_AGENT_CLASSES = {}
+
 class PacketDeliveryFactoryMixin:
 
     def get_delivery_agent(self, path: str, football:Football, new=True):
 
         try:
 
-            full_path = f"matrixswarm.core.class_lib.packet_delivery.delivery_agent.{path}.delivery_agent"
-            mod = importlib.import_module(full_path)
-            agent = mod.DeliveryAgent()
+            agent_cls = _DELIVERY_AGENT_CLASSES.get(path)
+            if agent_cls is None:
+                full_path = f"matrixswarm.core.class_lib.packet_delivery.delivery_agent.{path}.delivery_agent"
+                agent_cls = importlib.import_module(full_path).DeliveryAgent
+                _DELIVERY_AGENT_CLASSES[path] = agent_cls
+            agent = agent_cls()
             if new:
                 mode = "encrypt" if ENCRYPTION_CONFIG.is_enabled() else "plaintext_encrypt"
                 agent.set_crypto_handler(packet_encryption_factory(mode, football))
@@ -2,6 +2,9 @@ import importlib
 import traceback
 from matrixswarm.core.class_lib.packet_delivery.packet.error.packet_not_found import Packet as ErrorPacket
 
+# dotted path -> Packet class, filled on first use
+_PACKET_CLASSES = {}
+
 class PacketFactoryMixin:
     def __init__(self):
         self._last_packet = None
@@ -12,9 +15,12 @@ class PacketFactoryMixin:
         Falls back to packet/error/packet_not_found.py
         """
         try:
-            full_path = f"matrixswarm.core.class_lib.packet_delivery.packet.{dotted_path}"
-            mod = importlib.import_module(full_path)
-            packet = mod.Packet()
+            packet_cls = _PACKET_CLASSES.get(dotted_path)
+            if packet_cls is None:
+                full_path = f"matrixswarm.core.class_lib.packet_delivery.packet.{dotted_path}"
+                packet_cls = importlib.import_module(full_path).Packet
+                _PACKET_CLASSES[dotted_path] = packet_cls
+            packet = packet_cls()
             if new:
                 return packet
             else:
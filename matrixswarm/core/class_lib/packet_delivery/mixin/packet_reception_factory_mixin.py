@@ -5,14 +5,20 @@ from matrixswarm.core.class_lib.packet_delivery.utility.encryption.config import
 from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.packet_encryption_factory import packet_encryption_factory
 from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.football import Football
 
+# transport path -> ReceptionAgent class, filled on first use
+_RECEPTION_AGENT_CLASSES = {}
+
 class PacketReceptionFactoryMixin:
 
     def get_reception_agent(self, path: str, football:Football, new=True):
 
         try:
-            full_path = f"matrixswarm.core.class_lib.packet_delivery.reception_agent.{path}.reception_agent"
-            mod = importlib.import_module(full_path)
-            agent = mod.ReceptionAgent()
+            agent_cls = _RECEPTION_AGENT_CLASSES.get(path)
+            if agent_cls is None:
+                full_path = f"matrixswarm.core.class_lib.packet_delivery.reception_agent.{path}.reception_agent"
+                agent_cls = importlib.import_module(full_path).ReceptionAgent
+                _RECEPTION_AGENT_CLASSES[path] = agent_cls
+            agent = agent_cls()
             if new:
                 mode = "decrypt" if ENCRYPTION_CONFIG.is_enabled() else "plaintext"
                 agent.set_crypto_handler(packet_encryption_factory(mode, football))
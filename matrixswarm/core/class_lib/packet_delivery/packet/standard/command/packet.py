@@ -21,7 +21,14 @@ class Packet(BasePacket):
                 "content": data.get("content", {}),
                 # if set locate the service under matrixswarm.core.* and inject data then inject inside handler
             }
+            #distributed trace context, see metrics/trace_spans.py
+            if data.get("trace"):
+                self._payload["trace"] = data["trace"]
+                if self._trace is None:
+                    self._trace = data["trace"]
             self._data = data
+            if data.get("priority") and self._priority is None:
+                self._priority = data["priority"]
             self._error_code = 0
             self._error_msg = ""
         except Exception as e:
@@ -1,9 +1,16 @@
 import os
-import json
+import time
 from matrixswarm.core.class_lib.packet_delivery.interfaces.packet_processor import PacketProcessorBase
 from matrixswarm.core.class_lib.packet_delivery.interfaces.base_reception_agent import BaseReceptionAgent
 from matrixswarm.core.mixin.log_method import LogMixin
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.identity import IdentityObject
+from matrixswarm.core.class_lib.packet_delivery.utility.packet_frame import loads_packet
+from matrixswarm.core.class_lib.packet_delivery.interfaces.base_reception_agent import ReceivedPacket
+from matrixswarm.core.class_lib.packet_delivery.utility.priority_lanes import lane_of, lane_rank, LANE_CONTROL
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import PIPELINE_METRICS, STAGE_SCAN, STAGE_READ, STAGE_PARSE, STAGE_DECRYPT
+
+# temp files of a sender that died before its rename (<name>.json.tmp); removed by the next scan past this age
+STALE_TEMP_AGE = 300
 
 class ReceptionAgent(BaseReceptionAgent, LogMixin):
     def __init__(self):
@@ -17,6 +24,7 @@ class ReceptionAgent(BaseReceptionAgent, LogMixin):
         self._custom_metadata = {}
         self._crypto = None
         self._filename_override = None
+        self._scan_stats = {"depth": 0, "remaining": 0, "dropped": 0, "lanes": {}, "interrupted": False}
 
     def set_crypto_handler(self, crypto_handler: PacketProcessorBase):
         self._crypto = crypto_handler
@@ -94,6 +102,173 @@ class ReceptionAgent(BaseReceptionAgent, LogMixin):
 
         return r
 
+    def _drop_path(self, uid=None):
+        drop_path = os.path.join(self._location, uid) if uid else self._location
+        if self._drop_zone:
+            drop_path = os.path.join(drop_path, self._drop_zone)
+        return drop_path
+
+    def get_scan_stats(self) -> dict:
+        """Queue depth of the last receive_batch() snapshot; remaining counts down as files are read.
+
+        lanes holds {lane: (depth, oldest mtime)}; interrupted is True when
+        the batch stopped early for a control packet.
+        """
+        stats = dict(self._scan_stats)
+        stats["lanes"] = {lane: tuple(v) for lane, v in self._scan_stats["lanes"].items()}
+        return stats
+
+    def _sweep_temp_files(self, entries):
+        """Removes temp files older than STALE_TEMP_AGE; a live sender renames its own within a group commit window."""
+        cutoff = time.time() - STALE_TEMP_AGE
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    self.log(f"[JSON_FILE][SWEEP] Removed stale temp file '{entry.name}'.")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.log(f"Failed to remove stale temp file '{entry.name}'", error=e)
+
+    def receive_batch(self, packet_factory=None, remove: bool = True, limit: int = None, keep_newest: int = None,
+                      interrupt=None):
+        """Streams every packet in the drop zone from one directory snapshot, lane by lane.
+
+        The drop zone is listed once; each file is then opened directly by
+        name, decrypted, optionally removed, and yielded before the next one
+        is read. A failure only affects its own file. Files are read control
+        lane first, then normal, then bulk (see priority_lanes), oldest first
+        within a lane.
+
+        Args:
+            packet_factory (callable, optional): Returns a fresh packet object
+                per file. Defaults to a new instance of the packet set with set_packet().
+            remove (bool): Delete each file once it has been read.
+            limit (int, optional): Stop after this many files.
+            keep_newest (int, optional): Inbox quota with the drop_oldest
+                policy; files beyond the newest keep_newest are deleted unread.
+            interrupt (callable, optional): Checked before each file below the
+                control lane; returning True ends the batch so the caller can
+                rescan for newly arrived control packets.
+
+        Yields:
+            ReceivedPacket: name, packet (None on failure), identity, error.
+        """
+        if packet_factory is None:
+            if self._packet is None:
+                raise ValueError("receive_batch() needs a packet_factory or a packet set with set_packet().")
+            packet_factory = type(self._packet)
+
+        try:
+            self._crypto.set_logger(self.get_logger())
+        except Exception as e:
+            pass
+
+        drop_path = self._drop_path(self._address[0] if self._address else None)
+
+        t0 = time.perf_counter()
+        stale = []
+        try:
+            with os.scandir(drop_path) as it:
+                entries = []
+                for entry in it:
+                    if not entry.name.endswith(self._file_ext):
+                        if entry.name.endswith(self._file_ext + ".tmp"):
+                            stale.append(entry)
+                        continue
+                    try:
+                        lane = lane_of(entry.name)
+                        entries.append((lane_rank(lane), entry.stat().st_mtime_ns, entry.name, lane))
+                    except FileNotFoundError:
+                        continue
+        except Exception as e:
+            self._error = f"[JSON_FILE][RECEIVE_BATCH] Failed to scan {drop_path}: {e}"
+            self.log("Failed to scan drop zone", error=e)
+            return
+        self._sweep_temp_files(stale)
+
+        dropped = 0
+        if keep_newest is not None and len(entries) > keep_newest:
+            # oldest packets go first, the control lane is never dropped
+            bulk = sorted((e for e in entries if e[3] != LANE_CONTROL), key=lambda e: e[1])
+            excess = bulk[:len(entries) - keep_newest]
+            for _, _, fname, _ in excess:
+                try:
+                    os.remove(os.path.join(drop_path, fname))
+                    dropped += 1
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    self.log(f"Failed to drop '{fname}'", error=e)
+            gone = {e[2] for e in excess}
+            entries = [e for e in entries if e[2] not in gone]
+            self.log(f"[JSON_FILE][QUOTA] Inbox over quota, dropped {dropped} oldest packet(s) unread.")
+
+        entries.sort()
+        PIPELINE_METRICS.record(STAGE_SCAN, time.perf_counter() - t0)
+        lanes = {}
+        for _, mtime_ns, _, lane in entries:
+            depth, oldest = lanes.get(lane, (0, None))
+            lanes[lane] = [depth + 1, oldest if oldest is not None else mtime_ns / 1e9]
+
+        self._scan_stats = {"depth": len(entries), "remaining": len(entries), "dropped": dropped,
+                            "lanes": lanes, "interrupted": False}
+        if limit is not None:
+            entries = entries[:limit]
+
+        for _, mtime_ns, fname, lane in entries:
+            if interrupt is not None and lane != LANE_CONTROL and interrupt():
+                self._scan_stats["interrupted"] = True
+                return
+            self._scan_stats["remaining"] -= 1
+            # the file being read is the oldest one left in its lane
+            lanes[lane][0] -= 1
+            lanes[lane][1] = mtime_ns / 1e9 if lanes[lane][0] else None
+            full_path = os.path.join(drop_path, fname)
+            packet = None
+            identity = None
+            error = None
+            read_at = time.time()
+            t3 = None
+            try:
+                # json or binary frame, see packet_frame
+                t0 = time.perf_counter()
+                with open(full_path, "rb") as f:
+                    raw = f.read()
+                t1 = time.perf_counter()
+                raw_data = loads_packet(raw)
+                t2 = time.perf_counter()
+                data = self._crypto.prepare_for_processing(raw_data)
+                t3 = time.perf_counter()
+                PIPELINE_METRICS.record(STAGE_READ, t1 - t0)
+                PIPELINE_METRICS.record(STAGE_PARSE, t2 - t1)
+                PIPELINE_METRICS.record(STAGE_DECRYPT, t3 - t2)
+                if not isinstance(data, dict):
+                    raise ValueError("Packet failed to decrypt or verify.")
+
+                packet = packet_factory()
+                packet.set_data(data)
+                identity = self.get_identity()
+
+            except FileNotFoundError:
+                # consumed by someone else since the snapshot
+                continue
+            except Exception as e:
+                error = f"[JSON_FILE][RECEIVE_BATCH] {fname}: {e}"
+                self.log(f"Exception while reading '{fname}'", error=e)
+
+            if remove:
+                try:
+                    os.remove(full_path)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    self.log(f"Failed to remove '{fname}'", error=e)
+
+            yield ReceivedPacket(fname, packet, identity, error, lane, mtime_ns / 1e9,
+                                 read_at, t3 - t0 if t3 is not None else None)
+
     def receive(self):
         try:
 
@@ -110,12 +285,15 @@ class ReceptionAgent(BaseReceptionAgent, LogMixin):
 
             for uid in uids:
 
-                drop_path = os.path.join(self._location, uid) if uid else self._location
-                if self._drop_zone:
-                    drop_path = os.path.join(drop_path, self._drop_zone)
+                drop_path = self._drop_path(uid)
 
+                # a named file is opened directly, no directory scan
+                if self._filename_override:
+                    names = [self._filename_override] if os.path.isfile(os.path.join(drop_path, self._filename_override)) else []
+                else:
+                    names = os.listdir(drop_path)
 
-                for fname in os.listdir(drop_path):
+                for fname in names:
 
                     # Enforce file extension
                     if not fname.endswith(self._file_ext):
@@ -128,8 +306,9 @@ class ReceptionAgent(BaseReceptionAgent, LogMixin):
 
                     full_path = os.path.join(drop_path, fname)
 
-                    with open(full_path, "r", encoding="utf-8") as f:
-                        raw_data = json.load(f)
+                    # json or binary frame, see packet_frame
+                    with open(full_path, "rb") as f:
+                        raw_data = loads_packet(f.read())
 
                     try:
                         # decrypt and set packet
@@ -0,0 +1,243 @@
+import os
+import queue
+import time
+import socket
+import threading
+from matrixswarm.core.class_lib.packet_delivery.interfaces.packet_processor import PacketProcessorBase
+from matrixswarm.core.class_lib.packet_delivery.interfaces.base_reception_agent import BaseReceptionAgent, ReceivedPacket
+from matrixswarm.core.mixin.log_method import LogMixin
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.identity import IdentityObject
+from matrixswarm.core.class_lib.packet_delivery.utility.unix_socket import socket_path, recv_frame, ACK_QUEUED, ACK_REJECTED
+
+class ReceptionAgent(BaseReceptionAgent, LogMixin):
+    """Receives packets on a unix socket under the agent's comm dir.
+
+    listen() binds comm/<uid>/<drop>.sock and queues every frame a sender
+    pushes. Frames are decrypted on the caller's thread by receive(), one
+    packet per call, so the Football checks run exactly as they do for
+    file.json_file. Senders fall back to the file drop when the socket is
+    missing or the queue is full, so the owner must keep scanning its drop
+    zone as well.
+    """
+    def __init__(self):
+        self._location = None
+        self._address = []
+        self._packet = None
+        self._drop_zone = None
+        self._error = None
+        self._file_ext = ".json"
+        self._custom_metadata = {}
+        self._crypto = None
+        self._queue = queue.Queue(maxsize=5000)
+        self._server = None
+        self._socket_path = None
+        self._wake_callback = None
+        self._running = False
+
+    def set_crypto_handler(self, crypto_handler: PacketProcessorBase):
+        self._crypto = crypto_handler
+        return self
+
+    def set_identifier(self, name: str):
+        # frames carry no filename
+        return self
+
+    def set_metadata(self, metadata: dict):
+        self._custom_metadata = metadata
+        if "max_queue" in metadata:
+            self._queue = queue.Queue(maxsize=int(metadata["max_queue"]))
+        return self
+
+    def set_location(self, loc):
+        self._location = loc.get("path")
+        return self
+
+    def set_address(self, ids):
+        self._address = ids if isinstance(ids, list) else [ids]
+        return self
+
+    def set_packet(self, packet):
+        self._packet = packet
+        return self
+
+    def set_drop_zone(self, drop):
+        self._drop_zone = drop.get("drop")
+        return self
+
+    #called from the socket thread every time a frame is queued
+    def set_wake_callback(self, fn):
+        self._wake_callback = fn
+        return self
+
+    def get_agent_type(self):
+        return "socket"
+
+    def get_error_success(self):
+        return 1 if self._error else 0
+
+    def get_error_success_msg(self):
+        return self._error or "OK"
+
+    def get_identity(self):
+        try:
+            return IdentityObject(self.has_verified_identity(), self.get_sender_uid())
+        except Exception:
+            pass
+
+    def has_verified_identity(self) -> bool:
+        """Returns True if the packet has a Matrix-verified identity."""
+        r = False
+        try:
+            r = self._crypto.has_verified_identity()
+        except Exception as e:
+            pass
+
+        return r
+
+    def get_sender_uid(self) -> str:
+        """Returns the universal_id (agent ID) of the sender if verified, else raises or returns None."""
+        r = None
+        try:
+            r = self._crypto.get_sender_uid()
+        except Exception as e:
+            pass
+
+        return r
+
+    def get_socket_path(self):
+        return self._socket_path
+
+    def is_listening(self) -> bool:
+        return self._running
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def listen(self):
+        """Binds the socket and starts accepting senders. Returns self."""
+        try:
+            if not self._location or not self._address:
+                raise ValueError("Location and address must be set before listen().")
+
+            self._socket_path = socket_path(self._location, self._address[0], self._drop_zone)
+            os.makedirs(os.path.dirname(self._socket_path), exist_ok=True)
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self._socket_path)
+            os.chmod(self._socket_path, 0o600)
+            server.listen(64)
+            server.settimeout(1.0)
+
+            self._server = server
+            self._running = True
+            self._error = None
+            threading.Thread(target=self._accept_loop, name="unix_socket_reception", daemon=True).start()
+
+        except Exception as e:
+            self._error = f"[UNIX_SOCKET][LISTEN] Failed: {e}"
+            self.log("Failed to bind socket, senders will use the file drop", error=e)
+
+        return self
+
+    def close(self):
+        self._running = False
+        try:
+            if self._server:
+                self._server.close()
+            if self._socket_path and os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+        except Exception as e:
+            self.log(error=e)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def _handle_client(self, conn):
+        try:
+            conn.settimeout(5.0)
+            while self._running:
+                frame = recv_frame(conn)
+                if frame is None:
+                    break
+                try:
+                    self._queue.put_nowait(frame)
+                    conn.sendall(ACK_QUEUED)
+                except queue.Full:
+                    conn.sendall(ACK_REJECTED)
+                    continue
+                if callable(self._wake_callback):
+                    self._wake_callback()
+        except Exception as e:
+            self.log("Socket client failed", error=e)
+        finally:
+            conn.close()
+
+    def receive_batch(self, packet_factory=None, remove: bool = True, limit: int = None):
+        """Streams the frames queued so far, in arrival order. See the file.json_file receive_batch().
+
+        remove is accepted for parity; a frame is always consumed once read.
+        """
+        if packet_factory is None:
+            if self._packet is None:
+                raise ValueError("receive_batch() needs a packet_factory or a packet set with set_packet().")
+            packet_factory = type(self._packet)
+
+        try:
+            self._crypto.set_logger(self.get_logger())
+        except Exception as e:
+            pass
+
+        count = self._queue.qsize() if limit is None else min(limit, self._queue.qsize())
+        for _ in range(count):
+            try:
+                raw_data = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            packet = None
+            identity = None
+            error = None
+            read_at = time.time()
+            t0 = time.perf_counter()
+            try:
+                data = self._crypto.prepare_for_processing(raw_data)
+                if not isinstance(data, dict):
+                    raise ValueError("Packet failed to decrypt or verify.")
+                packet = packet_factory()
+                packet.set_data(data)
+                identity = self.get_identity()
+            except Exception as e:
+                error = f"[UNIX_SOCKET][RECEIVE_BATCH] {e}"
+                self.log("Exception while decrypting socket frame", error=e)
+
+            yield ReceivedPacket("unix socket", packet, identity, error, read_at=read_at, read_time=time.perf_counter() - t0)
+
+    def receive(self):
+        """Decrypts the next queued frame. Returns the packet, or None when the queue is empty or the frame fails."""
+        try:
+            try:
+                raw_data = self._queue.get_nowait()
+            except queue.Empty:
+                return None
+
+            try:
+                self._crypto.set_logger(self.get_logger())
+            except Exception as e:
+                pass
+
+            data = self._crypto.prepare_for_processing(raw_data)
+            self._packet.set_data(data)
+            return self._packet
+
+        except Exception as e:
+            self.log("Exception while decrypting socket frame", error=e)
+            return None
@@ -19,3 +19,19 @@ class PacketEncryptor(PacketEncryptorBase, LogMixin):
             pass
 
         return self._packet_crypto_mixin.set_football(self.football).build_secure_packet(packet_obj.get_packet())
+
+    def prepare_for_delivery_many(self, packet_obj:BasePacket, uids:list):
+
+        recipients = self.football.get_recipient_pubkeys()
+        if not recipients or any(uid not in recipients for uid in uids):
+            #no per-recipient keys loaded, every uid gets the football's own envelope
+            return super().prepare_for_delivery_many(packet_obj, uids)
+
+        self._packet_crypto_mixin = PacketCryptoMixin()
+
+        try:
+            self._packet_crypto_mixin.set_logger(self.get_logger())
+        except Exception as e:
+            pass
+
+        return self._packet_crypto_mixin.set_football(self.football).build_secure_packet_many(packet_obj.get_packet(), {uid: recipients[uid] for uid in uids})
@@ -1,21 +1,19 @@
 #Authored by Daniel F MacDonald and ChatGPT aka The Generals
 #Gemini, doc-rocking the Swarm to perfection.
 import json
-import base64
 import os
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.sig_payload_json import SigPayloadJson
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.interfaces.sig_payload import SigPayload
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.backends import default_backend
 from Crypto.Cipher import AES
-from Crypto.PublicKey import RSA as CryptoRSA
 from Crypto.Cipher import PKCS1_OAEP
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
 from matrixswarm.core.mixin.log_method import LogMixin
 from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.identity import IdentityObject
 from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.identity_manager import IdentityManager
 from matrixswarm.core.utils.crypto_utils import generate_aes_key
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.rsa_key_cache import RSA_KEY_CACHE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import SUITE_RSA, SUITE_FIELD, \
+    SUITE_PUB_FIELD, VAULT_SUITE_PRIV_FIELD, normalize_suite, get_suite
 
 class Football(LogMixin):
     """Manages the cryptographic context for sending and receiving packets.
@@ -50,9 +48,13 @@ class Football(LogMixin):
         # verify the signed payload {+ payload} with matching pubkey : self._payload_verifying_key
         self._verify_signed_payload = True
 
-        # used for signing a payload
+        # used for signing a payload; always the RSA privkey, which also decrypts asymmetric payloads
         self._payload_signing_key = None
 
+        # suite the payload is signed with, and its privkey when the suite isn't RSA
+        self._payload_signing_suite = SUITE_RSA
+        self._payload_suite_signing_key = None
+
         # used for verifying a signed payload
         self._payload_verifying_key = None
 
@@ -70,6 +72,12 @@ class Football(LogMixin):
         #encrypt the target's aes key using its pubkey
         self._encrypt_aes_key_using_target_pubkey = True
 
+        #wrap one aes key per target session instead of one per packet, see SessionKeyStore
+        self._use_session_keys = False
+
+        #multicast recipients {universal_id: pubkey}; the content key is wrapped once per entry
+        self._recipient_pubkeys = {}
+
         # decrypt the target's aes key using its privkey
         self._decrypt_aes_key_using_privkey = True
 
@@ -143,11 +151,18 @@ class Football(LogMixin):
         return self._verify_signed_payload
 
     #used during sending a packet - signs the payload - if set
-    def set_payload_signing_key(self, priv:str):
+    #   suite: signature suite of priv, RSA when None; see signature_suite
+    def set_payload_signing_key(self, priv:str, suite:str=None):
         self.set_sign_payload(True)
         try:
-            CryptoRSA.import_key(priv)
-            self._payload_signing_key = priv
+            suite = normalize_suite(suite)
+            if suite == SUITE_RSA:
+                RSA_KEY_CACHE.import_key(priv)
+                self._payload_signing_key = priv
+            else:
+                get_suite(suite).public_from_private(priv)
+                self._payload_suite_signing_key = priv
+            self._payload_signing_suite = suite
         except Exception as e:
             self.log("Failed to set payload_siging_key", error=e, block="PERSONAL_IDENTITY", level="ERROR")
 
@@ -155,6 +170,12 @@ class Football(LogMixin):
     def get_payload_signing_key(self):
         return self._payload_signing_key
 
+    #(suite name, privkey) the payload is signed with
+    def get_payload_signer(self):
+        if self._payload_signing_suite == SUITE_RSA:
+            return SUITE_RSA, self._payload_signing_key
+        return self._payload_signing_suite, self._payload_suite_signing_key
+
     #Noramlly 1 or 2 identities will be added. The first is the calling agent's identity(owner agent)
     #Second, will be the identity of the target agent, that you more than likely retrieved from the filesystem.
     #The first identity, if set, will be embedded with the payload and both are signed with private key to prove the sender
@@ -215,28 +236,32 @@ class Football(LogMixin):
             if not all(k in identity for k in ("universal_id", "pub", "timestamp")):
                 raise ValueError("Malformed identity payload.")
 
+            sig_suite = normalize_suite(identity.get(SUITE_FIELD))
+            if sig_suite != SUITE_RSA and not identity.get(SUITE_PUB_FIELD):
+                raise ValueError(f"Identity signs with {sig_suite} but carries no {SUITE_PUB_FIELD}.")
+
             if verify_keypair_match:
                 private_key_pem = vault.get("priv").strip()
 
                 #pub_pem = identity["pub"].encode("utf-8")
-                priv_key = CryptoRSA.import_key(private_key_pem)
+                priv_key = RSA_KEY_CACHE.import_key(private_key_pem)
 
                 # Step 1: Verify that priv_key corresponds to pub_key in identity
                 derived_pub = priv_key.publickey().export_key().decode().strip()
                 if derived_pub != identity["pub"].strip():
                     raise ValueError("Private key does not match identity pubkey.")
 
+                if sig_suite != SUITE_RSA:
+                    suite_priv = vault.get(VAULT_SUITE_PRIV_FIELD)
+                    if not suite_priv or get_suite(sig_suite).public_from_private(suite_priv).strip() != identity[SUITE_PUB_FIELD].strip():
+                        raise ValueError(f"{sig_suite} private key does not match identity {SUITE_PUB_FIELD}.")
+
             # Step 2: Verify the Matrix signature if sig_pubkey is set
             if verify_sig:
-                sig_verifier_pubkey_pem = self._identity_sig_verifier_pubkey.encode("utf-8")
-                spk=serialization.load_pem_public_key(
-                    sig_verifier_pubkey_pem,
-                    backend=default_backend()
-                )
                 sp = SigPayloadJson()
                 sp.set_payload(identity)
 
-                if not self.verify_sig(sp, spk, sig):
+                if not self.verify_sig(sp, self._identity_sig_verifier_pubkey, sig):
                     raise ValueError("Signature verification failed.")
                 id_obj.set_priv(private_key_pem)
 
@@ -266,6 +291,8 @@ class Football(LogMixin):
             #used during sending packets, signing the subpacket
             if is_privkey_for_signing:
                 self.set_payload_signing_key(private_key_pem)
+                if sig_suite != SUITE_RSA:
+                    self.set_payload_signing_key(vault.get(VAULT_SUITE_PRIV_FIELD), suite=sig_suite)
 
             #if this identity is the identity of the target, then use the pubkey passed to encrypt the aes key
             if encrypt_aes_key_using_pub:
@@ -282,7 +309,7 @@ class Football(LogMixin):
     def set_pubkey_for_encryption(self, pubkey:str):
 
         try:
-            serialization.load_pem_public_key(pubkey.encode(), backend=default_backend())
+            RSA_KEY_CACHE.import_key(pubkey)
             self.pubkey_for_encryption = pubkey
         except Exception as e:
             self.log(error=e, block="main_try")
@@ -297,7 +324,7 @@ class Football(LogMixin):
     #has been signed using privkey
     def set_pubkey_verifier(self, sig_verifier_pubkey):
         try:
-            serialization.load_pem_public_key(sig_verifier_pubkey.encode(), backend=default_backend())
+            RSA_KEY_CACHE.import_key(sig_verifier_pubkey)
             self._payload_verifying_key = sig_verifier_pubkey
         except Exception as e:
             self.log(error=e, block="main_try")
@@ -386,7 +413,7 @@ class Football(LogMixin):
         return r
 
     #Used internally to the class to verify the Matrix sig on the indentity
-    def verify_sig(self, payload: SigPayload, sig_pubkey, signature_b64: str) -> bool:
+    def verify_sig(self, payload: SigPayload, sig_pubkey, signature_b64: str, suite: str = None) -> bool:
         """Verifies a digital signature against a payload and a public key.
 
         This method is used internally to confirm that an agent's identity
@@ -398,8 +425,12 @@ class Football(LogMixin):
             payload (SigPayload): The data object that was signed, typically
                 an agent's identity token.
             sig_pubkey: The public key of the authority that signed the data
-                (i.e., the Matrix agent's public key).
+                (i.e., the Matrix agent's public key), as a PEM string or a
+                cryptography public key object.
             signature_b64 (str): The base64-encoded signature to be verified.
+            suite (str, optional): Signature suite of sig_pubkey, see
+                signature_suite. Defaults to RSA PKCS#1 v1.5, which is what
+                Matrix signs identity tokens with.
 
         Returns:
             bool: True if the signature is valid, False otherwise.
@@ -408,18 +439,13 @@ class Football(LogMixin):
             if not sig_pubkey:
                 raise ValueError("Verifier key not set")
 
-            # Convert cryptography public key to PEM format, then to pycryptodome RSA key
-            pem_bytes = sig_pubkey.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
-            rsa_key = CryptoRSA.import_key(pem_bytes)
-
-            signature = base64.b64decode(signature_b64)
-            payload_bytes = payload.get_payload()
-            digest = SHA256.new(payload_bytes)
-
-            pkcs1_15.new(rsa_key).verify(digest, signature)
+            if hasattr(sig_pubkey, "public_bytes"):
+                # Convert cryptography public key to PEM format
+                sig_pubkey = sig_pubkey.public_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PublicFormat.SubjectPublicKeyInfo
+                )
+            get_suite(suite).verify_b64(sig_pubkey, payload.get_payload(), signature_b64)
 
             self.log("Signature verified successfully", block="BL_VERIFY", level="INFO")
 
@@ -447,6 +473,22 @@ class Football(LogMixin):
     def encrypt_aes_key_using_target_pubkey(self):
         return self._encrypt_aes_key_using_target_pubkey
 
+    #pubkeys of verified target identities for a multicast send, {universal_id: pubkey}
+    def set_recipient_pubkeys(self, recipient_pubkeys: dict):
+        self._recipient_pubkeys = dict(recipient_pubkeys or {})
+        return self
+
+    def get_recipient_pubkeys(self) -> dict:
+        return self._recipient_pubkeys
+
+    def set_use_session_keys(self, use_session_keys=True):
+        self._use_session_keys = bool(use_session_keys)
+        return self
+
+    #if True, the aes key is a per-target session key, RSA-wrapped once per session instead of per packet
+    def use_session_keys(self):
+        return self._use_session_keys
+
     def set_decrypt_aes_key_using_privkey(self, decrypt_aes_key_using_privkey=True):
         self._decrypt_aes_key_using_privkey= bool(decrypt_aes_key_using_privkey)
 
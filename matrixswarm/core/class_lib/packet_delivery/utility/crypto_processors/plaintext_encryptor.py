@@ -1,3 +1,7 @@
 class PacketEncryptorPlaintext:
     def prepare_for_delivery(self, packet_obj):
-        return packet_obj.get_packet()
\ No newline at end of file
+        return packet_obj.get_packet()
+
+    def prepare_for_delivery_many(self, packet_obj, uids):
+        data = packet_obj.get_packet()
+        return {uid: data for uid in uids}
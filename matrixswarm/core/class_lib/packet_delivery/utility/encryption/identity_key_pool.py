@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import uuid
+import base64
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from Crypto.Cipher import AES
+from Crypto.PublicKey import RSA
+from Crypto.Random import get_random_bytes
+from matrixswarm.core.utils.crypto_utils import generate_aes_key
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import SUITE_RSA, get_suite
+
+# one pooled identity per file: <store_dir>/<id>.key = base64(nonce(12) | tag(16) | AES-GCM(json keys)) under the swarm key
+POOL_SUFFIX = ".key"
+STATS_DIR = "metrics"
+STATS_FILE = "key_pool.json"
+
+def generate_identity_keys(suite=SUITE_RSA):
+    """Fresh keys of one identity: RSA keypair, AES key and, for a non-RSA suite, its signing keypair.
+
+    Module level so it can run in a process pool worker.
+    """
+    key = RSA.generate(2048)
+    keys = {
+        "priv": key.export_key().decode(),
+        "pub": key.publickey().export_key().decode(),
+        "private_key": generate_aes_key(),
+    }
+    if suite != SUITE_RSA:
+        keys["sig_priv"], keys["sig_pub"] = get_suite(suite).generate_keypair()
+    return keys
+
+def _lower_priority():
+    #keygen is background work, the swarm's own processes come first
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+def key_pool_context():
+    """forkserver/spawn: a plain fork of a threaded agent can deadlock in the child."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+class IdentityKeyPool:
+    """Identity keys generated ahead of time, so Matrix hands them out instead of generating in line.
+
+    A background process (a ProcessPoolExecutor, threads if processes are
+    unavailable) keeps the pool at its target level. Every entry is an RSA
+    keypair and AES key, stored encrypted with the swarm key, one file each.
+    Keys are decrypted only when taken and their file is removed. Entries a
+    new swarm key can't open (e.g. left from an earlier boot) are discarded
+    on configure().
+
+    The target starts at watermark. A take that finds the pool empty
+    raises it, up to max_watermark, so the next burst of the same size is
+    served from the pool. After idle_decay seconds without a take it
+    halves back toward watermark.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(IdentityKeyPool, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._cond = threading.Condition(cls._instance._lock)
+            cls._instance._ready = deque()
+            cls._instance._dir = None
+            cls._instance._key = None
+            cls._instance._enabled = False
+            cls._instance._watermark = 8
+            cls._instance._max_watermark = 64
+            cls._instance._target = 8
+            cls._instance._idle_decay = 600
+            cls._instance._workers = 1
+            cls._instance._inflight = 0
+            cls._instance._missed = 0
+            cls._instance._last_take = time.time()
+            cls._instance._stats_path = None
+            cls._instance._executor = None
+            cls._instance._thread = None
+            cls._instance._stop = threading.Event()
+            cls._instance._stats = {"generated": 0, "hits": 0, "misses": 0, "discarded": 0, "errors": 0}
+
+        return cls._instance
+
+    def configure(self, store_dir: str, swarm_key_b64: str, watermark: int = 8, max_watermark: int = 64,
+                  workers: int = 1, idle_decay: int = 600, stats_comm_path: str = None, enabled: bool = True):
+        """Points the pool at store_dir and loads the entries left there that the swarm key opens."""
+        with self._lock:
+            self._dir = store_dir
+            self._key = base64.b64decode(swarm_key_b64) if swarm_key_b64 else None
+            self._watermark = max(0, int(watermark))
+            self._max_watermark = max(self._watermark, int(max_watermark))
+            self._target = self._watermark
+            self._workers = max(1, int(workers))
+            self._idle_decay = max(1, int(idle_decay))
+            self._stats_path = os.path.join(stats_comm_path, STATS_DIR, STATS_FILE) if stats_comm_path else None
+            self._enabled = bool(enabled) and self._key is not None
+            self._ready.clear()
+            if not self._enabled:
+                return self
+
+            os.makedirs(store_dir, mode=0o700, exist_ok=True)
+            for name in sorted(os.listdir(store_dir)):
+                path = os.path.join(store_dir, name)
+                if not name.endswith(POOL_SUFFIX):
+                    continue
+                try:
+                    self._read(path)
+                    self._ready.append(path)
+                except Exception:
+                    self._stats["discarded"] += 1
+                    self._unlink(path)
+        return self
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def start(self):
+        """Starts the refill thread; safe to call again."""
+        if not self._enabled or (self._thread and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        try:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers, mp_context=key_pool_context(),
+                                                 initializer=_lower_priority)
+        except Exception:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="key_pool")
+        self._thread = threading.Thread(target=self._refill_loop, name="key_pool", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.flush_stats()
+
+    def take(self, suite=SUITE_RSA):
+        """Keys of one identity, as generate_identity_keys() returns them, or None if the pool is empty or off."""
+        if not self._enabled:
+            return None
+        keys = None
+        with self._cond:
+            self._last_take = time.time()
+            while self._ready and keys is None:
+                path = self._ready.popleft()
+                try:
+                    keys = self._read(path)
+                    self._stats["hits"] += 1
+                except Exception:
+                    self._stats["discarded"] += 1
+                self._unlink(path)
+            if keys is None:
+                self._stats["misses"] += 1
+                self._missed += 1
+            self._cond.notify_all()
+
+        if keys is not None and suite != SUITE_RSA:
+            keys["sig_priv"], keys["sig_pub"] = get_suite(suite).generate_keypair()
+        return keys
+
+    def level(self) -> int:
+        with self._lock:
+            return len(self._ready)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(enabled=self._enabled, level=len(self._ready), target=self._target,
+                         watermark=self._watermark, max_watermark=self._max_watermark, inflight=self._inflight)
+            return stats
+
+    def flush_stats(self):
+        """Atomically writes get_stats() to <comm>/metrics/key_pool.json, if a comm path was configured."""
+        if not self._stats_path:
+            return
+        stats = self.get_stats()
+        stats["timestamp"] = time.time()
+        try:
+            os.makedirs(os.path.dirname(self._stats_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", delete=False, dir=os.path.dirname(self._stats_path),
+                                             suffix=".tmp", encoding="utf-8") as f:
+                json.dump(stats, f, separators=(",", ":"))
+                temp_path = f.name
+            os.replace(temp_path, self._stats_path)
+        except OSError:
+            pass
+
+    def _adapt(self):
+        """Moves the target; called with the lock held."""
+        if self._missed:
+            self._target = min(self._max_watermark, max(self._target * 2, self._target + self._missed))
+            self._missed = 0
+        elif self._target > self._watermark and time.time() - self._last_take > self._idle_decay:
+            self._target = max(self._watermark, self._target // 2)
+            self._last_take = time.time()
+
+    def _refill_loop(self):
+        last_flushed = None
+        while not self._stop.is_set():
+            with self._cond:
+                self._adapt()
+                deficit = self._target - len(self._ready) - self._inflight
+                submit = min(deficit, self._workers * 2) if deficit > 0 else 0
+                self._inflight += submit
+            for _ in range(submit):
+                try:
+                    self._executor.submit(generate_identity_keys, SUITE_RSA).add_done_callback(self._store)
+                except Exception:
+                    #executor gone (stop() or a broken pool); give the slot back
+                    with self._cond:
+                        self._inflight -= 1
+                        self._stats["errors"] += 1
+                    if self._stop.is_set():
+                        return
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="key_pool")
+
+            snapshot = (self.level(), self._target)
+            if snapshot != last_flushed:
+                self.flush_stats()
+                last_flushed = snapshot
+            with self._cond:
+                self._cond.wait(timeout=5)
+
+    def _store(self, future):
+        try:
+            if future.cancelled():
+                return
+            keys = future.result()
+            path = os.path.join(self._dir, uuid.uuid4().hex + POOL_SUFFIX)
+            self._write(path, keys)
+            with self._cond:
+                self._ready.append(path)
+                self._stats["generated"] += 1
+        except Exception:
+            with self._cond:
+                self._stats["errors"] += 1
+        finally:
+            with self._cond:
+                self._inflight -= 1
+                self._cond.notify_all()
+
+    def _write(self, path, keys: dict):
+        nonce = get_random_bytes(12)
+        cipher = AES.new(self._key, AES.MODE_GCM, nonce=nonce)
+        ciphertext, tag = cipher.encrypt_and_digest(json.dumps(keys).encode())
+        temp_path = path + ".tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(base64.b64encode(nonce + tag + ciphertext))
+        os.replace(temp_path, path)
+
+    def _read(self, path) -> dict:
+        with open(path, "rb") as f:
+            blob = base64.b64decode(f.read())
+        cipher = AES.new(self._key, AES.MODE_GCM, nonce=blob[:12])
+        return json.loads(cipher.decrypt_and_verify(blob[28:], blob[12:28]).decode())
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+IDENTITY_KEY_POOL = IdentityKeyPool()
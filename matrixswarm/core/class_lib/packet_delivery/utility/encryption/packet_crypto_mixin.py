@@ -4,14 +4,17 @@ import base64
 from matrixswarm.core.mixin.log_method import LogMixin
 
 from Crypto.Cipher import AES
-from Crypto.PublicKey import RSA
 from Crypto.Cipher import PKCS1_OAEP
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
 from Crypto.Random import get_random_bytes
 from matrixswarm.core.utils.debug.config import DebugConfig
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.sig_payload_json import SigPayloadJson
 from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.interfaces.sig_payload import SigPayload
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.verified_identity_cache import VERIFIED_IDENTITY_CACHE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.rsa_key_cache import RSA_KEY_CACHE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.session_key_store import SESSION_KEY_STORE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import get_suite, identity_signer
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import PIPELINE_METRICS, STAGE_UNWRAP_KEY, STAGE_AES_GCM, \
+    STAGE_VERIFY_IDENTITY, STAGE_VERIFY_SIG
 
 class PacketCryptoMixin(LogMixin):
 
@@ -39,42 +42,12 @@ class PacketCryptoMixin(LogMixin):
 
     def build_secure_packet(self, raw_payload: dict):
 
-        subpacket= {}
         try:
             """
             Builds a secure packet using Football as the strategy controller.
             Follows the exact path of: identity -> verify -> encrypt -> sign -> AES encrypt
             """
-            if not self.football:
-                raise RuntimeError("Football not injected. Cannot proceed.")
-
-            if not isinstance(raw_payload, dict):
-                raise RuntimeError("Payload is not a dictionary.")
-
-            # Step 1: Load identity into packet (optional)
-            subpacket = {"payload": raw_payload, "timestamp": int(time.time())}
-
-            #this will include identity(universal_id, pubkey, timestamp) + sig(Matrix signature of the identity)
-            if self.football.use_payload_identity_file():
-                subpacket["identity"] = self.football.get_payload_identity()
-
-            if self.football.use_asymmetric_encryption():
-
-                pubkey_pem = self.football.get_pubkey_for_encryption()
-                pubkey = RSA.import_key(pubkey_pem.encode())
-                cipher = PKCS1_OAEP.new(pubkey)
-                encrypted = cipher.encrypt(json.dumps(subpacket["payload"]).encode())
-                subpacket["payload"] = base64.b64encode(encrypted).decode()
-
-            packet = {"subpacket": subpacket}
-
-            # Step 3: Sign the packet with your private key
-            if self.football.sign_payload():
-                sp = SigPayloadJson()
-                sp.set_payload(subpacket)
-
-                signer_key = RSA.import_key(self.football.get_payload_signing_key())
-                packet["sig"] = self.sign_payload(sp, signer_key)
+            packet = self._build_signed_packet(raw_payload)
 
             # Step 4: Encrypt final packet with AES key
             # You could make this even more secure, by passing a random aes private key
@@ -86,7 +59,8 @@ class PacketCryptoMixin(LogMixin):
                 packet = self.encrypt_packet(packet,
                                              aes_key_b64,                                          #personal aes key
                                              self.football.encrypt_aes_key_using_target_pubkey(),  #are we using a key
-                                             self.football.get_aes_encryption_pubkey()    #key belongs to the target
+                                             self.football.get_aes_encryption_pubkey(),   #key belongs to the target
+                                             self.football.use_session_keys()             #reuse a wrapped per-peer key
                                              )
 
             # exit(json.dumps(packet, indent=2, sort_keys=True))
@@ -96,6 +70,78 @@ class PacketCryptoMixin(LogMixin):
         except Exception as e:
             self.log(error=e, block="main_try")
 
+    def build_secure_packet_many(self, raw_payload: dict, recipient_pubkeys: dict) -> dict:
+        """
+        Multicast version of build_secure_packet(): signs and AES-encrypts the payload once
+        with a fresh content key, then wraps only that key per recipient.
+
+        recipient_pubkeys: {universal_id: pubkey_pem}
+        Returns {universal_id: encrypted_blob}; every blob shares nonce, tag and payload.
+
+        Raises ValueError with asymmetric payload encryption on: the payload is RSA-encrypted
+        to a single recipient's key there, so each recipient needs its own build_secure_packet().
+        """
+        if self.football and self.football.use_asymmetric_encryption():
+            raise ValueError("Asymmetric payload encryption can't be multicast, build a packet per recipient.")
+
+        try:
+            packet = self._build_signed_packet(raw_payload)
+
+            if not self.football.use_symmetric_encryption():
+                return {uid: packet for uid in recipient_pubkeys}
+
+            if not self.football.encrypt_aes_key_using_target_pubkey():
+                blob = self.encrypt_packet(packet, self.football.get_aes_key())
+                return {uid: blob for uid in recipient_pubkeys}
+
+            content_key = get_random_bytes(32)
+            blob = self.encrypt_packet(packet, base64.b64encode(content_key).decode())
+
+            out = {}
+            for uid, pubkey_pem in recipient_pubkeys.items():
+                wrapped = PKCS1_OAEP.new(RSA_KEY_CACHE.import_key(pubkey_pem)).encrypt(content_key)
+                out[uid] = dict(blob, encrypted_aes_key=base64.b64encode(wrapped).decode())
+            return out
+
+        except Exception as e:
+            self.log(error=e, block="main_try")
+
+    def _build_signed_packet(self, raw_payload: dict) -> dict:
+        """Steps 1-3 of build_secure_packet(): identity, optional RSA payload encryption, signature."""
+
+        if not self.football:
+            raise RuntimeError("Football not injected. Cannot proceed.")
+
+        if not isinstance(raw_payload, dict):
+            raise RuntimeError("Payload is not a dictionary.")
+
+        # Step 1: Load identity into packet (optional)
+        subpacket = {"payload": raw_payload, "timestamp": int(time.time())}
+
+        #this will include identity(universal_id, pubkey, timestamp) + sig(Matrix signature of the identity)
+        if self.football.use_payload_identity_file():
+            subpacket["identity"] = self.football.get_payload_identity()
+
+        if self.football.use_asymmetric_encryption():
+
+            pubkey_pem = self.football.get_pubkey_for_encryption()
+            pubkey = RSA_KEY_CACHE.import_key(pubkey_pem)
+            cipher = PKCS1_OAEP.new(pubkey)
+            encrypted = cipher.encrypt(json.dumps(subpacket["payload"]).encode())
+            subpacket["payload"] = base64.b64encode(encrypted).decode()
+
+        packet = {"subpacket": subpacket}
+
+        # Step 3: Sign the packet with your private key
+        if self.football.sign_payload():
+            sp = SigPayloadJson()
+            sp.set_payload(subpacket)
+
+            suite, signer_key = self.football.get_payload_signer()
+            packet["sig"] = self.sign_payload(sp, signer_key, suite)
+
+        return packet
+
     def unpack_secure_packet(self, raw_payload: dict):
         """
         Fully reverses the packet built by build_secure_packet().
@@ -118,12 +164,22 @@ class PacketCryptoMixin(LogMixin):
                     step="1.1"
                     raise ValueError("Unsupported or unrecognized packet format.")
 
-                if self.football.decrypt_aes_key_using_privkey():
+                t0 = time.perf_counter()
+                if self.football.decrypt_aes_key_using_privkey() and raw_payload.get("session_id"):
+                    # session packet: the wrapped key is only RSA-decrypted once per session
+                    aes_key_b64 = SESSION_KEY_STORE.unwrap(raw_payload["session_id"],
+                                                           raw_payload["encrypted_aes_key"],
+                                                           self.football.get_aes_encryption_privkey(),
+                                                           self.decrypt_private_key)
+                elif self.football.decrypt_aes_key_using_privkey():
                     aes_key_b64 = self.decrypt_private_key(raw_payload["encrypted_aes_key"], self.football.get_aes_encryption_privkey()) # must be private
                 else:
                     aes_key_b64 = self.football.get_aes_key()
+                t1 = time.perf_counter()
 
                 raw_payload = self.decrypt_packet(raw_payload, aes_key_b64)
+                PIPELINE_METRICS.record(STAGE_UNWRAP_KEY, t1 - t0)
+                PIPELINE_METRICS.record(STAGE_AES_GCM, time.perf_counter() - t1)
 
                 packet = raw_payload.get("subpacket")
 
@@ -163,28 +219,37 @@ class PacketCryptoMixin(LogMixin):
                     step = "2.1"
                     raise RuntimeError("Packet signature exists but no subpacket found.")
 
-                #verify Matrix signed the identity
+                #verify Matrix signed the identity; the pair is identical for every packet from this sender,
+                #so it is only checked once per sender per key rotation
+                t0 = time.perf_counter()
                 sp = SigPayloadJson()
                 sp.set_payload(identity)
-                if not self.verify_payload(sp, pubkey, sig):
-                    step = "2.2"
-                    raise RuntimeError("Packet signature did not pass.")
+                identity_key = VERIFIED_IDENTITY_CACHE.make_key(sp.get_payload(), sig, pubkey)
+                if not VERIFIED_IDENTITY_CACHE.is_verified(identity_key):
+                    if not self.verify_payload(sp, pubkey, sig):
+                        step = "2.2"
+                        raise RuntimeError("Packet signature did not pass.")
+                    VERIFIED_IDENTITY_CACHE.add(identity_key, identity.get("universal_id"))
+                PIPELINE_METRICS.record(STAGE_VERIFY_IDENTITY, time.perf_counter() - t0)
 
                 #outter packet - sender's signature, using the sender's private key on the outer packet(subpacket)
                 #since the inner-identity pubkey has been signed by Matrix and since the inner-identity pubkey is used to
                 # verify the outer packet. hence, the owner of the identity sent the message
                 sig = packet.get('sig')
-                pubkey = subpacket.get("identity").get("identity").get("pub")
+                #the identity names the suite its owner signs with; Matrix signed that choice along with the keys
+                suite, pubkey = identity_signer(subpacket.get("identity").get("identity"))
                 if not sig or not pubkey:
                     step = "2.3"
                     raise RuntimeError("Packet signature exists but no subpacket found.")
 
+                t0 = time.perf_counter()
                 sp = SigPayloadJson()
                 sp.set_payload(subpacket)
                 #use the pubkey contained in the identity, since the packet has been signed by the paired privkey
-                if not self.verify_payload(sp, pubkey, sig):
+                if not self.verify_payload(sp, pubkey, sig, suite.name):
                     step = "2.4"
                     raise RuntimeError("Packet signature did not pass.")
+                PIPELINE_METRICS.record(STAGE_VERIFY_SIG, time.perf_counter() - t0)
 
                 self._decrypted_packet = subpacket
 
@@ -201,7 +266,7 @@ class PacketCryptoMixin(LogMixin):
                 if encrypted_payload_b64:
                     encrypted_bytes = base64.b64decode(encrypted_payload_b64)
 
-                    priv_obj = RSA.import_key(self.football.get_payload_signing_key())
+                    priv_obj = RSA_KEY_CACHE.import_key(self.football.get_payload_signing_key())
 
                     cipher_rsa = PKCS1_OAEP.new(priv_obj)
 
@@ -288,13 +353,20 @@ class PacketCryptoMixin(LogMixin):
 
         #return "ALL" in allowed_actions or action in allowed_actions
 
-    def decrypt_private_key(self, encrypted_b64: str, privkey_pem: str) -> str:
+    @staticmethod
+    def _raw_bytes(value) -> bytes:
+        # json envelopes carry base64 text, binary frames (packet_frame) hand over the raw bytes
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return base64.b64decode(value)
+
+    def decrypt_private_key(self, encrypted_b64, privkey_pem: str) -> str:
 
-        rsa_key = RSA.import_key(privkey_pem.encode())
+        rsa_key = RSA_KEY_CACHE.import_key(privkey_pem)
 
         cipher_rsa = PKCS1_OAEP.new(rsa_key)
 
-        decrypted_bytes = cipher_rsa.decrypt(base64.b64decode(encrypted_b64))
+        decrypted_bytes = cipher_rsa.decrypt(self._raw_bytes(encrypted_b64))
 
         # Re-encode to base64 string so it's compatible with rest of the pipeline
         return base64.b64encode(decrypted_bytes).decode()
@@ -304,11 +376,15 @@ class PacketCryptoMixin(LogMixin):
             raw_payload: dict,
             aes_key_b64: str,
             encrypt_aes_key_using_target_pubkey: bool = False,
-            aes_encryption_pubkey: str = ""
+            aes_encryption_pubkey: str = "",
+            use_session_key: bool = False
     ) -> dict:
         """
         Encrypts a raw packet using AES-GCM. Optionally wraps AES key using target's RSA public key.
 
+        With use_session_key the AES key comes from the target's current session
+        (SESSION_KEY_STORE), already wrapped, and the blob carries its session_id.
+
         Returns a JSON-safe encrypted_blob structure with optional encrypted_aes_key field.
         """
 
@@ -317,6 +393,13 @@ class PacketCryptoMixin(LogMixin):
             if not isinstance(raw_payload, dict):
                 raise ValueError("Payload must be a dictionary.")
 
+            session = None
+            if encrypt_aes_key_using_target_pubkey and use_session_key:
+                if not aes_encryption_pubkey:
+                    raise ValueError("Public key required for AES key encryption.")
+                session = SESSION_KEY_STORE.get_outgoing(aes_encryption_pubkey)
+                aes_key_b64 = base64.b64encode(session["aes_key"]).decode()
+
             # Decode AES key
             aes_key = base64.b64decode(aes_key_b64)
             if len(aes_key) not in (16, 24, 32):
@@ -345,12 +428,15 @@ class PacketCryptoMixin(LogMixin):
             }
 
             # Optionally encrypt the AES key with recipient's RSA pubkey
-            if encrypt_aes_key_using_target_pubkey:
+            if session:
+                encrypted_blob["session_id"] = session["session_id"]
+                encrypted_blob["encrypted_aes_key"] = session["encrypted_aes_key"]
+            elif encrypt_aes_key_using_target_pubkey:
                 if not aes_encryption_pubkey:
                     raise ValueError("Public key required for AES key encryption.")
                 if isinstance(aes_key, str):
                     aes_key = base64.b64decode(aes_key)
-                rsa_cipher = PKCS1_OAEP.new(RSA.import_key(aes_encryption_pubkey))
+                rsa_cipher = PKCS1_OAEP.new(RSA_KEY_CACHE.import_key(aes_encryption_pubkey))
                 encrypted_key = rsa_cipher.encrypt(aes_key)
                 encrypted_blob["encrypted_aes_key"] = base64.b64encode(encrypted_key).decode()
 
@@ -370,9 +456,9 @@ class PacketCryptoMixin(LogMixin):
             raise ValueError("Unsupported or unrecognized packet type.")
 
         aes_key = base64.b64decode(aes_key_b64)
-        nonce = base64.b64decode(blob["nonce"])
-        tag = base64.b64decode(blob["tag"])
-        ciphertext = base64.b64decode(blob["payload"])
+        nonce = self._raw_bytes(blob["nonce"])
+        tag = self._raw_bytes(blob["tag"])
+        ciphertext = self._raw_bytes(blob["payload"])
 
         cipher = AES.new(aes_key, AES.MODE_GCM, nonce=nonce)
         decrypted = cipher.decrypt_and_verify(ciphertext, tag)
@@ -382,32 +468,24 @@ class PacketCryptoMixin(LogMixin):
         # Return only the original subpacket by default, or return the whole payload if preferred
         return payload
 
-    def sign_payload(self, payload: SigPayload, private_key) -> str:
+    def sign_payload(self, payload: SigPayload, private_key, suite: str = None) -> str:
         """
-        Sign a JSON payload with a private key using PKCS1 v1.5 and SHA256.
+        Sign a JSON payload with a private key of the given signature suite (RSA PKCS1 v1.5/SHA256 by default).
         Returns a base64-encoded signature.
         """
-        payload_bytes = payload.get_payload()
-        digest = SHA256.new(payload_bytes)
-        signature = pkcs1_15.new(private_key).sign(digest)
-        return base64.b64encode(signature).decode()
+        return get_suite(suite).sign_b64(private_key, payload.get_payload())
 
-    def verify_payload(self, payload: SigPayload, public_key, signature_b64: str) -> bool:
+    def verify_payload(self, payload: SigPayload, public_key, signature_b64: str, suite: str = None) -> bool:
         """
-        Verify a signed JSON payload with a public key.
-        Returns True if valid, raises exception on failure.
+        Verify a signed JSON payload with a public key of the given signature suite (RSA by default).
+        Returns True if valid, False on failure.
         """
         try:
 
-            rsa_key = RSA.import_key(public_key.encode())
-
-            if not rsa_key:
+            if not public_key:
                 raise ValueError("Verifier key not set")
 
-            signature = base64.b64decode(signature_b64)
-            payload_bytes = payload.get_payload()
-            digest = SHA256.new(payload_bytes)
-            pkcs1_15.new(rsa_key).verify(digest, signature)
+            get_suite(suite).verify_b64(public_key, payload.get_payload(), signature_b64)
             if self.debug.is_enabled():
                 self.log("Signature verified successfully", block="BL_VERIFY", level="INFO")
 
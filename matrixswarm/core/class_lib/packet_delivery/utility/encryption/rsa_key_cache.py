@@ -0,0 +1,72 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from Crypto.PublicKey import RSA
+
+class RsaKeyCache:
+    """Process-wide LRU of parsed RSA keys, keyed by the digest of their PEM.
+
+    Every crypto path in packet delivery works from PEM strings held by the
+    Football, and parsing them (RSA.import_key) was repeated for every sign,
+    verify, wrap and unwrap. Parsed key objects are read-only during those
+    operations, so one object per PEM is shared across threads.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RsaKeyCache, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._keys = OrderedDict()
+            cls._instance._max_entries = 256
+            cls._instance._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        return cls._instance
+
+    def set_max_entries(self, max_entries: int):
+        with self._lock:
+            self._max_entries = max(1, int(max_entries))
+            while len(self._keys) > self._max_entries:
+                self._keys.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def import_key(self, pem):
+        """Returns the parsed RsaKey for a PEM (str or bytes). Raises like RSA.import_key on bad input."""
+        if isinstance(pem, str):
+            pem = pem.encode()
+        if not pem:
+            raise ValueError("Empty RSA key.")
+
+        digest = hashlib.sha256(pem).digest()
+        with self._lock:
+            key = self._keys.get(digest)
+            if key is not None:
+                self._keys.move_to_end(digest)
+                self._stats["hits"] += 1
+                return key
+            self._stats["misses"] += 1
+
+        # parse outside the lock; a racing thread may parse the same PEM once more, harmless
+        key = RSA.import_key(pem)
+
+        with self._lock:
+            self._keys[digest] = key
+            self._keys.move_to_end(digest)
+            while len(self._keys) > self._max_entries:
+                self._keys.popitem(last=False)
+                self._stats["evictions"] += 1
+        return key
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._keys)
+            stats["max_entries"] = self._max_entries
+            return stats
+
+
+RSA_KEY_CACHE = RsaKeyCache()
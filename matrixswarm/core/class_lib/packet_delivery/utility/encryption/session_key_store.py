@@ -0,0 +1,133 @@
+import time
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from Crypto.Cipher import PKCS1_OAEP
+from Crypto.Random import get_random_bytes
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.rsa_key_cache import RSA_KEY_CACHE
+
+class SessionKeyStore:
+    """Per-peer AES session keys, so steady-state traffic skips RSA-OAEP.
+
+    Sender side: the first packet to a peer pubkey creates a random AES key
+    and wraps it once with RSA-OAEP. Every packet of that session reuses the
+    key and carries the same session_id and wrapped key. A session rotates
+    after max_packets packets or max_age seconds. Sessions are keyed by the
+    peer's pubkey, so a reissued identity always starts a fresh session.
+
+    Receiver side: the unwrapped key is remembered per (own privkey,
+    session_id). Later packets of the session skip the RSA private-key
+    operation. The wrapped key still rides along with every packet, so a
+    receiver that restarted, or lost the first packet of a session, just
+    unwraps it again.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SessionKeyStore, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._outgoing = {}              # peer pubkey digest -> session dict
+            cls._instance._incoming = OrderedDict()   # (privkey digest, session_id) -> (wrapped digest, aes key b64, last seen)
+            cls._instance._max_packets = 10000
+            cls._instance._max_age = 3600
+            cls._instance._max_incoming = 4096
+            cls._instance._stats = {"sessions": 0, "rotations": 0, "reused": 0, "unwrapped": 0, "resumed": 0, "dropped": 0}
+
+        return cls._instance
+
+    @staticmethod
+    def _digest(value) -> str:
+        if isinstance(value, str):
+            value = value.encode()
+        return hashlib.sha256(value).hexdigest()
+
+    def set_rotation(self, max_packets: int = None, max_age: int = None):
+        with self._lock:
+            if max_packets is not None:
+                self._max_packets = max(1, int(max_packets))
+            if max_age is not None:
+                self._max_age = max(1, int(max_age))
+        return self
+
+    def set_max_incoming(self, max_incoming: int):
+        with self._lock:
+            self._max_incoming = max(1, int(max_incoming))
+            while len(self._incoming) > self._max_incoming:
+                self._incoming.popitem(last=False)
+        return self
+
+    def get_outgoing(self, peer_pubkey: str) -> dict:
+        """Returns the current session for a peer: {"session_id", "aes_key" (bytes), "encrypted_aes_key" (b64)}."""
+        peer = self._digest(peer_pubkey)
+        now = time.time()
+        with self._lock:
+            session = self._outgoing.get(peer)
+            if session and session["count"] < self._max_packets and (now - session["created"]) < self._max_age:
+                session["count"] += 1
+                self._stats["reused"] += 1
+                return session
+            rotating = session is not None
+
+        # new session, wrap outside the lock
+        aes_key = get_random_bytes(32)
+        wrapped = PKCS1_OAEP.new(RSA_KEY_CACHE.import_key(peer_pubkey)).encrypt(aes_key)
+        session = {
+            "session_id": base64.urlsafe_b64encode(get_random_bytes(12)).decode(),
+            "aes_key": aes_key,
+            "encrypted_aes_key": base64.b64encode(wrapped).decode(),
+            "created": now,
+            "count": 1,
+        }
+        with self._lock:
+            self._outgoing[peer] = session
+            self._stats["rotations" if rotating else "sessions"] += 1
+        return session
+
+    def drop_peer(self, peer_pubkey: str):
+        """Forgets the outgoing session for a peer pubkey, e.g. when the peer's identity changes."""
+        with self._lock:
+            if self._outgoing.pop(self._digest(peer_pubkey), None):
+                self._stats["dropped"] += 1
+
+    def unwrap(self, session_id: str, encrypted_aes_key, privkey_pem: str, unwrap_fn) -> str:
+        """Returns the base64 AES key of a session, calling unwrap_fn(encrypted_aes_key, privkey_pem) only on a miss."""
+        slot = (self._digest(privkey_pem), str(session_id))
+        #binary frames carry the wrapped key as raw bytes, json as base64; digest the same bytes either way
+        wrapped = self._digest(encrypted_aes_key if isinstance(encrypted_aes_key, bytes) else base64.b64decode(encrypted_aes_key))
+        now = time.time()
+        with self._lock:
+            entry = self._incoming.get(slot)
+            if entry and entry[0] == wrapped and (now - entry[2]) < self._max_age:
+                self._incoming[slot] = (entry[0], entry[1], now)
+                self._incoming.move_to_end(slot)
+                self._stats["resumed"] += 1
+                return entry[1]
+
+        # only cache after the RSA unwrap succeeded
+        aes_key_b64 = unwrap_fn(encrypted_aes_key, privkey_pem)
+        with self._lock:
+            self._incoming[slot] = (wrapped, aes_key_b64, now)
+            self._incoming.move_to_end(slot)
+            self._stats["unwrapped"] += 1
+            while len(self._incoming) > self._max_incoming:
+                self._incoming.popitem(last=False)
+        return aes_key_b64
+
+    def clear(self):
+        with self._lock:
+            self._outgoing.clear()
+            self._incoming.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["outgoing"] = len(self._outgoing)
+            stats["incoming"] = len(self._incoming)
+            stats["max_packets"] = self._max_packets
+            stats["max_age"] = self._max_age
+            return stats
+
+
+SESSION_KEY_STORE = SessionKeyStore()
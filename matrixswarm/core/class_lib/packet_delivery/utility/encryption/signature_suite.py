@@ -0,0 +1,146 @@
+import base64
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from Crypto.PublicKey import RSA
+from Crypto.Signature import pkcs1_15
+from Crypto.Hash import SHA256
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.rsa_key_cache import RSA_KEY_CACHE
+
+# an identity token names the suite its owner signs packets with:
+#   rsa (default, field absent):  sender signature checked with identity["pub"]
+#   ed25519:                      identity["sig_suite"] = "ed25519", checked with identity["sig_pub"]
+# the RSA keypair stays in every identity either way; it wraps the AES keys (RSA-OAEP), which Ed25519 can't.
+# sig_suite and sig_pub sit inside the token Matrix signs, so a sender can't be downgraded to another suite.
+SUITE_RSA = "rsa-pkcs1v15-sha256"
+SUITE_ED25519 = "ed25519"
+SUITE_FIELD = "sig_suite"
+SUITE_PUB_FIELD = "sig_pub"
+VAULT_SUITE_PRIV_FIELD = "sig_priv"
+
+class SignatureSuite(ABC):
+    """Keygen, sign and verify of one signature algorithm. Keys are PEM strings."""
+    name = None
+
+    @abstractmethod
+    def generate_keypair(self) -> tuple:
+        """(priv pem, pub pem)"""
+        pass
+
+    @abstractmethod
+    def public_from_private(self, priv_pem) -> str:
+        pass
+
+    @abstractmethod
+    def sign(self, priv, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def verify(self, pub, data: bytes, signature: bytes) -> bool:
+        """True if valid; raises on a bad signature or key."""
+        pass
+
+    def sign_b64(self, priv, data: bytes) -> str:
+        return base64.b64encode(self.sign(priv, data)).decode()
+
+    def verify_b64(self, pub, data: bytes, signature_b64: str) -> bool:
+        return self.verify(pub, data, base64.b64decode(signature_b64))
+
+class RsaPkcs1Suite(SignatureSuite):
+    """RSA PKCS#1 v1.5 over SHA256, the swarm's original signatures. Accepts PEM or parsed RsaKey."""
+    name = SUITE_RSA
+
+    def __init__(self, bits: int = 2048):
+        self.bits = bits
+
+    @staticmethod
+    def _key(key):
+        return key if isinstance(key, RSA.RsaKey) else RSA_KEY_CACHE.import_key(key)
+
+    def generate_keypair(self) -> tuple:
+        key = RSA.generate(self.bits)
+        return key.export_key().decode(), key.publickey().export_key().decode()
+
+    def public_from_private(self, priv_pem) -> str:
+        return self._key(priv_pem).publickey().export_key().decode()
+
+    def sign(self, priv, data: bytes) -> bytes:
+        return pkcs1_15.new(self._key(priv)).sign(SHA256.new(data))
+
+    def verify(self, pub, data: bytes, signature: bytes) -> bool:
+        pkcs1_15.new(self._key(pub)).verify(SHA256.new(data), signature)
+        return True
+
+@lru_cache(maxsize=256)
+def _load_ed25519_private(pem: bytes):
+    key = serialization.load_pem_private_key(pem, password=None)
+    if not isinstance(key, ed25519.Ed25519PrivateKey):
+        raise ValueError("Not an Ed25519 private key.")
+    return key
+
+@lru_cache(maxsize=256)
+def _load_ed25519_public(pem: bytes):
+    key = serialization.load_pem_public_key(pem)
+    if not isinstance(key, ed25519.Ed25519PublicKey):
+        raise ValueError("Not an Ed25519 public key.")
+    return key
+
+def _pem_bytes(pem) -> bytes:
+    if isinstance(pem, str):
+        pem = pem.encode()
+    if not pem:
+        raise ValueError("Empty Ed25519 key.")
+    return pem.strip()
+
+class Ed25519Suite(SignatureSuite):
+    """Ed25519 (RFC 8032) over the raw payload bytes; PKCS8 / SubjectPublicKeyInfo PEMs."""
+    name = SUITE_ED25519
+
+    def generate_keypair(self) -> tuple:
+        key = ed25519.Ed25519PrivateKey.generate()
+        priv_pem = key.private_bytes(encoding=serialization.Encoding.PEM,
+                                     format=serialization.PrivateFormat.PKCS8,
+                                     encryption_algorithm=serialization.NoEncryption()).decode()
+        return priv_pem, self._export_public(key.public_key())
+
+    @staticmethod
+    def _export_public(pub) -> str:
+        return pub.public_bytes(encoding=serialization.Encoding.PEM,
+                                format=serialization.PublicFormat.SubjectPublicKeyInfo).decode()
+
+    def public_from_private(self, priv_pem) -> str:
+        return self._export_public(_load_ed25519_private(_pem_bytes(priv_pem)).public_key())
+
+    def sign(self, priv, data: bytes) -> bytes:
+        return _load_ed25519_private(_pem_bytes(priv)).sign(data)
+
+    def verify(self, pub, data: bytes, signature: bytes) -> bool:
+        _load_ed25519_public(_pem_bytes(pub)).verify(signature, data)
+        return True
+
+SUITES = {
+    SUITE_RSA: RsaPkcs1Suite(),
+    SUITE_ED25519: Ed25519Suite(),
+}
+# short names accepted in directives
+_ALIASES = {"rsa": SUITE_RSA, "rsa2048": SUITE_RSA, "pkcs1": SUITE_RSA}
+
+def normalize_suite(name) -> str:
+    """Canonical suite name; None or empty is RSA. Raises ValueError for an unknown suite."""
+    if not name:
+        return SUITE_RSA
+    name = _ALIASES.get(str(name).strip().lower(), str(name).strip().lower())
+    if name not in SUITES:
+        raise ValueError(f"Unknown signature suite '{name}', expected one of {sorted(SUITES)}")
+    return name
+
+def get_suite(name=None) -> SignatureSuite:
+    return SUITES[normalize_suite(name)]
+
+def identity_signer(identity: dict) -> tuple:
+    """(suite, pubkey pem) that verify the packets of the identity's owner."""
+    suite = normalize_suite(identity.get(SUITE_FIELD))
+    if suite == SUITE_RSA:
+        return SUITES[suite], identity.get("pub")
+    return SUITES[suite], identity.get(SUITE_PUB_FIELD)
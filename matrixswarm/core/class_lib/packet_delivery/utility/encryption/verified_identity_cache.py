@@ -0,0 +1,101 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class VerifiedIdentityCache:
+    """Remembers which (identity, Matrix signature) pairs have already been verified.
+
+    Every packet carries the sender's identity token plus Matrix's signature
+    over it, and that pair is the same for every packet the sender emits until
+    its keys rotate. Entries are keyed by a digest of the identity bytes, the
+    signature and the verifying pubkey, so a re-signed identity or a new Matrix
+    key never hits a stale entry. Only successful verifications are stored.
+
+    The cache lives in each receiving process and nothing invalidates it from
+    outside; none is needed, since an identity Matrix re-issues has different
+    bytes and a different signature and simply misses.
+
+    Each sender holds a single slot: verifying a new identity for a
+    universal_id evicts the previous one.
+    """
+    _instance = None
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(VerifiedIdentityCache, cls).__new__(cls)
+
+            cls._instance._lock = threading.Lock()
+            cls._instance._entries = OrderedDict()   # digest -> universal_id
+            cls._instance._by_uid = {}               # universal_id -> digest
+            cls._instance._max_entries = 1024
+            cls._instance._enabled = True
+            cls._instance._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+        return cls._instance
+
+    @staticmethod
+    def make_key(identity_bytes: bytes, sig: str, verifier_pubkey: str) -> str:
+        h = hashlib.sha256()
+        h.update(identity_bytes)
+        h.update(b"\x00")
+        h.update(str(sig).encode())
+        h.update(b"\x00")
+        h.update(str(verifier_pubkey).encode())
+        return h.hexdigest()
+
+    def set_max_entries(self, max_entries: int):
+        with self._lock:
+            self._max_entries = max(1, int(max_entries))
+            self._trim()
+
+    def set_enabled(self, enabled: bool = True):
+        self._enabled = bool(enabled)
+        if not self._enabled:
+            self.clear()
+
+    def is_verified(self, key: str) -> bool:
+        if not self._enabled:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True
+            self._stats["misses"] += 1
+            return False
+
+    def add(self, key: str, universal_id: str = None):
+        if not self._enabled:
+            return
+        with self._lock:
+            if universal_id:
+                old = self._by_uid.get(universal_id)
+                if old and old != key:
+                    self._entries.pop(old, None)
+                self._by_uid[universal_id] = key
+            self._entries[key] = universal_id
+            self._entries.move_to_end(key)
+            self._trim()
+
+    def _trim(self):
+        # caller holds self._lock
+        while len(self._entries) > self._max_entries:
+            key, uid = self._entries.popitem(last=False)
+            if uid and self._by_uid.get(uid) == key:
+                del self._by_uid[uid]
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._by_uid.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self._max_entries
+            return stats
+
+
+VERIFIED_IDENTITY_CACHE = VerifiedIdentityCache()
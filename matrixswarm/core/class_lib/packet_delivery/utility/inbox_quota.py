@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+import tempfile
+
+# inbox overflow policies, set per agent in the tree node:
+#   "config": {"inbox": {"max_packets": 5000, "policy": "coalesce", "coalesce_key": ["handler", "content.source"]}}
+POLICY_REJECT = "reject"            # senders stop delivering until the inbox drains
+POLICY_DROP_OLDEST = "drop_oldest"  # senders keep delivering, the listener deletes the oldest excess unread
+POLICY_COALESCE = "coalesce"        # senders overwrite their own pending packet with the same key (coalesce_key required)
+INBOX_POLICIES = (POLICY_REJECT, POLICY_DROP_OLDEST, POLICY_COALESCE)
+
+# queue-depth gauge, written by the listener into comm/<uid>/hello.moto
+GAUGE_FILE = "inbox.gauge"
+
+# PassResult.reason when a reject inbox is full
+TARGET_SATURATED = "target saturated"
+
+# control lane packets (see priority_lanes) bypass the quota: a full inbox never refuses or coalesces them
+
+class InboxQuota:
+    """Inbox limit of one agent, parsed from config.inbox of its tree node."""
+    __slots__ = ("max_packets", "policy", "coalesce_key")
+
+    def __init__(self, max_packets: int, policy: str = POLICY_REJECT, coalesce_key=None):
+        if policy not in INBOX_POLICIES:
+            raise ValueError(f"Unknown inbox policy '{policy}', expected one of {INBOX_POLICIES}")
+        if isinstance(coalesce_key, str):
+            coalesce_key = [coalesce_key]
+        if policy == POLICY_COALESCE and not coalesce_key:
+            #a handler-only key would let a second command overwrite the first
+            raise ValueError("Inbox policy 'coalesce' needs a coalesce_key, e.g. [\"handler\", \"content.source\"]")
+        self.max_packets = max(1, int(max_packets))
+        self.policy = policy
+        self.coalesce_key = list(coalesce_key) if coalesce_key else None
+
+    @classmethod
+    def from_config(cls, config):
+        """Returns an InboxQuota, or None when the node sets no max_packets."""
+        if not isinstance(config, dict) or not config.get("max_packets"):
+            return None
+        return cls(config["max_packets"], config.get("policy", POLICY_REJECT), config.get("coalesce_key"))
+
+    def to_gauge(self) -> dict:
+        return {"max_packets": self.max_packets, "policy": self.policy, "coalesce_key": self.coalesce_key}
+
+def coalesce_name(sender_uid: str, packet: dict, coalesce_key, prefix: str = "pk") -> str:
+    """Filename a sender reuses for every packet with the same key, so only the newest one waits.
+
+    coalesce_key lists packet fields; dotted names reach into nested dicts
+    (e.g. "content.source"). Raises ValueError without one. prefix is the
+    packet's lane prefix (see priority_lanes), kept so the lane survives.
+    """
+    if not coalesce_key:
+        raise ValueError("No coalesce_key to coalesce on.")
+    parts = [str(sender_uid)]
+    for field in coalesce_key:
+        value = packet
+        for step in str(field).split("."):
+            value = value.get(step) if isinstance(value, dict) else None
+        parts.append(json.dumps(value, sort_keys=True, default=str))
+    return f"{prefix}_co_" + hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:24]
+
+def write_gauge(hello_path: str, gauge: dict):
+    """Atomically replaces the inbox gauge in a hello.moto directory."""
+    os.makedirs(hello_path, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", delete=False, dir=hello_path, suffix=".tmp", encoding="utf-8") as f:
+        json.dump(gauge, f)
+        temp_path = f.name
+    os.replace(temp_path, os.path.join(hello_path, GAUGE_FILE))
+
+def read_gauge(hello_path: str) -> dict:
+    """Returns the inbox gauge in a hello.moto directory, or None if there is none."""
+    try:
+        with open(os.path.join(hello_path, GAUGE_FILE), "r", encoding="utf-8") as f:
+            gauge = json.load(f)
+        return gauge if isinstance(gauge, dict) else None
+    except (OSError, ValueError):
+        return None
+
+class PassResult:
+    """Outcome of pass_packet(). Truthy when the packet was written, so `if self.pass_packet(...)` keeps working.
+
+    saturated is True when the target's inbox was at or over its quota; a
+    producer seeing it should slow down. reason is "target saturated" when
+    the target rejected the packet.
+    """
+    __slots__ = ("delivered", "saturated", "reason", "depth", "max_packets", "policy")
+
+    def __init__(self, delivered: bool, saturated: bool = False, reason: str = None, depth: int = None,
+                 max_packets: int = None, policy: str = None):
+        self.delivered = delivered
+        self.saturated = saturated
+        self.reason = reason
+        self.depth = depth
+        self.max_packets = max_packets
+        self.policy = policy
+
+    def __bool__(self):
+        return self.delivered
+
+    def __repr__(self):
+        return (f"PassResult(delivered={self.delivered}, saturated={self.saturated}, reason={self.reason!r}, "
+                f"depth={self.depth}, max_packets={self.max_packets})")
@@ -0,0 +1,68 @@
+import json
+import base64
+import struct
+
+# binary packet frame:
+#   magic(4) | version(1) | header length(4, big-endian) | compact json header | raw sections
+# the header holds every scalar field of the envelope plus "_bin": [[field, length], ...]
+# describing the raw sections that follow, in order. base64 fields of an encrypted_blob
+# (nonce, tag, ciphertext, wrapped key) travel as raw bytes. decode_frame hands them back
+# as bytes, which PacketCryptoMixin takes as-is; pass raw_bytes=False to get base64 text.
+MAGIC = b"MSWP"
+VERSION = 1
+FRAME_HEADER = struct.Struct(">4sBI")
+BINARY_FIELDS = ("nonce", "tag", "payload", "encrypted_aes_key")
+
+FRAMING_JSON = "json"
+FRAMING_BINARY = "binary"
+
+def is_binary_frame(raw: bytes) -> bool:
+    return raw[:len(MAGIC)] == MAGIC
+
+def encode_frame(data: dict) -> bytes:
+    header = {}
+    sections = []
+    layout = []
+    raw_fields = data.get("encoding") == "base64"
+    for k, v in data.items():
+        if raw_fields and k in BINARY_FIELDS and isinstance(v, str):
+            blob = base64.b64decode(v)
+            layout.append([k, len(blob)])
+            sections.append(blob)
+        else:
+            header[k] = v
+    header["_bin"] = layout
+
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return FRAME_HEADER.pack(MAGIC, VERSION, len(head)) + head + b"".join(sections)
+
+def decode_frame(raw: bytes, raw_bytes: bool = True) -> dict:
+    magic, version, head_len = FRAME_HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise ValueError("Not a binary packet frame.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported packet frame version: {version}")
+
+    offset = FRAME_HEADER.size
+    data = json.loads(raw[offset:offset + head_len].decode())
+    offset += head_len
+
+    for k, length in data.pop("_bin", []):
+        if offset + length > len(raw):
+            raise ValueError("Truncated packet frame.")
+        section = raw[offset:offset + length]
+        data[k] = section if raw_bytes else base64.b64encode(section).decode()
+        offset += length
+    return data
+
+def dumps_packet(data: dict, framing: str = FRAMING_JSON, indent=2) -> bytes:
+    """Serializes a delivery envelope for the wire or the drop zone."""
+    if framing == FRAMING_BINARY:
+        return encode_frame(data)
+    return json.dumps(data, indent=indent).encode()
+
+def loads_packet(raw: bytes) -> dict:
+    """Parses a delivery envelope, auto-detecting binary frames and json."""
+    if is_binary_frame(raw):
+        return decode_frame(raw)
+    return json.loads(raw)
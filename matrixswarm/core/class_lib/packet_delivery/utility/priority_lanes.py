@@ -0,0 +1,81 @@
+import time
+
+# priority lanes of a file drop zone. The lane rides in the filename prefix
+# (prefix_timestamp_uuid.json): the listener reads lane by lane, oldest first
+# within a lane, and a control packet arriving mid-batch preempts the lower
+# lanes. Unknown prefixes (older senders, other tools) read as normal.
+LANE_CONTROL = "control"
+LANE_NORMAL = "normal"
+LANE_BULK = "bulk"
+LANES = (LANE_CONTROL, LANE_NORMAL, LANE_BULK)
+
+LANE_PREFIX = {LANE_CONTROL: "p0", LANE_NORMAL: "pk", LANE_BULK: "p9"}
+_PREFIX_LANE = {v: k for k, v in LANE_PREFIX.items()}
+_LANE_RANK = {lane: rank for rank, lane in enumerate(LANES)}
+
+# aliases accepted by set_priority() and the directive
+_ALIASES = {"high": LANE_CONTROL, "low": LANE_BULK}
+
+# handlers that steer the swarm; always sent on the control lane and run on the listener thread
+CONTROL_HANDLERS = frozenset({
+    "cmd_deliver_agent_tree_to_child",
+    "cmd_deliver_agent_tree",
+    "cmd_hotswap_agent",
+    "cmd_update_agent",
+    "cmd_delete_agent",
+    "cmd_shutdown_subtree",
+    "cmd_resume_subtree",
+})
+
+def normalize_lane(priority) -> str:
+    """Maps a priority name to a lane, None when it isn't one."""
+    if priority is None:
+        return None
+    lane = _ALIASES.get(str(priority).lower(), str(priority).lower())
+    return lane if lane in _LANE_RANK else None
+
+def lane_of(filename: str) -> str:
+    return _PREFIX_LANE.get(filename.split("_", 1)[0], LANE_NORMAL)
+
+def lane_rank(lane: str) -> int:
+    return _LANE_RANK.get(lane, _LANE_RANK[LANE_NORMAL])
+
+class LaneMetrics:
+    """Queue-wait and preemption stats per lane, for the listener of one drop zone."""
+    def __init__(self):
+        self._stats = {lane: {"dispatched": 0, "wait_total": 0.0, "wait_max": 0.0, "preempted": 0} for lane in LANES}
+
+    def record_dispatch(self, lane: str, queued_at: float):
+        s = self._stats.get(lane)
+        if s is None:
+            return
+        wait = max(0.0, time.time() - queued_at) if queued_at else 0.0
+        s["dispatched"] += 1
+        s["wait_total"] += wait
+        if wait > s["wait_max"]:
+            s["wait_max"] = wait
+
+    def record_preempt(self, lane: str):
+        if lane in self._stats:
+            self._stats[lane]["preempted"] += 1
+
+    def get_metrics(self, lanes: dict = None) -> dict:
+        """Per-lane metrics; lanes is {lane: (depth, oldest mtime)} from the reception agent's scan stats."""
+        now = time.time()
+        metrics = {}
+        for lane in LANES:
+            s = self._stats[lane]
+            depth, oldest = (lanes or {}).get(lane, (0, None))
+            metrics[lane] = {
+                "depth": depth,
+                "oldest_age_s": round(now - oldest, 3) if depth and oldest else 0.0,
+                "dispatched": s["dispatched"],
+                "wait_avg_ms": round(s["wait_total"] / s["dispatched"] * 1000, 3) if s["dispatched"] else 0.0,
+                "wait_max_ms": round(s["wait_max"] * 1000, 3),
+                "preempted": s["preempted"],
+            }
+        return metrics
+
+    def reset_stats(self):
+        for s in self._stats.values():
+            s.update({"dispatched": 0, "wait_total": 0.0, "wait_max": 0.0, "preempted": 0})
@@ -0,0 +1,45 @@
+import os
+import json
+import struct
+import socket
+from matrixswarm.core.class_lib.packet_delivery.utility.packet_frame import encode_frame, loads_packet, FRAMING_BINARY
+
+# 4-byte big-endian length prefix followed by the compact json body or a binary packet frame
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+ACK_QUEUED = b"\x01"
+ACK_REJECTED = b"\x00"
+
+def socket_path(location: str, universal_id: str, drop_zone: str = "incoming") -> str:
+    """Path of the unix socket an agent listens on for a given drop zone, e.g. comm/<uid>/incoming.sock"""
+    return os.path.join(location, universal_id, f"{drop_zone or 'incoming'}.sock")
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = conn.recv(size - len(buf))
+        if not chunk:
+            return b""
+        buf.extend(chunk)
+    return bytes(buf)
+
+def send_frame(conn: socket.socket, data: dict, framing: str = "json"):
+    if framing == FRAMING_BINARY:
+        body = encode_frame(data)
+    else:
+        body = json.dumps(data, separators=(",", ":")).encode()
+    conn.sendall(FRAME_HEADER.pack(len(body)) + body)
+
+def recv_frame(conn: socket.socket):
+    """Reads one frame. Returns the decoded dict, or None on a clean EOF."""
+    header = _recv_exact(conn, FRAME_HEADER.size)
+    if not header:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame too large: {size} bytes")
+    body = _recv_exact(conn, size)
+    if len(body) != size:
+        raise ConnectionError("Connection closed mid-frame.")
+    return loads_packet(body)
@@ -0,0 +1,147 @@
+#Authored by Daniel F MacDonald and ChatGPT aka The Generals
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from matrixswarm.core.mixin.log_method import LogMixin
+
+def dispatch_policy(max_concurrency: int = 1, ordering_key=None):
+    """Marks a packet handler to run on the agent's dispatch pool instead of the listener thread.
+
+    Args:
+        max_concurrency (int): How many packets for this handler may run at once.
+        ordering_key (str|callable, optional): Either the name of a content field
+            or a callable(content, packet) returning a key. Packets of this handler
+            sharing a key run one at a time, in arrival order; other handlers'
+            packets with the same value are not held back.
+
+    Example:
+        @dispatch_policy(max_concurrency=4, ordering_key="target_universal_id")
+        def cmd_msg_prompt(self, content, packet, identity=None):
+    """
+    def wrap(fn):
+        fn._dispatch_policy = {"max_concurrency": max_concurrency, "ordering_key": ordering_key}
+        return fn
+    return wrap
+
+class HandlerDispatchPool(LogMixin):
+    """Runs packet handlers on a shared worker pool with per-handler limits.
+
+    Jobs are held in arrival order and only handed to the executor when the
+    handler is under its concurrency cap and no job with the same ordering key
+    is running, so the executor never holds a job that would have to wait on a
+    lock. Wait time is measured from submit() to the moment a worker starts
+    the handler.
+    """
+    def __init__(self, workers: int = 4, name: str = "dispatch"):
+        self.workers = max(1, int(workers))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._running_total = 0
+        self._running = {}
+        self._busy_keys = set()
+        self._limits = {}
+        self._metrics = {}
+        self._closed = False
+
+    def set_limit(self, handler_name: str, max_concurrency: int):
+        with self._lock:
+            self._limits[handler_name] = max(1, int(max_concurrency))
+        return self
+
+    def _metric(self, handler_name):
+        m = self._metrics.get(handler_name)
+        if m is None:
+            m = {"queued": 0, "running": 0, "completed": 0, "failed": 0, "wait_total": 0.0, "wait_max": 0.0}
+            self._metrics[handler_name] = m
+        return m
+
+    def submit(self, handler_name: str, fn, args: tuple = (), key=None):
+        """Queues fn(*args). Returns False if the pool has been shut down."""
+        #ordering is per handler, the same value under two handlers is two keys
+        if key is not None:
+            key = (handler_name, key)
+        with self._lock:
+            if self._closed:
+                return False
+            self._pending.append((handler_name, fn, args, key, time.time()))
+            self._metric(handler_name)["queued"] += 1
+            self._pump()
+        return True
+
+    def _pump(self):
+        # caller holds self._lock
+        blocked_keys = set()
+        for job in list(self._pending):
+            if self._running_total >= self.workers:
+                break
+            handler_name, fn, args, key, queued_at = job
+            if key is not None and (key in self._busy_keys or key in blocked_keys):
+                # keep later packets with the same key behind this one
+                blocked_keys.add(key)
+                continue
+            if self._running.get(handler_name, 0) >= self._limits.get(handler_name, self.workers):
+                if key is not None:
+                    blocked_keys.add(key)
+                continue
+
+            self._pending.remove(job)
+            self._running[handler_name] = self._running.get(handler_name, 0) + 1
+            self._running_total += 1
+            if key is not None:
+                self._busy_keys.add(key)
+            m = self._metric(handler_name)
+            m["queued"] -= 1
+            m["running"] += 1
+            self._executor.submit(self._run, job)
+
+    def _run(self, job):
+        handler_name, fn, args, key, queued_at = job
+        wait = time.time() - queued_at
+        failed = False
+        try:
+            fn(*args)
+        except Exception as e:
+            failed = True
+            self.log(f"Handler '{handler_name}' failed", error=e, block="DISPATCH")
+        finally:
+            with self._lock:
+                self._running[handler_name] -= 1
+                self._running_total -= 1
+                if key is not None:
+                    self._busy_keys.discard(key)
+                m = self._metric(handler_name)
+                m["running"] -= 1
+                m["failed" if failed else "completed"] += 1
+                m["wait_total"] += wait
+                if wait > m["wait_max"]:
+                    m["wait_max"] = wait
+                if not self._closed:
+                    self._pump()
+
+    def get_metrics(self) -> dict:
+        """Per-handler queue depth, in-flight count and wait times."""
+        with self._lock:
+            out = {}
+            for handler_name, m in self._metrics.items():
+                done = m["completed"] + m["failed"]
+                out[handler_name] = {
+                    "queue_depth": m["queued"],
+                    "running": m["running"],
+                    "completed": m["completed"],
+                    "failed": m["failed"],
+                    "limit": self._limits.get(handler_name, self.workers),
+                    "wait_avg_ms": round((m["wait_total"] / done) * 1000, 3) if done else 0.0,
+                    "wait_max_ms": round(m["wait_max"] * 1000, 3),
+                }
+            return out
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            self._closed = True
+            dropped = len(self._pending)
+            self._pending.clear()
+        if dropped:
+            self.log(f"Dropped {dropped} queued handler call(s) on shutdown.", block="DISPATCH")
+        self._executor.shutdown(wait=wait)
@@ -2,17 +2,21 @@
 #Gemini, docstring and code enhancements.
 import time
 import tempfile
-import base64
 import os
 import copy
 import json
 import hashlib
-from matrixswarm.core.utils.crypto_utils import generate_aes_key
+from concurrent.futures import ProcessPoolExecutor
 from matrixswarm.core.mixin.log_method import LogMixin
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import SUITE_RSA, SUITE_FIELD, \
+    SUITE_PUB_FIELD, VAULT_SUITE_PRIV_FIELD, normalize_suite, get_suite
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.identity_key_pool import IDENTITY_KEY_POOL, \
+    generate_identity_keys, key_pool_context
 
 from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
+
+# below this many identities a process pool costs more to start than it saves
+IDENTITY_POOL_MIN_NODES = 4
 
 class TreeParser(LogMixin):
     """Manages the agent directive, acting as the swarm's architect.
@@ -24,6 +28,7 @@ class TreeParser(LogMixin):
     """
     CHILDREN_KEY = "children"
     UNIVERSAL_ID_KEY = "universal_id"
+    SIGNATURE_SUITE_KEY = "signature_suite"
 
     def __init__(self, root, tree_path=None):
         """Initializes the TreeParser with a root node of an agent tree.
@@ -222,10 +227,7 @@ class TreeParser(LogMixin):
         parent_node.setdefault(self.CHILDREN_KEY, []).append(new_node)
 
         if matrix_priv_obj:
-            for node in self.walk_tree(new_node):
-                uid = node.get(self.UNIVERSAL_ID_KEY)
-                if uid:
-                    self.assign_identity_token_to_node(uid, matrix_priv_obj, encryption_enabled=True, force=True)
+            self.assign_identities(self.walk_tree(new_node), matrix_priv_obj, encryption_enabled=True, force=True)
 
         return list(self._added_nodes)
 
@@ -689,29 +691,205 @@ class TreeParser(LogMixin):
         recurse(self.root, [])
         return service_nodes
 
-    def assign_identity_to_all_nodes(self, matrix_priv_obj, encryption_enabled=True, force=False):
+    def get_signature_suite(self, node=None):
+        """
+        Returns the signature suite an agent signs its packets with.
+
+        A node's own `signature_suite` wins over the swarm-wide one set on the
+        root of the directive, so a swarm can be migrated agent by agent.
+        Unset means RSA PKCS#1 v1.5, the original scheme.
+        """
+        if node and node.get(self.SIGNATURE_SUITE_KEY):
+            return normalize_suite(node.get(self.SIGNATURE_SUITE_KEY))
+        return normalize_suite(self.root.get(self.SIGNATURE_SUITE_KEY) if isinstance(self.root, dict) else None)
+
+    def assign_identity_to_all_nodes(self, matrix_priv_obj, encryption_enabled=True, force=False, signature_suite=None,
+                                     workers=None, progress=None):
         """
         Iterates through all nodes and assigns a signed identity token.
 
         This method orchestrates the creation of the swarm's chain of trust.
-        It calls `assign_identity_token_to_node` for every agent in the tree,
+        Every agent in the tree gets its identity through `assign_identities`,
         which is the foundation of secure communication within the swarm.
+        signature_suite overrides the suite the directive selects.
         """
+        return self.assign_identities(self.walk_tree(self.root), matrix_priv_obj, encryption_enabled, force=force,
+                                      signature_suite=signature_suite, workers=workers, progress=progress)
 
-        for node in self.walk_tree(self.root):
-            uid = node.get("universal_id")
-            if uid:
-                self.assign_identity_token_to_node(uid, matrix_priv_obj, encryption_enabled, force=force)
+    def assign_identities(self, nodes, matrix_priv_obj, encryption_enabled=True, force=False, signature_suite=None,
+                          workers=None, progress=None):
+        """
+        Assigns signed identity tokens to a batch of nodes.
 
-    def assign_identity_token_to_node(self, uid, matrix_priv_obj, encryption_enabled=True, force=False, replace_keys:dict={}):
+        The tree is walked once by the caller and nodes are handled directly,
+        so no per-node lookup is made. Keypairs, the expensive part, are
+        generated across a process pool; Matrix then signs every token in one
+        pass in this process, its private key never leaves it. Small batches
+        and platforms without a usable pool fall back to generating in
+        process.
+
+        Args:
+            nodes (list): Node dicts of this tree.
+            matrix_priv_obj: Matrix's RSA key, or its PEM as str/bytes.
+            force (bool): Replace existing vaults.
+            signature_suite (str, optional): Overrides the suite the directive selects.
+            workers (int, optional): Pool size, defaults to the usable cores.
+            progress (callable, optional): progress(stage, done, total), stage is
+                "keygen" or "sign". Without it, progress is printed every 10%.
+
+        Returns:
+            dict: assigned, skipped, workers and keygen_sec/sign_sec timings.
+        """
+        matrix_priv_obj = self._matrix_key(matrix_priv_obj)
+
+        todo = []
+        skipped = 0
+        for node in nodes:
+            uid = node.get(self.UNIVERSAL_ID_KEY)
+            if not uid:
+                continue
+            if "vault" in node and not force:
+                skipped += 1
+                continue
+            suite = normalize_suite(signature_suite) if signature_suite else self.get_signature_suite(node)
+            todo.append((uid, node, suite))
+
+        stats = {"assigned": 0, "skipped": skipped, "workers": 1, "keygen_sec": 0.0, "sign_sec": 0.0}
+        if skipped:
+            print(f"[ASSIGN-ID] ⏭️ {skipped} node(s) already have a vault, skipping (use force=True to overwrite)")
+        if not todo:
+            return stats
+
+        report = progress or self._print_progress(len(todo))
+
+        t0 = time.perf_counter()
+        keys, stats["workers"] = self._generate_identity_keys([suite for _, _, suite in todo], workers, report)
+        stats["keygen_sec"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for done, ((uid, node, suite), node_keys) in enumerate(zip(todo, keys), 1):
+            try:
+                self._store_identity(node, uid, matrix_priv_obj, node_keys, suite)
+            except Exception as e:
+                raise RuntimeError(f"[GOSPEL-KEY] Failed to assign identity token for '{uid}': {e}")
+            report("sign", done, len(todo))
+        stats["sign_sec"] = time.perf_counter() - t0
+        stats["assigned"] = len(todo)
+
+        print(f"[ASSIGN-ID] ✅ {len(todo)} identity token(s) assigned in {stats['keygen_sec'] + stats['sign_sec']:.2f}s "
+              f"(keygen {stats['keygen_sec']:.2f}s on {stats['workers']} worker(s), sign {stats['sign_sec']:.2f}s)")
+        return stats
+
+    @staticmethod
+    def _print_progress(total):
+        """Default progress reporter: a keygen line every 10%, only for batches worth watching; signing is quick."""
+        step = max(1, total // 10)
+        started = time.perf_counter()
+
+        def report(stage, done, total_):
+            if stage == "keygen" and total_ >= 50 and (done % step == 0 or done == total_):
+                print(f"[ASSIGN-ID] ⏳ {stage} {done}/{total_} ({done * 100 // total_}%) "
+                      f"{time.perf_counter() - started:.1f}s")
+        return report
+
+    @staticmethod
+    def _generate_identity_keys(suites, workers=None, progress=None):
+        """Keys for one identity per entry of suites, in order. Returns (keys, workers used).
+
+        Keys pre-generated by Matrix's IDENTITY_KEY_POOL are used first; only
+        the shortfall is generated here.
+        """
+        keys = []
+        for suite in suites:
+            pooled = IDENTITY_KEY_POOL.take(suite)
+            if pooled is None:
+                break
+            keys.append(pooled)
+            if progress:
+                progress("keygen", len(keys), len(suites))
+        pending = suites[len(keys):]
+        if not pending:
+            return keys, 1
+
+        if workers is None:
+            try:
+                workers = len(os.sched_getaffinity(0))
+            except AttributeError:
+                workers = os.cpu_count() or 1
+        workers = max(1, min(int(workers), len(pending)))
+
+        if workers > 1 and len(pending) >= IDENTITY_POOL_MIN_NODES:
+            generated = []
+            try:
+                chunksize = max(1, len(pending) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers, mp_context=key_pool_context()) as pool:
+                    for node_keys in pool.map(generate_identity_keys, pending, chunksize=chunksize):
+                        generated.append(node_keys)
+                        if progress:
+                            progress("keygen", len(keys) + len(generated), len(suites))
+                return keys + generated, workers
+            except Exception as e:
+                print(f"[ASSIGN-ID] ⚠️ Key generation pool unavailable ({e}), generating in process")
+
+        for suite in pending:
+            keys.append(generate_identity_keys(suite))
+            if progress:
+                progress("keygen", len(keys), len(suites))
+        return keys, 1
+
+    @staticmethod
+    def _matrix_key(matrix_priv_obj):
+        # Ensure matrix_priv_obj is in proper RSA format
+        if isinstance(matrix_priv_obj, str):
+            return RSA.import_key(matrix_priv_obj.encode())
+        if isinstance(matrix_priv_obj, bytes):
+            return RSA.import_key(matrix_priv_obj)
+        if not isinstance(matrix_priv_obj, RSA.RsaKey):
+            raise TypeError("❌ matrix_priv_obj must be an RSA key or PEM string/bytes.")
+        return matrix_priv_obj
+
+    @staticmethod
+    def _store_identity(node, uid, matrix_priv_obj, keys, suite):
+        """Builds the identity token from keys, has Matrix sign it and stores the vault on node."""
+        # Create signed identity token
+        token = {
+            "universal_id": uid,
+            "pub": keys["pub"],
+            "timestamp": int(time.time())
+        }
+
+        # the rsa keypair still wraps aes keys; other suites only sign
+        if suite != SUITE_RSA:
+            token[SUITE_FIELD] = suite
+            token[SUITE_PUB_FIELD] = keys["sig_pub"]
+
+        # Matrix signs identity tokens with its rsa key
+        sigg = get_suite(SUITE_RSA).sign_b64(matrix_priv_obj, json.dumps(token, sort_keys=True).encode())
+
+        # Assign vault
+        node["vault"] = {
+            "priv": keys["priv"],
+            "private_key": keys["private_key"],  # aes encryption key
+            "sig": sigg,  # Matrix Sig
+            "identity": token
+        }
+        if suite != SUITE_RSA:
+            node["vault"][VAULT_SUITE_PRIV_FIELD] = keys["sig_priv"]
+
+    def assign_identity_token_to_node(self, uid, matrix_priv_obj, encryption_enabled=True, force=False, replace_keys:dict={},
+                                      signature_suite=None):
         """
         Generates and assigns a cryptographically secure identity to a single node.
 
         This is the core of the identity creation process. For a given node, it:
         1. Generates a new RSA public/private key pair and an AES key.
         2. Creates an identity "token" containing the agent's universal_id and public key.
+           When the agent's signature suite isn't RSA, a keypair of that suite is
+           generated too; the token records the suite and its public key.
         3. Signs this token with the master Matrix private key, creating a verifiable chain of trust.
         4. Stores the new keys and the signed token in the node's `vault`.
+
+        Batches of nodes should go through `assign_identities` instead.
         """
         node = self.get_node(uid)
         if not node:
@@ -723,43 +901,26 @@ class TreeParser(LogMixin):
             return False
 
         try:
-            # Ensure matrix_priv_obj is in proper RSA format
-            if isinstance(matrix_priv_obj, str):
-                matrix_priv_obj = RSA.import_key(matrix_priv_obj.encode())
-            elif isinstance(matrix_priv_obj, bytes):
-                matrix_priv_obj = RSA.import_key(matrix_priv_obj)
-            elif not isinstance(matrix_priv_obj, RSA.RsaKey):
-                raise TypeError("❌ matrix_priv_obj must be an RSA key or PEM string/bytes.")
+            matrix_priv_obj = self._matrix_key(matrix_priv_obj)
+            suite = normalize_suite(signature_suite) if signature_suite else self.get_signature_suite(node)
 
             if bool(replace_keys.get('priv_key', False)) and (replace_keys.get('pub_key', False)):
-                priv_pem = replace_keys.get('priv_key')
-                pub_pem = replace_keys.get('pub_key')
-                private_key = replace_keys.get('private_key')
+                keys = {
+                    "priv": replace_keys.get('priv_key'),
+                    "pub": replace_keys.get('pub_key'),
+                    "private_key": replace_keys.get('private_key'),
+                }
+                if suite != SUITE_RSA:
+                    if replace_keys.get('sig_priv_key'):
+                        keys["sig_priv"] = replace_keys.get('sig_priv_key')
+                        keys["sig_pub"] = get_suite(suite).public_from_private(keys["sig_priv"])
+                    else:
+                        keys["sig_priv"], keys["sig_pub"] = get_suite(suite).generate_keypair()
             else:
-                # Generate new identity keypair
-                key = RSA.generate(2048)
-                priv_pem = key.export_key().decode()
-                pub_pem = key.publickey().export_key().decode()
-                private_key = generate_aes_key()
-
-            # Create signed identity token
-            token = {
-                "universal_id": uid,
-                "pub": pub_pem,
-                "timestamp": int(time.time())
-            }
-
-            digest = SHA256.new(json.dumps(token, sort_keys=True).encode())
-            sig = pkcs1_15.new(matrix_priv_obj).sign(digest)
-            sigg = base64.b64encode(sig).decode()
-
-            # Assign vault
-            node["vault"] = {
-                "priv": priv_pem,
-                "private_key": private_key,  # aes encryption key
-                "sig": sigg,  # Matrix Sig
-                "identity": token
-            }
+                # Generate new identity keypair, or take one Matrix generated ahead of time
+                keys = IDENTITY_KEY_POOL.take(suite) or generate_identity_keys(suite)
+
+            self._store_identity(node, uid, matrix_priv_obj, keys, suite)
 
             if not replace_keys:
                 print(f"[ASSIGN-ID] ✅ Identity token assigned for '{uid}'")
@@ -823,10 +823,17 @@ class MatrixCommandBridge(QWidget, PacketFactoryMixin):
         self.user_requested_log_view = True
         print(f"[LOG] View Logs requested for: {universal_id}")
 
+        content = {"universal_id": universal_id}
+        # matrix_https tails the log server side; ask for as many lines as the panel keeps
+        limit_text = self.log_limit_box.currentText()
+        limit = int(limit_text.split()[0]) if limit_text else 0
+        if limit > 0:
+            content["lines"] = limit
+
         payload = {
             "handler": "cmd_get_log",
             "timestamp": time.time(),
-            "content": {"universal_id": universal_id}
+            "content": content
         }
 
         def threaded_log_fetch():
@@ -179,6 +179,11 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
         self.message_received.connect(self.handle_websocket_message_safe)
         self.start_websocket_listener(self.matrix_ws_host)
         self.user_requested_log_view = False
+        # log view cursor {inode, offset} from matrix_https, polls and websocket pushes only bring what's new
+        self._log_cursor = None
+        self._log_cursor_uid = None
+        self._log_push_uid = None
+        self.ws_loop = None
         self.current_selected_uid =None
         self.last_probe_report = {}
         self._ws_flare_triggered = False
@@ -352,15 +357,19 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
 
     def poll_live_log(self):
         if self.auto_scroll_checkbox.isChecked():
-            uid = self.log_input.text().strip()
+            uid = self.log_input.text().strip().split(" ")[0]
 
             if hasattr(self, "_log_poll_busy") and self._log_poll_busy:
                 return
 
+            # matrix_websocket pushes this log as it grows, nothing to poll
+            if uid and uid == self._log_push_uid:
+                return
+
             self._log_poll_busy = True
 
             if uid:
-                self.view_logs()  # safely handles async fetch and appending
+                self.request_logs(incremental=True)  # only lines appended since the last cursor
 
     def start_websocket_listener(self, url):
         if hasattr(self, "ws_listener_thread") and self.ws_listener_thread and self.ws_listener_thread.is_alive():
@@ -371,6 +380,7 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
         def run_ws_loop():
             asyncio.set_event_loop(asyncio.new_event_loop())
             loop = asyncio.get_event_loop()
+            self.ws_loop = loop
             loop.run_until_complete(self.websocket_main_loop(self.get_ws_url()))
 
         self.ws_listener_thread = threading.Thread(target=run_ws_loop, daemon=True)
@@ -405,16 +415,22 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
                         "timestamp": time.time()
                     }))
 
+                    # pick the log view back up where the last cursor left it
+                    if self._log_cursor and self._log_cursor_uid:
+                        await websocket.send(json.dumps(self._log_subscribe_msg()))
+
                     while True:
                         msg = await websocket.recv()
                         self.message_received.emit(msg)
 
             except websockets.exceptions.ConnectionClosed:
                 self.status_label_ws.setText("🔴 WS: Disconnected (Closed)")
+                self._log_push_uid = None
 
             except Exception as e:
                 self.status_label_ws.setText(f"🔴 WS: Error [{reconnect_attempts}]")
                 print(f"[WS] Exception: {e}")
+                self._log_push_uid = None
 
             finally:
                 reconnect_attempts += 1
@@ -428,6 +444,16 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
             # Use 'type' if it exists, otherwise fall back to 'handler'
             msg_type = data.get("type") or data.get("handler", "unknown")
 
+            if msg_type == "log_delta":
+                content = data.get("content", {})
+                self._apply_log_delta(content, content.get("universal_id"))
+                return
+
+            if msg_type == "log_subscribed":
+                # disabled (log_push off) or refused: keep polling matrix_https
+                self._log_push_uid = data.get("universal_id") if data.get("enabled") else None
+                return
+
             if msg_type == "health_report":
                 report = data.get("content", {})
                 target = report.get("target_universal_id", "unknown")
@@ -934,20 +960,34 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
         self.status_label.setText(f"🚨 {alarm.get('universal_id')} ALERT: {alarm.get('cause')}")
 
     def view_logs(self):
+        self.request_logs(incremental=False)
+
+    def request_logs(self, incremental=False):
 
         universal_id = self.log_input.text().strip().split(" ")[0]
 
         if not universal_id:
             print("[LOG] ❌ No universal_id set for log fetch.")
+            self._log_poll_busy = False
             return
 
         self.user_requested_log_view = True
         print(f"[LOG] View Logs requested for: {universal_id}")
 
+        content = {"universal_id": universal_id}
+        # matrix_https tails the log server side; ask for as many lines as the panel keeps
+        limit_text = self.log_limit_box.currentText()
+        limit = int(limit_text.split()[0]) if limit_text else 0
+        if limit > 0:
+            content["lines"] = limit
+        # with a cursor only what was appended since comes back
+        if incremental and self._log_cursor and self._log_cursor_uid == universal_id:
+            content.update(self._log_cursor)
+
         payload = {
             "handler": "cmd_get_log",
             "timestamp": time.time(),
-            "content": {"universal_id": universal_id}
+            "content": content
         }
 
         def threaded_log_fetch():
@@ -978,6 +1018,7 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
 
             except Exception as e:
                 print(f"[THREAD][EXCEPTION] {e}")
+                self._log_poll_busy = False
                 QTimer.singleShot(0, lambda: self.log_text.setPlainText(f"[ERROR] {str(e)}"))
 
         threading.Thread(target=threaded_log_fetch, daemon=True).start()
@@ -985,6 +1026,12 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
     def _handle_logs_result(self, result, uid):
         print(f"[UI] Handling log result for {uid}")
 
+        body = result.get("json") or {}
+        if isinstance(body, dict) and "cursor" in body:
+            self._log_poll_busy = False
+            self._apply_log_delta(body, uid)
+            return
+
         try:
             log_data = result["json"]["log"]
         except (KeyError, TypeError):
@@ -1011,6 +1058,55 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
         self.log_text.ensureCursorVisible()
         self._log_poll_busy = False
 
+    def _apply_log_delta(self, content, uid):
+        """
+        Shows a cmd_get_log reply or a log_delta push: "reset" replaces the view, otherwise
+        the lines are appended if they continue from our cursor (a poll and a push can race).
+        """
+        if uid != self.log_input.text().strip().split(" ")[0]:
+            return  # another agent's log is on screen now
+
+        log_data = content.get("log") or ""
+        reset = content.get("reset") or self._log_cursor_uid != uid
+        if reset:
+            self.log_text.setVisible(True)
+            self.log_text.setPlainText(log_data or f"[NO LOG DATA FOUND] for {uid}")
+        elif content.get("from") == self._log_cursor:
+            if log_data:
+                self.log_text.append(log_data)
+                self._trim_log_text()
+        else:
+            return  # already shown
+
+        self._log_cursor = content.get("cursor")
+        self._log_cursor_uid = uid
+        self.log_text.moveCursor(self.log_text.textCursor().End)
+        self.log_text.ensureCursorVisible()
+
+        # follow the log over the websocket from here; matrix_websocket answers log_subscribed
+        if reset and self._log_cursor:
+            self._send_ws(self._log_subscribe_msg())
+
+    def _log_subscribe_msg(self):
+        return {"type": "log_subscribe", "universal_id": self._log_cursor_uid, **(self._log_cursor or {})}
+
+    def _send_ws(self, msg):
+        if self.ws_loop and getattr(self, "websocket", None):
+            try:
+                asyncio.run_coroutine_threadsafe(self.websocket.send(json.dumps(msg)), self.ws_loop)
+            except Exception as e:
+                print(f"[WS] Send failed: {e}")
+
+    def _trim_log_text(self):
+        limit_text = self.log_limit_box.currentText()
+        limit = int(limit_text.split()[0]) if limit_text else 0
+        excess = self.log_text.document().blockCount() - limit
+        if limit > 0 and excess > 0:
+            cursor = self.log_text.textCursor()
+            cursor.movePosition(cursor.Start)
+            cursor.movePosition(cursor.NextBlock, cursor.KeepAnchor, excess)
+            cursor.removeSelectedText()
+
     def scroll_log_to_bottom(self):
         self.log_text.moveCursor(self.log_text.textCursor().End)
         self.log_text.ensureCursorVisible()
@@ -1996,7 +2092,16 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
 
         self.send_post_to_matrix(payload, f"Subtree delete issued for {universal_id}")
 
+    def _start_trace(self, payload):
+        """Tags a command with a new trace id; matrix_visibility/trace_collect.py --trace <id> shows its path through the swarm."""
+        if isinstance(payload, dict) and "trace" not in payload:
+            payload["trace"] = {"trace_id": os.urandom(16).hex(), "span_id": os.urandom(8).hex()}
+            print(f"[TRACE] {payload.get('handler')} trace={payload['trace']['trace_id']}")
+        return payload
+
     def send_post_to_matrix(self, payload, success_message):
+        self._start_trace(payload)
+
         @run_in_thread(
             callback=lambda resp: self.status_label.setText(f"✅ {success_message}") if resp.status_code == 200
             else self.status_label.setText(f"❌ Matrix error: {resp.status_code}"),
@@ -2023,6 +2128,8 @@ class MatrixCommandBridge(QMainWindow, PacketFactoryMixin):
             self.process_injection_file(file_name)
 
     def post_async(self, payload, on_success=None, on_fail=None):
+        self._start_trace(payload)
+
         def worker():
             try:
                 response = requests.post(self.matrix_host, json=payload, cert=CLIENT_CERT, verify=False, timeout=REQUEST_TIMEOUT)
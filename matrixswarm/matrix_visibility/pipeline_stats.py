@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import argparse
+
+SITE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SITE_ROOT not in sys.path:
+    sys.path.insert(0, SITE_ROOT)
+
+from matrixswarm.core.class_lib.metrics.pipeline_metrics import STAGES, METRICS_DIR, METRICS_FILE, merge, percentile
+
+MATRIX_ROOT = "/matrix"
+
+
+def load_metrics(comm_dir, agent=None):
+    """Returns {universal_id: metrics dict} for every agent under comm_dir that flushed pipeline metrics."""
+    found = {}
+    if not os.path.isdir(comm_dir):
+        return found
+    for universal_id in sorted(os.listdir(comm_dir)):
+        if agent and universal_id != agent:
+            continue
+        path = os.path.join(comm_dir, universal_id, METRICS_DIR, METRICS_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                found[universal_id] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    return found
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.3f}"
+
+
+def render(title, hists, order=None):
+    names = [n for n in (order or []) if n in hists] + sorted(n for n in hists if n not in (order or []))
+    if not names:
+        print(f"\n{title}: no samples")
+        return
+    print(f"\n{title}")
+    print(f"  {'name':<34} {'count':>9} {'mean ms':>10} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} {'max ms':>10}")
+    for name in names:
+        h = hists[name]
+        n = h.get("n", 0)
+        if not n:
+            continue
+        print(f"  {name:<34} {n:>9} {_ms(h['sum'] / n):>10} {_ms(percentile(h, 0.5)):>10} "
+              f"{_ms(percentile(h, 0.9)):>10} {_ms(percentile(h, 0.99)):>10} {_ms(h.get('max', 0.0)):>10}")
+
+
+def collect(metrics, section, window):
+    """Merges one section ("stages" or "handlers") across agents."""
+    per_name = {}
+    for data in metrics.values():
+        source = data.get("window", {}) if window else data
+        for name, h in source.get(section, {}).items():
+            per_name.setdefault(name, []).append(h)
+    return {name: merge(hs) for name, hs in per_name.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Swarm-wide packet pipeline latency percentiles.")
+    parser.add_argument("--universe", default="ai", help="universe to read (uses /matrix/<universe>/latest/comm)")
+    parser.add_argument("--comm", help="comm directory, overrides --universe")
+    parser.add_argument("--agent", help="only this universal_id")
+    parser.add_argument("--window", action="store_true", help="last flush interval instead of since agent start")
+    parser.add_argument("--by-agent", action="store_true", help="one table per agent instead of swarm-wide")
+    parser.add_argument("--json", action="store_true", help="print merged histograms as json")
+    args = parser.parse_args()
+
+    comm_dir = args.comm or os.path.join(MATRIX_ROOT, args.universe, "latest", "comm")
+    metrics = load_metrics(comm_dir, args.agent)
+    if not metrics:
+        print(f"[ERROR] No pipeline metrics found under {comm_dir}")
+        sys.exit(1)
+
+    groups = {uid: {uid: data} for uid, data in metrics.items()} if args.by_agent else {"swarm": metrics}
+
+    if args.json:
+        out = {name: {"stages": collect(group, "stages", args.window),
+                      "handlers": collect(group, "handlers", args.window)} for name, group in groups.items()}
+        print(json.dumps(out, indent=2))
+        return
+
+    scope = "last window" if args.window else "since agent start"
+    print(f"📈 PIPELINE LATENCY ({len(metrics)} agent(s), {scope})\n========================")
+    for name, group in groups.items():
+        render(f"[{name}] stages", collect(group, "stages", args.window), STAGES)
+        render(f"[{name}] handlers", collect(group, "handlers", args.window))
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import argparse
+
+SITE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if SITE_ROOT not in sys.path:
+    sys.path.insert(0, SITE_ROOT)
+
+from matrixswarm.core.class_lib.metrics.trace_spans import SPAN_DIR, SPAN_FILE, read_spans
+
+MATRIX_ROOT = "/matrix"
+
+
+def load_spans(comm_dir, agent=None):
+    """Returns every span recorded under comm_dir, tagged with the agent that recorded it."""
+    spans = []
+    if not os.path.isdir(comm_dir):
+        return spans
+    for universal_id in sorted(os.listdir(comm_dir)):
+        if agent and universal_id != agent:
+            continue
+        base = os.path.join(comm_dir, universal_id, SPAN_DIR, SPAN_FILE)
+        for path in (base + ".1", base):
+            if not os.path.isfile(path):
+                continue
+            try:
+                for span in read_spans(path):
+                    span["agent"] = universal_id
+                    spans.append(span)
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Skipping {path}: {e}", file=sys.stderr)
+    return spans
+
+
+def group_traces(spans):
+    """{trace_id: [spans sorted by start]}"""
+    traces = {}
+    for span in spans:
+        traces.setdefault(span["trace_id"], []).append(span)
+    for items in traces.values():
+        items.sort(key=lambda s: s["start"])
+    return traces
+
+
+def trace_window(items):
+    """(start, end) wall clock of a trace."""
+    return items[0]["start"], max(s["start"] + s["duration"] for s in items)
+
+
+def build_hops(items):
+    """One entry per deliver span: sender -> receiver with the receiver's queue, decrypt and handle time.
+
+    The end-to-end time of a hop runs from the start of the deliver to the
+    end of the handler it triggered.
+    """
+    by_parent = {}
+    for span in items:
+        if span["parent_id"]:
+            by_parent.setdefault(span["parent_id"], []).append(span)
+
+    hops = []
+    for span in items:
+        if span["kind"] != "deliver":
+            continue
+        receivers = {}
+        for child in by_parent.get(span["span_id"], []):
+            receivers.setdefault(child["agent"], {})[child["kind"]] = child
+        if not receivers:
+            hops.append({"from": span["agent"], "to": span["peer"], "deliver": span["duration"], "delivered": False,
+                         "start": span["start"]})
+            continue
+        for receiver, kinds in receivers.items():
+            hop = {"from": span["agent"], "to": receiver, "start": span["start"], "deliver": span["duration"],
+                   "delivered": True}
+            for kind in ("queue_wait", "decrypt", "handle"):
+                if kind in kinds:
+                    hop[kind] = kinds[kind]["duration"]
+            if "handle" in kinds:
+                hop["handler"] = kinds["handle"]["name"]
+                hop["total"] = kinds["handle"]["start"] + kinds["handle"]["duration"] - span["start"]
+            hops.append(hop)
+    return hops
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.3f}" if seconds is not None else "-"
+
+
+def render_trace(trace_id, items):
+    start, end = trace_window(items)
+    agents = []
+    for span in items:
+        if span["agent"] not in agents:
+            agents.append(span["agent"])
+    print(f"\n🧵 trace {trace_id}  {len(items)} span(s)  {_ms(end - start)} ms  {' → '.join(agents)}")
+
+    ids = {span["span_id"] for span in items}
+    children = {}
+    for span in items:
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children.setdefault(parent, []).append(span)
+
+    def walk(parent, depth):
+        for span in children.get(parent, []):
+            label = span["kind"] + (f" {span['name']}" if span["name"] else "")
+            if span["kind"] in ("deliver", "entry") and span["peer"]:
+                label += f" → {span['peer']}" if span["kind"] == "deliver" else f" ← {span['peer']}"
+            print(f"  +{_ms(span['start'] - start):>10} ms {_ms(span['duration']):>10} ms  "
+                  f"{'  ' * depth}[{span['agent']}] {label}")
+            walk(span["span_id"], depth + 1)
+    walk(None, 0)
+
+    hops = build_hops(items)
+    if hops:
+        print(f"  {'hop':<40} {'deliver':>9} {'queue':>9} {'decrypt':>9} {'handle':>9} {'total':>9}")
+        for hop in hops:
+            name = f"{hop['from']} → {hop['to']}" + ("" if hop["delivered"] else " (not picked up)")
+            print(f"  {name:<40} {_ms(hop['deliver']):>9} {_ms(hop.get('queue_wait')):>9} "
+                  f"{_ms(hop.get('decrypt')):>9} {_ms(hop.get('handle')):>9} {_ms(hop.get('total')):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reassembles distributed traces from the swarm's span logs.")
+    parser.add_argument("--universe", default="ai", help="universe to read (uses /matrix/<universe>/latest/comm)")
+    parser.add_argument("--comm", help="comm directory, overrides --universe")
+    parser.add_argument("--agent", help="only read spans recorded by this universal_id")
+    parser.add_argument("--trace", help="trace id (or prefix) to show")
+    parser.add_argument("--handler", help="only traces that ran this handler")
+    parser.add_argument("--last", type=int, default=10, help="show the N most recent traces")
+    parser.add_argument("--slowest", type=int, help="show the N slowest traces instead")
+    parser.add_argument("--json", action="store_true", help="print spans and hops as json")
+    args = parser.parse_args()
+
+    comm_dir = args.comm or os.path.join(MATRIX_ROOT, args.universe, "latest", "comm")
+    traces = group_traces(load_spans(comm_dir, args.agent))
+    if not traces:
+        print(f"[ERROR] No trace spans found under {comm_dir}")
+        sys.exit(1)
+
+    selected = list(traces.items())
+    if args.trace:
+        selected = [(tid, items) for tid, items in selected if tid.startswith(args.trace.lower())]
+    if args.handler:
+        selected = [(tid, items) for tid, items in selected
+                    if any(s["kind"] == "handle" and s["name"] == args.handler for s in items)]
+    if args.slowest:
+        selected.sort(key=lambda t: trace_window(t[1])[1] - trace_window(t[1])[0], reverse=True)
+        selected = selected[:args.slowest]
+    elif not args.trace:
+        selected.sort(key=lambda t: trace_window(t[1])[0])
+        selected = selected[-args.last:]
+
+    if not selected:
+        print("[ERROR] No matching traces.")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps({tid: {"spans": items, "hops": build_hops(items)} for tid, items in selected}, indent=2))
+        return
+
+    print(f"🔭 TRACES ({len(selected)} of {len(traces)})\n========================")
+    for trace_id, items in selected:
+        render_trace(trace_id, items)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -527,6 +527,12 @@ def main():
 
     print(f"[TRUST] Matrix pubkey fingerprint: {fp}")
 
+    try:
+        print(f"[TRUST] Packet signature suite: {tp.get_signature_suite()}")
+    except ValueError as e:
+        print(f"[FATAL] {e}")
+        sys.exit(1)
+
     swarm_key_b64 = generate_aes_key()
     matrix_key_b64 = generate_aes_key()
 
@@ -598,7 +604,7 @@ def main():
         matrix_directive = decrypt_directive(args.encrypted_directive, args.swarm_key)
     else:
         print(f"[BOOT] 📦 Loading plaintext directive: {boot_name}")
-        matrix_directive = load_boot_directive(boot_name)
+        matrix_directive = load_boot_directive(boot_name, path=config['boot_directives'])
 
     trust_payload = {
         "encryption_enabled": int(encryption_enabled),
@@ -0,0 +1,53 @@
+"""
+Bytes and CPU per packet for the json and binary packet framings.
+
+Builds real encrypted_blob envelopes (AES-GCM payload, RSA-wrapped key) and
+times serialize + parse + AES-GCM open for each framing, no live swarm:
+
+    python -m matrixswarm.tools.frame_bench --count 500 --sizes 200,4096,65536
+"""
+import time
+import base64
+import argparse
+
+from Crypto.PublicKey import RSA
+from Crypto.Random import get_random_bytes
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.packet_crypto_mixin import PacketCryptoMixin
+from matrixswarm.core.class_lib.packet_delivery.utility.packet_frame import dumps_packet, loads_packet, FRAMING_JSON, FRAMING_BINARY
+
+def _make_envelope(size, pubkey_pem):
+    packet = {"subpacket": {"payload": {"handler": "cmd_bench", "content": {"blob": "x" * size}}, "timestamp": int(time.time())}}
+    aes_key_b64 = base64.b64encode(get_random_bytes(32)).decode()
+    return PacketCryptoMixin().encrypt_packet(packet, aes_key_b64, True, pubkey_pem), aes_key_b64
+
+def bench(envelope, aes_key_b64, framing, count):
+    mixin = PacketCryptoMixin()
+    body = dumps_packet(envelope, framing)
+    start = time.process_time()
+    for _ in range(count):
+        mixin.decrypt_packet(loads_packet(dumps_packet(envelope, framing)), aes_key_b64)
+    cpu = time.process_time() - start
+    return len(body), cpu / count
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare json and binary packet framing.")
+    parser.add_argument("--count", type=int, default=500, help="serialize/parse rounds per size")
+    parser.add_argument("--sizes", default="200,4096,65536,1048576", help="comma separated payload sizes in bytes")
+    args = parser.parse_args()
+
+    pubkey_pem = RSA.generate(2048).publickey().export_key().decode()
+
+    print(f"[BENCH] {args.count} rounds per size, encrypted_blob with wrapped key")
+    print(f"  {'payload':>9} {'framing':<7} {'bytes':>10} {'cpu/packet':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        envelope, aes_key_b64 = _make_envelope(size, pubkey_pem)
+        results = {}
+        for framing in (FRAMING_JSON, FRAMING_BINARY):
+            results[framing] = bench(envelope, aes_key_b64, framing, args.count)
+            nbytes, cpu = results[framing]
+            print(f"  {size:>9} {framing:<7} {nbytes:>10} {cpu * 1e6:>10.1f}us")
+        saved = 1 - results[FRAMING_BINARY][0] / results[FRAMING_JSON][0]
+        print(f"  {'':>9} binary frame is {saved:.1%} smaller")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Packet-path microbenchmark: DeliveryAgent -> drop zone -> ReceptionAgent for every Football crypto mode.
+
+Each packet is delivered by a file.json_file DeliveryAgent and read back by
+a ReceptionAgent's receive_batch(), on a throwaway comm root with freshly
+generated keys, no live swarm. Modes:
+
+    plaintext    PacketEncryptorPlaintext / PlaintextProcessor
+    symmetric    AES-GCM with a shared key, no identity, no signature
+    signed       symmetric + Matrix-signed sender identity + payload signature
+    rsa          signed + AES key RSA-wrapped with the target pubkey per packet
+    rsa_session  signed + RSA-wrapped session key, unwrapped once per session
+
+Reports packets/s, p50/p99 send, receive and round-trip latency, bytes on
+disk and CPU per packet, and saves them as json so runs can be compared
+across commits:
+
+    python -m matrixswarm.tools.packet_bench --count 200 --out before.json
+    python -m matrixswarm.tools.packet_bench --count 200 --out after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import base64
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+
+from Crypto.PublicKey import RSA
+from Crypto.Signature import pkcs1_15
+from Crypto.Hash import SHA256
+from matrixswarm.core.class_lib.packet_delivery.delivery_agent.file.json_file.delivery_agent import DeliveryAgent
+from matrixswarm.core.class_lib.packet_delivery.reception_agent.file.json_file.reception_agent import ReceptionAgent
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.football import Football
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.encryptor import PacketEncryptor
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.decryptor import PacketDecryptor
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.plaintext_encryptor import PacketEncryptorPlaintext
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.plaintext_processor import PlaintextProcessor
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.session_key_store import SESSION_KEY_STORE
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import SUITES, SUITE_RSA, \
+    SUITE_FIELD, SUITE_PUB_FIELD, VAULT_SUITE_PRIV_FIELD, get_suite
+from matrixswarm.core.class_lib.packet_delivery.utility.packet_frame import FRAMING_JSON, FRAMING_BINARY
+from matrixswarm.core.class_lib.packet_delivery.packet.standard.general.json.packet import Packet
+from matrixswarm.core.utils.crypto_utils import generate_aes_key
+
+MODES = ("plaintext", "symmetric", "signed", "rsa", "rsa_session")
+SENDER = "bench-sender"
+TARGET = "bench-target"
+FORMAT_VERSION = 1
+
+class _Keys:
+    """Matrix key and Matrix-signed vaults of the sender and target, generated once per run."""
+    def __init__(self, bits, suite=SUITE_RSA):
+        self.suite = suite
+        self.matrix = RSA.generate(bits)
+        self.matrix_pub = self.matrix.publickey().export_key().decode()
+        self.sender = self._vault(SENDER, bits)
+        self.target = self._vault(TARGET, bits)
+        self.swarm_key = generate_aes_key()
+
+    def _vault(self, uid, bits):
+        key = RSA.generate(bits)
+        identity = {"universal_id": uid, "pub": key.publickey().export_key().decode(), "timestamp": int(time.time())}
+        vault = {"priv": key.export_key().decode()}
+        if self.suite != SUITE_RSA:
+            vault[VAULT_SUITE_PRIV_FIELD], identity[SUITE_PUB_FIELD] = get_suite(self.suite).generate_keypair()
+            identity[SUITE_FIELD] = self.suite
+        digest = SHA256.new(json.dumps(identity, sort_keys=True).encode())
+        vault["sig"] = base64.b64encode(pkcs1_15.new(self.matrix).sign(digest)).decode()
+        vault["identity"] = identity
+        return vault
+
+def _footballs(mode, keys):
+    """(pass football, catch football) of a mode."""
+    send, recv = Football(), Football()
+    for fb in (send, recv):
+        fb.set_logger(_quiet)
+        fb.set_identity_sig_verifier_pubkey(keys.matrix_pub)
+        fb.set_pubkey_verifier(keys.matrix_pub)
+        fb.set_aes_key(keys.swarm_key)
+
+    if mode == "symmetric":
+        send.set_use_payload_identity_file(False)
+        send.set_sign_payload(False)
+        send.set_encrypt_aes_key_using_target_pubkey(False)
+        recv.set_verify_signed_payload(False)
+        recv.set_decrypt_aes_key_using_privkey(False)
+        return send, recv
+
+    send.add_identity(keys.sender, identity_name="agent_owner", universal_id=SENDER,
+                      is_payload_identity=True, is_privkey_for_signing=True)
+    recv.add_identity(keys.target, identity_name="agent_owner", universal_id=TARGET)
+
+    if mode == "signed":
+        send.set_encrypt_aes_key_using_target_pubkey(False)
+        recv.set_decrypt_aes_key_using_privkey(False)
+    else:
+        send.set_aes_encryption_pubkey(keys.target["identity"]["pub"])
+        recv.set_aes_encryption_privkey(keys.target["priv"])
+        send.set_use_session_keys(mode == "rsa_session")
+    return send, recv
+
+def _quiet(*args, **kwargs):
+    pass
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def bench(comm, mode, size, count, keys, framing, durability):
+    """Delivers and receives count packets one at a time; returns the result row."""
+    SESSION_KEY_STORE.clear()
+    if mode == "plaintext":
+        encryptor, processor = PacketEncryptorPlaintext(), PlaintextProcessor()
+    else:
+        send_fb, recv_fb = _footballs(mode, keys)
+        encryptor, processor = PacketEncryptor(send_fb), PacketDecryptor(recv_fb)
+
+    pk = Packet()
+    pk.set_data({"handler": "cmd_bench", "content": {"blob": "x" * size}})
+    ra = ReceptionAgent()
+    ra.set_crypto_handler(processor)
+    #unsigned modes log a missing identity for every packet; a failed packet still fails the row below
+    ra.set_logger(_quiet)
+    ra.set_location({"path": comm}).set_address([TARGET]).set_drop_zone({"drop": "incoming"})
+
+    send_times, recv_times, disk_bytes = [], [], []
+    received = 0
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        da = DeliveryAgent().set_crypto_handler(encryptor) \
+            .set_location({"path": comm}) \
+            .set_address([TARGET]) \
+            .set_drop_zone({"drop": "incoming"}) \
+            .set_metadata({"framing": framing, "durability": durability}) \
+            .set_packet(pk) \
+            .deliver()
+        t1 = time.perf_counter()
+        if da.get_error_success() != 0:
+            raise RuntimeError(f"{mode}/{size}: {da.get_error_success_msg()}")
+        disk_bytes.append(os.path.getsize(da.get_saved_filename()))
+
+        for item in ra.receive_batch(packet_factory=Packet, limit=1):
+            if item.ok():
+                received += 1
+        t2 = time.perf_counter()
+        send_times.append(t1 - t0)
+        recv_times.append(t2 - t1)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+
+    if received != count:
+        raise RuntimeError(f"{mode}/{size}: received {received} of {count} packets")
+
+    round_trips = [s + r for s, r in zip(send_times, recv_times)]
+    return {
+        "mode": mode,
+        "size": size,
+        "count": count,
+        "packets_per_sec": round(count / wall, 1),
+        "send_p50_ms": round(_percentile(send_times, 0.5) * 1000, 4),
+        "send_p99_ms": round(_percentile(send_times, 0.99) * 1000, 4),
+        "recv_p50_ms": round(_percentile(recv_times, 0.5) * 1000, 4),
+        "recv_p99_ms": round(_percentile(recv_times, 0.99) * 1000, 4),
+        "p50_ms": round(_percentile(round_trips, 0.5) * 1000, 4),
+        "p99_ms": round(_percentile(round_trips, 0.99) * 1000, 4),
+        "bytes_on_disk": round(sum(disk_bytes) / len(disk_bytes)),
+        "cpu_us_per_packet": round(cpu / count * 1e6, 1),
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def compare(results, baseline_path):
+    """Prints packets/s, p99 and CPU of this run against a saved one."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["mode"], r["size"]): r for r in baseline.get("results", [])}
+    print(f"\n[COMPARE] against {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    print(f"  {'mode':<12} {'payload':>9} {'pkts/s':>10} {'p99':>10} {'cpu':>10}")
+    for row in results:
+        old = before.get((row["mode"], row["size"]))
+        if not old:
+            continue
+        delta = lambda key: f"{(row[key] / old[key] - 1) * 100:+.1f}%" if old[key] else "-"
+        print(f"  {row['mode']:<12} {row['size']:>9} {delta('packets_per_sec'):>10} {delta('p99_ms'):>10} "
+              f"{delta('cpu_us_per_packet'):>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the packet path for every Football crypto mode.")
+    parser.add_argument("--count", type=int, default=200, help="packets per mode and size")
+    parser.add_argument("--sizes", default="200,4096,65536,1048576", help="comma separated payload sizes in bytes")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"comma separated subset of {','.join(MODES)}")
+    parser.add_argument("--framing", default=FRAMING_JSON, choices=(FRAMING_JSON, FRAMING_BINARY))
+    parser.add_argument("--durability", default="rename", help="none | rename | fsync | fsync_dir | group")
+    parser.add_argument("--bits", type=int, default=2048, help="RSA key size")
+    parser.add_argument("--suite", default=SUITE_RSA, choices=tuple(SUITES), help="signature suite of the sender")
+    parser.add_argument("--out", help="write the results as json to this file")
+    parser.add_argument("--compare", help="json results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    modes = [m for m in args.modes.split(",") if m]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s) {unknown}, expected {MODES}")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    keys = _Keys(args.bits, args.suite)
+    comm = tempfile.mkdtemp(prefix="msw_packet_bench_")
+    results = []
+    try:
+        print(f"[BENCH] {args.count} packets per row, {args.framing} framing, durability {args.durability}, "
+              f"{args.suite} signatures, comm root {comm}")
+        print(f"  {'mode':<12} {'payload':>9} {'pkts/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'send p99':>9} "
+              f"{'recv p99':>9} {'disk B':>9} {'cpu/pkt':>10}")
+        for mode in modes:
+            for size in sizes:
+                row = bench(comm, mode, size, args.count, keys, args.framing, args.durability)
+                results.append(row)
+                print(f"  {mode:<12} {size:>9} {row['packets_per_sec']:>10} {row['p50_ms']:>9} {row['p99_ms']:>9} "
+                      f"{row['send_p99_ms']:>9} {row['recv_p99_ms']:>9} {row['bytes_on_disk']:>9} "
+                      f"{row['cpu_us_per_packet']:>8}us")
+    finally:
+        shutil.rmtree(comm, ignore_errors=True)
+
+    if args.out:
+        report = {
+            "v": FORMAT_VERSION,
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": int(time.time()),
+                "host": socket.gethostname(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "count": args.count,
+                "framing": args.framing,
+                "durability": args.durability,
+                "bits": args.bits,
+                "suite": args.suite,
+            },
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] results saved to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Synthetic swarm scale harness: boot, spawn, delegation and packet latency at N agents.
+
+Generates a boot directive of scale_probe no-op agents with the requested
+shape, boots it through site_boot from a throwaway .matrixswarm workspace,
+and measures:
+
+    time-to-all-heartbeats   first poke.heartbeat of every agent after boot start
+    tree delegation          Matrix's agent_tree.json slice landing in every agent's directive dir
+    RSS per agent, CPU       psutil over every process of the universe
+    ping round trip          each probe below depth 1 pings its parent over the packet path
+
+then tears the universe down with the Reaper and removes its runtime dir:
+
+    python -m matrixswarm.tools.scale_harness --depth 3 --fanout 8 --out scale_512.json
+    python -m matrixswarm.tools.scale_harness --agents 2000 --fanout 40 --service-every 50
+
+Runs under its own universe (default "scale"); site_boot refuses to boot
+over a universe whose Matrix is still running.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import pprint
+import argparse
+import tempfile
+import subprocess
+
+import psutil
+
+from matrixswarm.core.class_lib.processes.reaper import Reaper
+
+PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MATRIX_ROOT = "/matrix"
+DIRECTIVE_NAME = "scale_harness"
+PROBE_AGENT = "scale_probe"
+SERVICE_ROLE = "scale.probe"
+FORMAT_VERSION = 1
+
+def build_directive(depth, fanout, max_agents=None, service_every=0, pings=0, ping_interval=1.0):
+    """Breadth-first tree of probes under Matrix; returns (directive, [(uid, depth, parent)])."""
+    root = {"universal_id": "matrix", "name": "matrix", "filesystem": {"folders": [], "files": {}}, "children": []}
+    nodes = []
+    level = [("matrix", root)]
+    for d in range(1, depth + 1):
+        next_level = []
+        for parent_uid, parent in level:
+            for _ in range(fanout):
+                if max_agents is not None and len(nodes) >= max_agents:
+                    break
+                uid = f"scale-d{d}-{len(nodes):05d}"
+                config = {"depth": d}
+                #probes at depth 1 hang off Matrix, which has no ping handler
+                if pings and d > 1:
+                    config["ping"] = {"count": pings, "interval": ping_interval}
+                if service_every and len(nodes) % service_every == 0:
+                    config["service-manager"] = [{
+                        "role": [SERVICE_ROLE],
+                        "scope": ["parent", "any"],
+                        "auth": {"sig": True},
+                        "priority": 10,
+                        "exclusive": False
+                    }]
+                node = {"universal_id": uid, "name": PROBE_AGENT, "filesystem": {"folders": [], "files": {}},
+                        "config": config, "children": []}
+                parent["children"].append(node)
+                nodes.append((uid, d, parent_uid))
+                next_level.append((uid, node))
+        level = next_level
+    return root, nodes
+
+def make_workspace(root, directive):
+    """Minimal .matrixswarm workspace under root with a .swarm pointer next to it; returns its path."""
+    ws = os.path.join(root, ".matrixswarm")
+    config = {
+        "install_path": ws,
+        "agent": os.path.join(ws, "agent"),
+        "boot_directives": os.path.join(ws, "boot_directives"),
+        "certs": os.path.join(ws, "certs"),
+        "https_certs": os.path.join(ws, "certs", "https_certs"),
+        "socket_certs": os.path.join(ws, "certs", "socket_certs"),
+        "env": os.path.join(ws, "SAMPLE.env"),
+    }
+    for key in ("agent", "boot_directives", "https_certs", "socket_certs"):
+        os.makedirs(config[key], exist_ok=True)
+    for agent in ("matrix", PROBE_AGENT):
+        shutil.copytree(os.path.join(PACKAGE_ROOT, "agent", agent), os.path.join(config["agent"], agent),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    with open(os.path.join(config["boot_directives"], f"{DIRECTIVE_NAME}.py"), "w", encoding="utf-8") as f:
+        f.write("matrix_directive = " + pprint.pformat(directive, indent=1, width=120) + "\n")
+    with open(os.path.join(ws, ".matrix"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    with open(os.path.join(root, ".swarm"), "w", encoding="utf-8") as f:
+        f.write(ws)
+    return ws
+
+def universe_processes(universe):
+    """{universal_id: psutil.Process} of every agent process of the universe."""
+    label = f"--job {universe}:"
+    procs = {}
+    for proc in psutil.process_iter(["pid", "cmdline"]):
+        try:
+            cmdline = " ".join(proc.info["cmdline"] or [])
+        except Exception:
+            continue
+        if label not in cmdline:
+            continue
+        #universe:spawner:universal_id:agent_name (core_spawner)
+        job = cmdline.split(label, 1)[1].split()[0]
+        parts = job.split(":")
+        if len(parts) >= 3:
+            procs[parts[2]] = proc
+    return procs
+
+def sample_processes(universe):
+    """RSS and CPU seconds per agent."""
+    out = {}
+    for uid, proc in universe_processes(universe).items():
+        try:
+            with proc.oneshot():
+                cpu = proc.cpu_times()
+                out[uid] = {"rss": proc.memory_info().rss, "cpu": cpu.user + cpu.system}
+        except psutil.Error:
+            continue
+    return out
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _stats(values):
+    if not values:
+        return {"n": 0}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"n": len(ordered), "min": round(ordered[0], 6), "p50": round(pick(0.5), 6), "p90": round(pick(0.9), 6),
+            "p99": round(pick(0.99), 6), "max": round(ordered[-1], 6), "mean": round(sum(ordered) / len(ordered), 6)}
+
+def wait_for_boot(comm, uids, started, timeout):
+    """Polls heartbeats and delegated trees until every agent has both; returns per-agent seconds after boot start."""
+    heartbeats, delegated = {}, {}
+    deadline = time.time() + timeout
+    last_report = 0
+    while time.time() < deadline:
+        for uid in uids:
+            if uid not in heartbeats:
+                mtime = _mtime(os.path.join(comm, uid, "hello.moto", "poke.heartbeat"))
+                if mtime and mtime >= started:
+                    heartbeats[uid] = mtime - started
+            if uid not in delegated:
+                mtime = _mtime(os.path.join(comm, uid, "directive", "agent_tree.json"))
+                if mtime and mtime >= started:
+                    delegated[uid] = mtime - started
+        if len(heartbeats) == len(uids) and len(delegated) == len(uids):
+            break
+        if time.time() - last_report >= 5:
+            last_report = time.time()
+            print(f"  [{time.time() - started:7.1f}s] heartbeats {len(heartbeats)}/{len(uids)}  delegated {len(delegated)}/{len(uids)}")
+        time.sleep(0.5)
+    return heartbeats, delegated
+
+def wait_for_pings(comm, pingers, pings, timeout):
+    """Collects scale_ping.json of every pinging probe once it has its round trips, or at the timeout."""
+    deadline = time.time() + timeout
+    reports = {}
+    while True:
+        for uid in pingers:
+            try:
+                with open(os.path.join(comm, uid, "metrics", "scale_ping.json"), "r", encoding="utf-8") as f:
+                    reports[uid] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        done = sum(1 for r in reports.values() if len(r.get("rtt", [])) >= pings)
+        if done == len(pingers) or time.time() >= deadline:
+            return reports
+        time.sleep(1)
+
+def teardown(universe, keep_runtime):
+    """Reaps the universe and, unless keep_runtime, removes its boot dir. Returns seconds taken."""
+    started = time.time()
+    latest = os.path.join(MATRIX_ROOT, universe, "latest")
+    boot_dir = os.path.realpath(latest) if os.path.islink(latest) else None
+    pod, comm = os.path.join(latest, "pod"), os.path.join(latest, "comm")
+    reaper = Reaper(pod_root=pod, comm_root=comm, timeout_sec=60)
+    if os.path.isdir(pod):
+        reaper.reap_all()
+    reaper.kill_universe_processes(universe)
+    if boot_dir and not keep_runtime:
+        shutil.rmtree(boot_dir, ignore_errors=True)
+        try:
+            os.remove(latest)
+        except OSError:
+            pass
+    return time.time() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Boot a synthetic swarm and measure it.")
+    parser.add_argument("--depth", type=int, default=2, help="tree depth below Matrix")
+    parser.add_argument("--fanout", type=int, default=10, help="children per node")
+    parser.add_argument("--agents", type=int, help="cap on the number of probes (fills levels breadth-first)")
+    parser.add_argument("--service-every", type=int, default=0, help="every Nth probe gets a service-manager role")
+    parser.add_argument("--pings", type=int, default=10, help="round trips each probe below depth 1 sends its parent")
+    parser.add_argument("--ping-interval", type=float, default=1.0, help="seconds between a probe's pings")
+    parser.add_argument("--universe", default="scale", help="universe to boot the swarm under")
+    parser.add_argument("--timeout", type=int, default=600, help="seconds to wait for all heartbeats")
+    parser.add_argument("--python-bin", help="interpreter for site_boot and the agents")
+    parser.add_argument("--encryption-off", action="store_true", help="boot with encryption off")
+    parser.add_argument("--keep", action="store_true", help="leave the swarm running, skip teardown")
+    parser.add_argument("--keep-runtime", action="store_true", help="reap the swarm but keep /matrix/<universe>/<boot>")
+    parser.add_argument("--out", help="write the results as json to this file")
+    args = parser.parse_args()
+
+    directive, nodes = build_directive(args.depth, args.fanout, args.agents, args.service_every, args.pings, args.ping_interval)
+    uids = [uid for uid, _, _ in nodes]
+    pingers = [uid for uid, d, _ in nodes if args.pings and d > 1]
+    depth_of = {uid: d for uid, d, _ in nodes}
+    if not uids:
+        parser.error("the requested shape has no agents")
+
+    root = tempfile.mkdtemp(prefix="msw_scale_")
+    results = {}
+    booted = False
+    try:
+        make_workspace(root, directive)
+        print(f"[SCALE] {len(uids)} probes, depth {args.depth}, fanout {args.fanout}, universe '{args.universe}', workspace {root}")
+
+        cmd = [args.python_bin or sys.executable, os.path.join(PACKAGE_ROOT, "site_boot.py"),
+               "--universe", args.universe, "--directive", DIRECTIVE_NAME]
+        if args.python_bin:
+            cmd += ["--python-bin", args.python_bin]
+        if args.encryption_off:
+            cmd.append("--encryption-off")
+
+        started = time.time()
+        with open(os.path.join(root, "site_boot.log"), "w", encoding="utf-8") as log:
+            rc = subprocess.run(cmd, cwd=root, stdout=log, stderr=subprocess.STDOUT).returncode
+        site_boot_s = time.time() - started
+        if rc != 0:
+            print(f"[SCALE][ERROR] site_boot exited {rc}, see {os.path.join(root, 'site_boot.log')}")
+            sys.exit(1)
+        booted = True
+        print(f"[SCALE] site_boot returned after {site_boot_s:.2f}s, waiting for heartbeats...")
+
+        comm = os.path.join(MATRIX_ROOT, args.universe, "latest", "comm")
+        heartbeats, delegated = wait_for_boot(comm, uids, started, args.timeout)
+        boot_procs = sample_processes(args.universe)
+
+        reports = wait_for_pings(comm, pingers, args.pings, args.pings * args.ping_interval + 60) if pingers else {}
+        procs = sample_processes(args.universe)
+
+        rtts, by_depth = [], {}
+        for uid, report in reports.items():
+            rtts.extend(report.get("rtt", []))
+            by_depth.setdefault(depth_of.get(uid), []).extend(report.get("rtt", []))
+
+        probe_rss = [p["rss"] for uid, p in boot_procs.items() if uid != "matrix"]
+        results = {
+            "agents": len(uids),
+            "processes": len(procs),
+            "site_boot_s": round(site_boot_s, 3),
+            "heartbeats": {"seen": len(heartbeats), "all_s": round(max(heartbeats.values()), 3)
+                           if len(heartbeats) == len(uids) else None, "per_agent_s": _stats(list(heartbeats.values()))},
+            "delegation": {"seen": len(delegated), "all_s": round(max(delegated.values()), 3)
+                           if len(delegated) == len(uids) else None, "per_agent_s": _stats(list(delegated.values()))},
+            "rss": {"per_probe_mb": _stats([r / 2 ** 20 for r in probe_rss]),
+                    "matrix_mb": round(boot_procs.get("matrix", {}).get("rss", 0) / 2 ** 20, 1),
+                    "total_mb": round(sum(p["rss"] for p in boot_procs.values()) / 2 ** 20, 1)},
+            "cpu_s": {"total": round(sum(p["cpu"] for p in procs.values()), 3),
+                      "matrix": round(procs.get("matrix", {}).get("cpu", 0.0), 3),
+                      "per_probe": _stats([p["cpu"] for uid, p in procs.items() if uid != "matrix"])},
+            "ping_rtt_s": {"all": _stats(rtts),
+                           "by_depth": {str(d): _stats(v) for d, v in sorted(by_depth.items(), key=lambda i: i[0] or 0)},
+                           "probes_reporting": len(reports), "probes_pinging": len(pingers)},
+        }
+
+        hb, dl = results["heartbeats"], results["delegation"]
+        print(f"\n📊 SCALE RESULTS ({len(uids)} probes, {len(procs)} processes alive)\n========================")
+        print(f"  heartbeats      {hb['seen']}/{len(uids)}  all by {hb['all_s']}s  p50 {hb['per_agent_s'].get('p50')}s")
+        print(f"  delegation      {dl['seen']}/{len(uids)}  all by {dl['all_s']}s  p50 {dl['per_agent_s'].get('p50')}s")
+        rss = results["rss"]
+        print(f"  rss             probe p50 {rss['per_probe_mb'].get('p50')}MB max {rss['per_probe_mb'].get('max')}MB  "
+              f"matrix {rss['matrix_mb']}MB  total {rss['total_mb']}MB")
+        print(f"  cpu             total {results['cpu_s']['total']}s  matrix {results['cpu_s']['matrix']}s")
+        ping = results["ping_rtt_s"]["all"]
+        if ping["n"]:
+            print(f"  ping rtt        n={ping['n']} p50 {ping['p50'] * 1000:.1f}ms p99 {ping['p99'] * 1000:.1f}ms "
+                  f"max {ping['max'] * 1000:.1f}ms")
+            for d, s in results["ping_rtt_s"]["by_depth"].items():
+                if s["n"]:
+                    print(f"    depth {d:<8} n={s['n']} p50 {s['p50'] * 1000:.1f}ms p99 {s['p99'] * 1000:.1f}ms")
+        elif pingers:
+            print("  ping rtt        no round trips recorded")
+
+    finally:
+        if booted and not args.keep:
+            print(f"\n[SCALE] Reaping universe '{args.universe}'...")
+            results["teardown_s"] = round(teardown(args.universe, args.keep_runtime), 3)
+            print(f"[SCALE] Teardown took {results['teardown_s']}s")
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.out:
+        report = {
+            "v": FORMAT_VERSION,
+            "meta": {"timestamp": int(time.time()), "host": os.uname().nodename, "cpus": os.cpu_count(),
+                     "depth": args.depth, "fanout": args.fanout, "agents_cap": args.agents,
+                     "service_every": args.service_every, "pings": args.pings, "encryption": not args.encryption_off},
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[SCALE] results saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Signature suite benchmark: keygen, sign and verify rates of every suite in signature_suite.
+
+Signs and verifies a payload of each size the way packets are (SigPayloadJson
+bytes of a subpacket), so the numbers line up with the signed modes of
+packet_bench. Results can be saved as json and compared across commits:
+
+    python -m matrixswarm.tools.sig_bench --out sig.json
+    python -m matrixswarm.tools.sig_bench --compare sig.json
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.signature_suite import SUITES, SUITE_RSA, \
+    RsaPkcs1Suite, get_suite
+from matrixswarm.core.class_lib.packet_delivery.utility.encryption.utility.sig_payload_json import SigPayloadJson
+from matrixswarm.tools.packet_bench import _git_commit
+
+FORMAT_VERSION = 1
+
+def _rate(fn, count):
+    """(ops/s, us per op) of count calls."""
+    t0 = time.perf_counter()
+    for _ in range(count):
+        fn()
+    elapsed = time.perf_counter() - t0
+    return round(count / elapsed, 1), round(elapsed / count * 1e6, 1)
+
+def bench(suite_name, sizes, count, keygen_count, bits):
+    """One row per payload size; keygen is measured once per suite."""
+    suite = RsaPkcs1Suite(bits) if suite_name == SUITE_RSA else get_suite(suite_name)
+    keygen_per_sec, keygen_us = _rate(suite.generate_keypair, keygen_count)
+    priv, pub = suite.generate_keypair()
+
+    rows = []
+    for size in sizes:
+        sp = SigPayloadJson()
+        sp.set_payload({"payload": {"handler": "cmd_bench", "content": {"blob": "x" * size}},
+                        "timestamp": int(time.time())})
+        data = sp.get_payload()
+        sig = suite.sign(priv, data)
+        #first calls parse and cache the keys, like a running agent after its first packet
+        suite.verify(pub, data, sig)
+
+        sign_per_sec, sign_us = _rate(lambda: suite.sign(priv, data), count)
+        verify_per_sec, verify_us = _rate(lambda: suite.verify(pub, data, sig), count)
+        rows.append({
+            "suite": suite.name,
+            "size": size,
+            "keygen_per_sec": keygen_per_sec,
+            "keygen_us": keygen_us,
+            "sign_per_sec": sign_per_sec,
+            "sign_us": sign_us,
+            "verify_per_sec": verify_per_sec,
+            "verify_us": verify_us,
+            "sig_bytes": len(sig),
+            "pub_pem_bytes": len(pub),
+        })
+    return rows
+
+def compare(results, baseline_path):
+    """Prints sign, verify and keygen rates of this run against a saved one."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before = {(r["suite"], r["size"]): r for r in baseline.get("results", [])}
+    print(f"\n[COMPARE] against {baseline_path} (commit {baseline.get('meta', {}).get('commit')})")
+    print(f"  {'suite':<20} {'payload':>9} {'keygen/s':>10} {'sign/s':>10} {'verify/s':>10}")
+    for row in results:
+        old = before.get((row["suite"], row["size"]))
+        if not old:
+            continue
+        delta = lambda key: f"{(row[key] / old[key] - 1) * 100:+.1f}%" if old[key] else "-"
+        print(f"  {row['suite']:<20} {row['size']:>9} {delta('keygen_per_sec'):>10} {delta('sign_per_sec'):>10} "
+              f"{delta('verify_per_sec'):>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keygen, sign and verify of every signature suite.")
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"comma separated subset of {','.join(SUITES)}")
+    parser.add_argument("--sizes", default="200,4096,65536", help="comma separated payload sizes in bytes")
+    parser.add_argument("--count", type=int, default=500, help="signatures and verifications per row")
+    parser.add_argument("--keygen-count", type=int, default=10, help="keypairs generated per suite")
+    parser.add_argument("--bits", type=int, default=2048, help="RSA key size")
+    parser.add_argument("--out", help="write the results as json to this file")
+    parser.add_argument("--compare", help="json results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    suites = [s for s in args.suites.split(",") if s]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s) {unknown}, expected {tuple(SUITES)}")
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    results = []
+    print(f"[BENCH] {args.count} signatures per row, {args.keygen_count} keypairs per suite")
+    print(f"  {'suite':<20} {'payload':>9} {'keygen/s':>10} {'sign/s':>10} {'sign us':>9} {'verify/s':>10} "
+          f"{'verify us':>9} {'sig B':>6}")
+    for name in suites:
+        for row in bench(name, sizes, args.count, args.keygen_count, args.bits):
+            results.append(row)
+            print(f"  {row['suite']:<20} {row['size']:>9} {row['keygen_per_sec']:>10} {row['sign_per_sec']:>10} "
+                  f"{row['sign_us']:>9} {row['verify_per_sec']:>10} {row['verify_us']:>9} {row['sig_bytes']:>6}")
+
+    if args.out:
+        report = {
+            "v": FORMAT_VERSION,
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": int(time.time()),
+                "host": socket.gethostname(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "count": args.count,
+                "keygen_count": args.keygen_count,
+                "bits": args.bits,
+            },
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] results saved to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
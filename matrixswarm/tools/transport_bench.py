@@ -0,0 +1,103 @@
+"""
+Throughput comparison of the file.json_file and socket.unix packet transports.
+
+Runs against a throwaway comm root, plaintext crypto handlers, no live swarm:
+
+    python -m matrixswarm.tools.transport_bench --count 2000 --size 512
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from matrixswarm.core.class_lib.packet_delivery.delivery_agent.file.json_file.delivery_agent import DeliveryAgent as FileDeliveryAgent
+from matrixswarm.core.class_lib.packet_delivery.reception_agent.file.json_file.reception_agent import ReceptionAgent as FileReceptionAgent
+from matrixswarm.core.class_lib.packet_delivery.delivery_agent.socket.unix.delivery_agent import DeliveryAgent as SocketDeliveryAgent
+from matrixswarm.core.class_lib.packet_delivery.reception_agent.socket.unix.reception_agent import ReceptionAgent as SocketReceptionAgent
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.plaintext_encryptor import PacketEncryptorPlaintext
+from matrixswarm.core.class_lib.packet_delivery.utility.crypto_processors.plaintext_processor import PlaintextProcessor
+from matrixswarm.core.class_lib.packet_delivery.packet.standard.general.json.packet import Packet
+
+UID = "bench-target"
+
+def _make_packet(size):
+    pk = Packet()
+    pk.set_data({"handler": "cmd_bench", "content": {"blob": "x" * size}})
+    return pk
+
+def bench_file(comm, count, size):
+    pk = _make_packet(size)
+    incoming = os.path.join(comm, UID, "incoming")
+    ra = FileReceptionAgent()
+    ra.set_crypto_handler(PlaintextProcessor())
+    ra.set_location({"path": comm}).set_address([UID]).set_drop_zone({"drop": "incoming"})
+
+    start = time.perf_counter()
+    for _ in range(count):
+        FileDeliveryAgent().set_crypto_handler(PacketEncryptorPlaintext()) \
+            .set_location({"path": comm}) \
+            .set_address([UID]) \
+            .set_drop_zone({"drop": "incoming"}) \
+            .set_packet(pk) \
+            .deliver()
+
+    received = 0
+    for fname in os.listdir(incoming):
+        if not fname.endswith(".json"):
+            continue
+        if ra.set_identifier(fname).set_packet(Packet()).receive() is not None:
+            received += 1
+        os.remove(os.path.join(incoming, fname))
+
+    return received, time.perf_counter() - start
+
+def bench_socket(comm, count, size):
+    pk = _make_packet(size)
+    ra = SocketReceptionAgent()
+    ra.set_crypto_handler(PlaintextProcessor())
+    ra.set_location({"path": comm}).set_address([UID]).set_drop_zone({"drop": "incoming"}) \
+        .set_metadata({"max_queue": count + 1}).listen()
+    if not ra.is_listening():
+        raise RuntimeError(ra.get_error_success_msg())
+
+    start = time.perf_counter()
+    via_file = 0
+    for _ in range(count):
+        da = SocketDeliveryAgent().set_crypto_handler(PacketEncryptorPlaintext()) \
+            .set_location({"path": comm}) \
+            .set_address([UID]) \
+            .set_drop_zone({"drop": "incoming"}) \
+            .set_packet(pk) \
+            .deliver()
+        via_file += sum(1 for _, via in da.get_delivered_via() if via == "file")
+
+    received = 0
+    while ra.pending():
+        if ra.set_packet(Packet()).receive() is not None:
+            received += 1
+
+    elapsed = time.perf_counter() - start
+    ra.close()
+    if via_file:
+        print(f"  note: {via_file} packets fell back to the file drop")
+    return received, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare file.json_file and socket.unix packet throughput.")
+    parser.add_argument("--count", type=int, default=1000, help="packets per transport")
+    parser.add_argument("--size", type=int, default=512, help="payload size in bytes")
+    args = parser.parse_args()
+
+    comm = tempfile.mkdtemp(prefix="msw_bench_")
+    try:
+        print(f"[BENCH] {args.count} packets, {args.size} byte payload, comm root {comm}")
+        for name, fn in (("file.json_file", bench_file), ("socket.unix", bench_socket)):
+            received, elapsed = fn(comm, args.count, args.size)
+            rate = received / elapsed if elapsed else 0
+            print(f"  {name:<15} received={received:<6} {elapsed:8.3f}s  {rate:10.1f} packets/s")
+    finally:
+        shutil.rmtree(comm, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()